@@ -0,0 +1,82 @@
+"""
+Compare `Book.add_clippings` with the previous implementation that
+resorted all clippings on every call.
+
+Usage: python -m benchmarks.add_clippings
+"""
+
+from __future__ import annotations
+
+import copy
+from functools import partial
+from typing import TYPE_CHECKING
+
+from benchmarks.fixtures import make_book, make_clipping
+from benchmarks.utils import run_with_setup
+from clippings.books.entities import ClippingType
+
+if TYPE_CHECKING:
+    from clippings.books.entities import Book, Clipping
+
+CLIPPING_TYPE_ORDER = {
+    ClippingType.HIGHLIGHT: 0,
+    ClippingType.NOTE: 1,
+    ClippingType.UNLINKED_NOTE: 1,
+}
+
+
+def resort_add_clippings(book: Book, clippings: list[Clipping]) -> int:
+    existed_ids = set()
+    for clipping in book.clippings:
+        existed_ids.add(clipping.id)
+        for inline_note in clipping.inline_notes:
+            if inline_note.original_id:
+                existed_ids.add(inline_note.original_id)
+
+    added_count = 0
+    for clipping in clippings:
+        if clipping.id not in existed_ids:
+            book.clippings.append(clipping)
+            added_count += 1
+            existed_ids.add(clipping.id)
+    book.clippings.sort(key=lambda cl: (cl.position_id, CLIPPING_TYPE_ORDER[cl.type]))
+    return added_count
+
+
+def merge_add_clippings(book: Book, clippings: list[Clipping]) -> int:
+    return book.add_clippings(clippings)
+
+
+def main() -> None:
+    book = make_book(1000)
+
+    for new_count in (1, 500):
+        # notes are placed between existing highlights
+        new_clippings = [
+            make_clipping(i * 2, id_prefix="NEW", type=ClippingType.NOTE)
+            for i in range(new_count)
+        ]
+        expected = copy.deepcopy(book)
+        resort_add_clippings(expected, list(new_clippings))
+        actual = copy.deepcopy(book)
+        merge_add_clippings(actual, list(new_clippings))
+        assert actual.clippings == expected.clippings
+
+        print(f"1000-clipping book, {new_count} new clippings:")
+        resort_time = run_with_setup(
+            "  resort",
+            partial(copy.deepcopy, book),
+            partial(resort_add_clippings, clippings=new_clippings),
+            repeat=50,
+        )
+        merge_time = run_with_setup(
+            "  merge",
+            partial(copy.deepcopy, book),
+            partial(merge_add_clippings, clippings=new_clippings),
+            repeat=50,
+        )
+        print(f"  speedup: {resort_time / merge_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Compare `mongo_book_deserializer` with the previous dacite based implementation.
+
+Usage: python -m benchmarks.book_deserializer
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from functools import partial
+
+from dacite import Config, from_dict
+
+from benchmarks.fixtures import make_book
+from benchmarks.utils import run
+from clippings.books.adapters.storages import (
+    mongo_book_deserializer,
+    mongo_book_serializer,
+)
+from clippings.books.entities import Book
+
+
+def dacite_book_deserializer(book: dict) -> Book:
+    return from_dict(
+        data_class=Book,
+        data=book,
+        config=Config(forward_references={"datetime": datetime}, cast=[tuple, Enum]),
+    )
+
+
+def main() -> None:
+    for clippings_count in (10, 1000):
+        book_dict = mongo_book_serializer(make_book(clippings_count), "user:1")
+        assert dacite_book_deserializer(book_dict) == mongo_book_deserializer(book_dict)
+        print(f"Book with {clippings_count} clippings:")
+        number = 10_000 // clippings_count
+        dacite_time = run(
+            "  dacite", partial(dacite_book_deserializer, book_dict), number=number
+        )
+        new_time = run(
+            "  book_from_dict",
+            partial(mongo_book_deserializer, book_dict),
+            number=number,
+        )
+        print(f"  speedup: {dacite_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
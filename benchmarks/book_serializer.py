@@ -0,0 +1,55 @@
+"""
+Compare `mongo_book_serializer` with the previous `dataclasses.asdict`
+based implementation.
+
+Usage: python -m benchmarks.book_serializer
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from benchmarks.fixtures import make_book
+from benchmarks.utils import run
+from clippings.books.adapters.storages import mongo_book_serializer
+
+if TYPE_CHECKING:
+    from clippings.books.entities import Book
+
+
+def _without_private_fields(items: list[tuple[str, Any]]) -> dict[str, Any]:
+    return {key: value for key, value in items if not key.startswith("_")}
+
+
+def asdict_book_serializer(book: Book, user_id: str) -> dict:
+    book_dict = asdict(book, dict_factory=_without_private_fields)
+    book_dict["_id"] = f"{user_id}|{book_dict['id']}"
+    book_dict["user_id"] = user_id
+    for clipping in book_dict["clippings"]:
+        clipping["type"] = clipping["type"].value
+    return book_dict
+
+
+def main() -> None:
+    for clippings_count in (10, 1000):
+        book = make_book(clippings_count)
+        assert asdict_book_serializer(book, "user:1") == mongo_book_serializer(
+            book, "user:1"
+        )
+        print(f"Book with {clippings_count} clippings:")
+        number = 10_000 // clippings_count
+        asdict_time = run(
+            "  asdict", partial(asdict_book_serializer, book, "user:1"), number=number
+        )
+        new_time = run(
+            "  book_to_dict",
+            partial(mongo_book_serializer, book, "user:1"),
+            number=number,
+        )
+        print(f"  speedup: {asdict_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
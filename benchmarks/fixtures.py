@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from clippings.books.entities import Book, BookMeta, Clipping, ClippingType, InlineNote
+
+ADDED_AT = datetime(2024, 8, 9)
+
+
+def make_clipping(
+    number: int, *, id_prefix: str = "CL", type: ClippingType = ClippingType.HIGHLIGHT
+) -> Clipping:
+    inline_notes = []
+    if number % 10 == 0:
+        inline_notes.append(
+            InlineNote(
+                id=f"note{id_prefix}{number}",
+                content=f"Note for clipping {number}",
+                original_id=f"N{id_prefix}{number}",
+                automatically_linked=True,
+                added_at=ADDED_AT,
+            )
+        )
+    return Clipping(
+        id=f"{id_prefix}{number}",
+        page=(number, number),
+        location=(number * 10, number * 10 + 5),
+        type=type,
+        content=f"Highlighted text number {number} " * 5,
+        inline_notes=inline_notes,
+        added_at=ADDED_AT + timedelta(minutes=number),
+    )
+
+
+def make_book(clippings_count: int = 1000, *, id: str = "BOOK1") -> Book:
+    return Book(
+        id=id,
+        title="Benchmark Book",
+        authors=["Author"],
+        clippings=[make_clipping(i) for i in range(clippings_count)],
+        meta=BookMeta(
+            isbns=["1234567890"],
+            cover_image_small="https://placehold.co/100x150",
+            cover_image_big="https://placehold.co/400x600",
+        ),
+    )
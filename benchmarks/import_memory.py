@@ -0,0 +1,117 @@
+"""
+Peak of Python memory allocations while importing 100k clippings of 2000
+books: committed in bounded batches (default) vs. all at once at the end
+of the file (previous behavior). Committed books are discarded
+by the storage, so only memory of the import itself is measured.
+
+Usage: python -m benchmarks.import_memory
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from clippings.books.adapters.id_generators import (
+    book_id_generator,
+    clipping_id_generator,
+    inline_note_id_generator,
+)
+from clippings.books.adapters.locks import MemoryImportLock
+from clippings.books.adapters.readers import MockClippingsReader
+from clippings.books.adapters.storages import (
+    MemoryBooksStorage,
+    MemoryDeletedHashStorage,
+    MemoryImportFingerprintStorage,
+)
+from clippings.books.dtos import BookDTO, ClippingImportCandidateDTO
+from clippings.books.entities import Book, ClippingType
+from clippings.books.services import EnrichBooksMetaService
+from clippings.books.use_cases.book_info import MockBookInfoClient
+from clippings.books.use_cases.import_clippings import ImportClippingsUseCase
+from clippings.users.adapters.storages import MemoryUsersStorage
+from clippings.users.entities import User
+
+CLIPPINGS_COUNT = 100_000
+BOOKS_COUNT = 2000
+ADDED_AT = datetime(2024, 8, 9)
+
+
+class DiscardingBooksStorage(MemoryBooksStorage):
+    async def extend(self, books: list[Book]) -> None:
+        pass
+
+
+def make_candidates() -> list[ClippingImportCandidateDTO]:
+    return [
+        ClippingImportCandidateDTO(
+            book=BookDTO(title=f"Book {i % BOOKS_COUNT}", authors=["Author"]),
+            page=(i, i),
+            location=(i * 10, i * 10 + 5),
+            type=ClippingType.HIGHLIGHT,
+            content=f"Highlighted text number {i} " * 5,
+            added_at=ADDED_AT + timedelta(minutes=i),
+        )
+        for i in range(CLIPPINGS_COUNT)
+    ]
+
+
+def make_use_case(
+    candidates: list[ClippingImportCandidateDTO],
+    max_pending_clippings: int,
+    commit_batch_size: int,
+) -> ImportClippingsUseCase:
+    user = User(
+        id="user:1",
+        nickname="benchmark",
+        hashed_password=None,
+        max_books=BOOKS_COUNT,
+        max_clippings_per_book=CLIPPINGS_COUNT,
+    )
+    use_case = ImportClippingsUseCase(
+        storage=DiscardingBooksStorage(),
+        reader=MockClippingsReader(candidates),
+        deleted_hash_storage=MemoryDeletedHashStorage(),
+        enrich_books_meta_service=EnrichBooksMetaService(MockBookInfoClient()),
+        book_id_generator=book_id_generator,
+        clipping_id_generator=clipping_id_generator,
+        inline_note_id_generator=inline_note_id_generator,
+        users_storage=MemoryUsersStorage({user.id: user}),
+        fingerprint_storage=MemoryImportFingerprintStorage(user_id=user.id),
+        lock=MemoryImportLock({}, user.id),
+    )
+    use_case.MAX_PENDING_CLIPPINGS = max_pending_clippings
+    use_case.COMMIT_BATCH_SIZE = commit_batch_size
+    return use_case
+
+
+def main() -> None:
+    candidates = make_candidates()
+    print(f"{CLIPPINGS_COUNT} clippings of {BOOKS_COUNT} books")
+    for name, limits in (
+        (
+            "batched",
+            (
+                ImportClippingsUseCase.MAX_PENDING_CLIPPINGS,
+                ImportClippingsUseCase.COMMIT_BATCH_SIZE,
+            ),
+        ),
+        ("all at once", (sys.maxsize, sys.maxsize)),
+    ):
+        start = time.perf_counter()
+        asyncio.run(make_use_case(candidates, *limits).execute("user:1"))
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        asyncio.run(make_use_case(candidates, *limits).execute("user:1"))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{name:<12} total {elapsed * 1000:8.1f} ms, peak {peak / 2**20:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare `CompiledKindleClippingMetadataParser` with the reference
+`KindleClippingMetadataParser` on 10k metadata lines,
+with and without locking to the detected language.
+
+Usage: python -m benchmarks.kindle_metadata_parser
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from benchmarks.utils import run
+from clippings.books.adapters.kindle_parser.language import presets
+from clippings.books.adapters.kindle_parser.parser import (
+    CompiledKindleClippingMetadataParser,
+    KindleClippingMetadataParser,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+LINES_COUNT = 10_000
+
+
+class NotStickyParser(CompiledKindleClippingMetadataParser):
+    LANGUAGE_DETECTION_CLIPPINGS = LINES_COUNT + 1
+
+
+def make_metadata_lines(count: int) -> list[str]:
+    added_at = datetime(2024, 1, 1)
+    lines = []
+    for i in range(count):
+        date = added_at + timedelta(minutes=i * 7)
+        lines.append(
+            f"- Your Highlight on page {i // 3} | location {i * 10}-{i * 10 + 4} |"
+            f" Added on {date:%A}, {date.day} {date:%B} {date:%Y %H:%M:%S}"
+        )
+    return lines
+
+
+def parse_all(
+    make_parser: Callable[[], KindleClippingMetadataParser], lines: list[str]
+) -> None:
+    parser = make_parser()
+    for line in lines:
+        parser.parse(line)
+
+
+def main() -> None:
+    unique_lines = make_metadata_lines(LINES_COUNT)
+    # e.g. the same file is imported again
+    repeated_lines = unique_lines[: LINES_COUNT // 10] * 10
+
+    for name, lines in (("unique", unique_lines), ("repeated", repeated_lines)):
+        print(f"{LINES_COUNT} {name} metadata lines:")
+        reference_time = run(
+            "  reference",
+            lambda lines=lines: parse_all(  # type: ignore[misc]
+                lambda: KindleClippingMetadataParser(presets), lines
+            ),
+            number=1,
+        )
+        run(
+            "  compiled, without language lock",
+            lambda lines=lines: parse_all(  # type: ignore[misc]
+                lambda: NotStickyParser(presets), lines
+            ),
+            number=1,
+        )
+        compiled_time = run(
+            "  compiled",
+            lambda lines=lines: parse_all(  # type: ignore[misc]
+                lambda: CompiledKindleClippingMetadataParser(presets), lines
+            ),
+            number=1,
+        )
+        print(f"  speedup: {reference_time / compiled_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Parsing throughput of `KindleClippingsReader` compared to the previous
+line by line reader, on a file of 20k clippings in memory and on disk,
+and the longest stall of the event loop while the file is being read.
+
+Usage: python -m benchmarks.kindle_reader
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, BinaryIO
+
+from clippings.books.adapters.kindle_parser.parser import KindleClippingsParser
+from clippings.books.adapters.readers import (
+    KindleClippingsReader,
+    raw_clipping_to_candidate,
+)
+from clippings.books.ports import ClippingsReaderABC
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Callable
+
+    from clippings.books.dtos import ClippingImportCandidateDTO
+
+CLIPPINGS_COUNT = 20_000
+
+
+class LineByLineKindleClippingsReader(ClippingsReaderABC):
+    def __init__(self, file_object: BinaryIO) -> None:
+        self._file_object = file_object
+
+    async def read(self) -> AsyncGenerator[ClippingImportCandidateDTO, None]:
+        parser = KindleClippingsParser()
+        for raw_line in self._file_object:
+            parser.add_line(raw_line.decode("utf-8-sig"))
+            if clipping := parser.get_clipping():
+                if candidate := raw_clipping_to_candidate(clipping):
+                    yield candidate
+
+
+def make_clippings_file(count: int) -> bytes:
+    added_at = datetime(2024, 1, 1)
+    records = []
+    for i in range(count):
+        date = added_at + timedelta(minutes=i * 7)
+        records.append(
+            f"Book number {i // 100} (Author {i // 1000})\r\n"
+            f"- Your Highlight on page {i} | location {i * 10}-{i * 10 + 4} |"
+            f" Added on {date:%A}, {date.day} {date:%B} {date:%Y %H:%M:%S}\r\n"
+            "\r\n"
+            f"{'Some highlighted text. ' * 10}{i}\r\n"
+            "==========\r\n"
+        )
+    return "﻿".encode() + "".join(records).encode()
+
+
+async def read_all(reader: ClippingsReaderABC) -> int:
+    return len([candidate async for candidate in reader.read()])
+
+
+def rewind(file: BinaryIO) -> BinaryIO:
+    file.seek(0)
+    return file
+
+
+def split_lines(file: BinaryIO) -> int:
+    return sum(1 for raw_line in file if raw_line.decode("utf-8-sig").strip())
+
+
+def split_records(file: BinaryIO) -> int:
+    reader = KindleClippingsReader(file)
+    count = 0
+    with reader._open_buffer() as buffer, memoryview(buffer) as view:
+        for start, end in reader._iter_records(buffer):
+            with view[start:end] as record:
+                count += bool(str(record, "utf-8"))
+    return count
+
+
+def measure(name: str, read: Callable[[], int], size: int, repeat: int = 3) -> None:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read()
+        timings.append(time.perf_counter() - start)
+    elapsed = min(timings)
+    print(f"{name:<40} {elapsed * 1000:10.1f} ms {size / 2**20 / elapsed:8.1f} MiB/s")
+
+
+async def max_loop_stall(reader: ClippingsReaderABC) -> float:
+    """Read all clippings and return the longest gap between 1 ms heartbeats."""
+    stalls = [0.0]
+    last_beat = time.perf_counter()
+
+    async def heartbeat() -> None:
+        nonlocal last_beat
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stalls.append(now - last_beat - 0.001)
+            last_beat = now
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    try:
+        await read_all(reader)
+    finally:
+        heartbeat_task.cancel()
+    return max(*stalls, time.perf_counter() - last_beat)
+
+
+def main() -> None:
+    content = make_clippings_file(CLIPPINGS_COUNT)
+    print(f"{CLIPPINGS_COUNT} clippings, {len(content) / 2**20:.1f} MiB")
+    with tempfile.TemporaryFile() as file:
+        file.write(content)
+        print("Splitting and decoding only:")
+        for split in (split_lines, split_records):
+            measure(
+                f"  {split.__name__}",
+                lambda split=split: split(rewind(file)),  # type: ignore[misc]
+                len(content),
+            )
+        print("Whole parsing:")
+        for reader_cls in (LineByLineKindleClippingsReader, KindleClippingsReader):
+            measure(
+                f"  {reader_cls.__name__}, memory",
+                lambda cls=reader_cls: asyncio.run(  # type: ignore[misc]
+                    read_all(cls(io.BytesIO(content)))
+                ),
+                len(content),
+            )
+            measure(
+                f"  {reader_cls.__name__}, disk",
+                lambda cls=reader_cls: asyncio.run(  # type: ignore[misc]
+                    read_all(cls(rewind(file)))
+                ),
+                len(content),
+            )
+        print("Longest event loop stall while reading from disk:")
+        for reader_cls in (LineByLineKindleClippingsReader, KindleClippingsReader):
+            stall = asyncio.run(max_loop_stall(reader_cls(rewind(file))))
+            print(f"  {reader_cls.__name__:<38} {stall * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
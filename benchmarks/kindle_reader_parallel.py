@@ -0,0 +1,52 @@
+"""
+Scaling of `KindleClippingsReader` parallel parsing across 1/2/4/8 workers
+of a process pool on a file of 60k clippings on disk, compared to parsing
+without a pool. Pools are started and warmed up before measuring, as the
+app's shared pool is.
+
+Usage: python -m benchmarks.kindle_reader_parallel
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import BinaryIO
+
+from benchmarks.kindle_reader import make_clippings_file, measure, rewind
+from clippings.books.adapters.readers import KindleClippingsReader
+
+CLIPPINGS_COUNT = 60_000
+WORKERS = (1, 2, 4, 8)
+
+
+def parse(file: BinaryIO, process_pool: Executor | None) -> int:
+    reader = KindleClippingsReader(rewind(file), process_pool=process_pool)
+    return sum(1 for _ in reader.iter_candidates())
+
+
+def main() -> None:
+    content = make_clippings_file(CLIPPINGS_COUNT)
+    print(
+        f"{CLIPPINGS_COUNT} clippings, {len(content) / 2**20:.1f} MiB,"
+        f" {os.cpu_count()} CPUs"
+    )
+    with tempfile.TemporaryFile() as file:
+        file.write(content)
+        measure("sequential", lambda: parse(file, None), len(content))
+        for workers in WORKERS:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                parse(file, pool)
+                measure(
+                    f"{workers} worker(s)",
+                    lambda pool=pool: parse(file, pool),  # type: ignore[misc]
+                    len(content),
+                )
+
+
+if __name__ == "__main__":
+    main()
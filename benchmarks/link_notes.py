@@ -0,0 +1,84 @@
+"""
+Compare `Book.add_and_link_clippings` used by the import with the previous
+`add_clippings` + `link_notes` pair (two full sorts and deletes by index).
+
+Usage: python -m benchmarks.link_notes
+"""
+
+from __future__ import annotations
+
+import copy
+from functools import partial
+from typing import TYPE_CHECKING
+
+from benchmarks.add_clippings import CLIPPING_TYPE_ORDER, resort_add_clippings
+from benchmarks.fixtures import make_book, make_clipping
+from benchmarks.utils import run_with_setup
+from clippings.books.entities import ClippingType, InlineNote
+
+if TYPE_CHECKING:
+    from clippings.books.entities import Book, Clipping, Position
+
+
+def id_generator() -> str:
+    return "inline-note-id"
+
+
+def resort_link_notes(book: Book) -> None:
+    book.clippings.sort(key=lambda cl: (cl.position_id, CLIPPING_TYPE_ORDER[cl.type]))
+    pos_to_highlight: dict[Position, Clipping] = {}
+    to_delete = []
+    for i, cl in enumerate(book.clippings):
+        if cl.type == ClippingType.HIGHLIGHT:
+            pos_to_highlight[cl.position_id] = cl
+        elif cl.type == ClippingType.NOTE and cl.position_id in pos_to_highlight:
+            pos_to_highlight[cl.position_id].inline_notes.append(
+                InlineNote.create_from_clipping(cl, id_generator=id_generator)
+            )
+            to_delete.append(i)
+
+    for i in reversed(to_delete):
+        del book.clippings[i]
+
+
+def add_then_link(book: Book, clippings: list[Clipping]) -> None:
+    resort_add_clippings(book, clippings)
+    resort_link_notes(book)
+
+
+def add_and_link(book: Book, clippings: list[Clipping]) -> None:
+    book.add_and_link_clippings(clippings, inline_note_id_generator=id_generator)
+
+
+def main() -> None:
+    book = make_book(1000)
+    book.add_clippings([])
+    # every new note belongs to an existing highlight and gets linked
+    new_clippings = [
+        make_clipping(i, id_prefix="NEW", type=ClippingType.NOTE) for i in range(500)
+    ]
+
+    expected = copy.deepcopy(book)
+    add_then_link(expected, list(new_clippings))
+    actual = copy.deepcopy(book)
+    add_and_link(actual, list(new_clippings))
+    assert actual.clippings == expected.clippings
+
+    print("1000-clipping book, 500 new notes:")
+    old_time = run_with_setup(
+        "  add_clippings + link_notes",
+        partial(copy.deepcopy, book),
+        partial(add_then_link, clippings=new_clippings),
+        repeat=50,
+    )
+    new_time = run_with_setup(
+        "  add_and_link_clippings",
+        partial(copy.deepcopy, book),
+        partial(add_and_link, clippings=new_clippings),
+        repeat=50,
+    )
+    print(f"  speedup: {old_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Measure memory used by a synthetic 100k-clipping library
+loaded into `MemoryBooksStorage`.
+
+Usage: python -m benchmarks.memory_storage
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import tracemalloc
+
+from benchmarks.fixtures import make_book
+from clippings.books.adapters.storages import MemoryBooksStorage
+
+BOOKS_COUNT = 200
+CLIPPINGS_PER_BOOK = 500
+
+
+async def load_library() -> MemoryBooksStorage:
+    storage = MemoryBooksStorage()
+    await storage.extend(
+        [make_book(CLIPPINGS_PER_BOOK, id=f"BOOK{i}") for i in range(BOOKS_COUNT)]
+    )
+    return storage
+
+
+def main() -> None:
+    gc.collect()
+    tracemalloc.start()
+    storage = asyncio.run(load_library())
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    clippings_count = sum(len(book.clippings) for book in storage.books.values())
+    print(f"Books: {len(storage.books)}, clippings: {clippings_count}")
+    print(f"Memory: {current / 2**20:.1f} MiB (peak {peak / 2**20:.1f} MiB)")
+    print(f"Per clipping: {current / clippings_count:.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Re-import of a file of 20k clippings with 100 clippings appended since
+the previous import: whole file is parsed vs. only the records after
+the fingerprint of the previous import.
+
+Usage: python -m benchmarks.reimport_delta
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+
+from benchmarks.kindle_reader import make_clippings_file, measure, read_all, rewind
+from clippings.books.adapters.readers import KindleClippingsReader
+
+CLIPPINGS_COUNT = 20_000
+APPENDED_COUNT = 100
+
+
+async def read_delta(
+    reader: KindleClippingsReader, previous: KindleClippingsReader
+) -> int:
+    fingerprint = previous.get_fingerprint()
+    assert fingerprint is not None
+    await reader.skip_imported(fingerprint)
+    return await read_all(reader)
+
+
+def main() -> None:
+    # records are numbered, so the old file is the beginning of the new one
+    old_content = make_clippings_file(CLIPPINGS_COUNT)
+    content = make_clippings_file(CLIPPINGS_COUNT + APPENDED_COUNT)
+    print(
+        f"{CLIPPINGS_COUNT} clippings, {APPENDED_COUNT} appended,"
+        f" {len(content) / 2**20:.1f} MiB"
+    )
+    with tempfile.TemporaryFile() as old_file, tempfile.TemporaryFile() as file:
+        old_file.write(old_content)
+        file.write(content)
+        previous = KindleClippingsReader(old_file)
+        asyncio.run(read_all(previous))
+        measure(
+            "  whole file",
+            lambda: asyncio.run(read_all(KindleClippingsReader(rewind(file)))),
+            len(content),
+        )
+        measure(
+            "  appended records only",
+            lambda: asyncio.run(
+                read_delta(KindleClippingsReader(rewind(file)), previous)
+            ),
+            len(content),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+import timeit
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+T = TypeVar("T")
+
+
+def run(
+    name: str, func: Callable[[], object], *, number: int, repeat: int = 5
+) -> float:
+    """Print and return the best time of one call in milliseconds."""
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+    _report(name, best)
+    return best
+
+
+def run_with_setup(
+    name: str, setup: Callable[[], T], func: Callable[[T], object], *, repeat: int
+) -> float:
+    """
+    Same as `run`, but for functions that mutate their input: `setup` result
+    is passed to `func` and only `func` is timed.
+    """
+    timings = []
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - start)
+    best = min(timings) * 1000
+    _report(name, best)
+    return best
+
+
+def _report(name: str, milliseconds: float) -> None:
+    print(f"{name:<40} {milliseconds:10.3f} ms")
@@ -19,3 +19,7 @@ def clipping_id_generator(clipping: ClippingForGenerateId) -> str:
 
 def inline_note_id_generator() -> str:
     return uuid.uuid4().hex
+
+
+def import_job_id_generator() -> str:
+    return uuid.uuid4().hex
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import functools
 import itertools
 import logging
+import re
 from datetime import datetime
 from typing import TYPE_CHECKING, TypeAlias, TypedDict
 
@@ -42,7 +44,7 @@ class KindleClippingsParser:
         self._in_clipping = True
         self._separator = "=========="
         self._fsm = KindleClippingsFSM()
-        self._metadata_parser = KindleClippingMetadataParser(presets)
+        self._metadata_parser = CompiledKindleClippingMetadataParser(presets)
 
     def add_line(self, line: str) -> None | DomainError:
         line = line.strip()
@@ -69,6 +71,30 @@ class KindleClippingsParser:
             self._clippings[-1].setdefault("content", []).append(line)
         return None
 
+    def parse_record(self, record: str) -> RawClipping | DomainError | None:
+        """
+        Parse a whole clipping: text between two separators (without them).
+        Returns `None` for records without title or metadata.
+        Byte order marks at the beginning of lines are skipped,
+        as `add_line` does with lines decoded as "utf-8-sig".
+        """
+        lines = map(_strip_line, record.split("\n"))
+        title_line = next((line for line in lines if line), None)
+        metadata_line = next((line for line in lines if line), None)
+        if title_line is None or metadata_line is None:
+            return None
+        metadata = self._metadata_parser.parse(metadata_line)
+        if isinstance(metadata, DomainError):
+            return metadata
+        title, authors = self._parse_title_and_authors(title_line)
+        return {
+            "title": title,
+            "authors": authors,
+            "metadata": metadata_line,
+            "content": list(lines),
+            **metadata,
+        }
+
     def get_clipping(self) -> RawClipping | None:
         if self._in_clipping:
             return None
@@ -86,6 +112,10 @@ class KindleClippingsParser:
         return title.strip(), authors.strip()
 
 
+def _strip_line(line: str) -> str:
+    return line.removeprefix("\ufeff").strip()
+
+
 class KindleClippingsFSM:
     def __init__(self) -> None:
         self._states = itertools.cycle(
@@ -199,6 +229,210 @@ class KindleClippingMetadataParser:
         return result
 
 
+class CompiledKindleClippingMetadataParser(KindleClippingMetadataParser):
+    """
+    Drop-in replacement for `KindleClippingMetadataParser`.
+
+    Languages are narrowed down by the same markers, but positions and dates
+    are parsed with patterns precompiled once per resolved set of languages
+    (sets with a single preset are prepared upfront). Kindle repeats metadata
+    lines, so results are cached by the line.
+
+    A clippings file is written by one device in one language, so after
+    `LANGUAGE_DETECTION_CLIPPINGS` lines resolved to the same single language
+    the parser searches only in that language. Full detection is used again
+    when a line can't be parsed in the detected language.
+    """
+
+    CACHE_SIZE = 4096
+    LANGUAGE_DETECTION_CLIPPINGS = 10
+
+    def __init__(self, language_settings: list[LanguageSettings]) -> None:
+        self._compiled: dict[frozenset[Lang], CompiledLanguages] = {}
+        super().__init__(language_settings)
+        self._cached_parse = functools.lru_cache(maxsize=self.CACHE_SIZE)(self._parse)
+        self._detected_langs: frozenset[Lang] = self._possible_languages
+        self._detection_count = 0
+        self._locked_langs: frozenset[Lang] | None = None
+
+    @property
+    def language(self) -> Lang | None:
+        """Language the parser is locked to, if it is already detected."""
+        return next(iter(self._locked_langs)) if self._locked_langs else None
+
+    def init_markers(self) -> None:
+        super().init_markers()
+        for lang in self._possible_languages:
+            self._get_compiled(frozenset([lang]))
+
+    def parse(self, metadata: str) -> ClippingMetadata | DomainError:
+        if self._locked_langs is not None:
+            result, _ = self._cached_parse(metadata, self._locked_langs)
+            if not isinstance(result, DomainError):
+                return result.copy()
+            self._reset_language_detection()
+
+        result, langs = self._cached_parse(metadata, self._possible_languages)
+        if isinstance(result, DomainError):
+            return result
+        self._detect_language(langs)
+        return result.copy()
+
+    def _detect_language(self, langs: frozenset[Lang]) -> None:
+        detected_langs = self._detected_langs & langs
+        if not detected_langs:
+            # lines in different languages, start over from the current one
+            self._reset_language_detection()
+            detected_langs = langs
+        self._detected_langs = detected_langs
+        self._detection_count += 1
+        if (
+            self._detection_count >= self.LANGUAGE_DETECTION_CLIPPINGS
+            and len(detected_langs) == 1
+        ):
+            self._locked_langs = detected_langs
+
+    def _reset_language_detection(self) -> None:
+        self._detected_langs = self._possible_languages
+        self._detection_count = 0
+        self._locked_langs = None
+
+    def _parse(
+        self, metadata: str, languages: frozenset[Lang]
+    ) -> tuple[ClippingMetadata | DomainError, frozenset[Lang]]:
+        self._search_langs = set(languages)
+        clipping_type = self._parse_clipping_type(metadata)
+        if isinstance(clipping_type, DomainError):
+            return clipping_type, languages
+        try:
+            self._narrow_down_languages(metadata, self._page_markers)
+            has_location = self._narrow_down_languages(metadata, self._location_markers)
+            compiled = self._get_compiled(frozenset(self._search_langs))
+            page, loc = compiled.parse_positions(metadata, has_location)
+
+            date_part = metadata.rsplit("|", 1)[1]
+            month, month_langs = compiled.search_month(date_part)
+            if month_langs != compiled.languages:
+                compiled = self._get_compiled(month_langs)
+            added_at = compiled.parse_datetime(date_part, month)
+        except Exception:  # noqa: PIE786
+            return DomainError("Can't parse metadata from file"), languages
+
+        result: ClippingMetadata = {
+            "type": clipping_type,
+            "page": page,
+            "location": loc,
+            "added_at": added_at,
+        }
+        return result, compiled.languages
+
+    def _narrow_down_languages(
+        self, metadata: str, markers: dict[Marker, list[Lang]]
+    ) -> bool:
+        for name, langs in markers.items():
+            cross_langs = self._search_langs.intersection(langs)
+            if cross_langs and name in metadata:
+                self._search_langs = cross_langs
+                return True
+        return False
+
+    def _get_compiled(self, languages: frozenset[Lang]) -> CompiledLanguages:
+        if languages not in self._compiled:
+            self._compiled[languages] = CompiledLanguages(
+                [s for s in self._language_settings if s.language_name in languages]
+            )
+        return self._compiled[languages]
+
+
+class CompiledLanguages:
+    """Parsing rules of a set of languages, precomputed for fast reuse."""
+
+    _NOT_POSITION_CHARS = re.compile(r"[^0-9_;]")
+    _DIGIT = re.compile(r"\d")
+
+    def __init__(self, language_settings: list[LanguageSettings]) -> None:
+        self.languages = frozenset(s.language_name for s in language_settings)
+        self._ambiguity_reported = False
+        self._language_names = [s.language_name for s in language_settings]
+        # languages which use the same delimiter share it
+        self._range_delimiters = list(
+            dict.fromkeys(s.range_delimiter for s in language_settings)
+        )
+        self._page_and_loc_delimiters = list(
+            dict.fromkeys(s.page_and_location_delimiter for s in language_settings)
+        )
+        self._month_names: dict[str, tuple[int, frozenset[Lang]]] = {}
+        for s in language_settings:
+            for i, month in enumerate(s.month_names, start=1):
+                value, langs = self._month_names.get(month, (i, frozenset()))
+                self._month_names[month] = value, langs | {s.language_name}
+
+        self._twelve_hour_marks: dict[str, str] = {}
+        for s in language_settings:
+            if s.twelve_hour_mark:
+                am_mark, pm_mark = s.twelve_hour_mark
+                self._twelve_hour_marks |= {am_mark: "AM", pm_mark: "PM"}
+        date_tokens = [r"\d[\d:]*", *map(re.escape, self._twelve_hour_marks)]
+        self._date_tokens = re.compile("|".join(date_tokens))
+        self._date_formats = (
+            language_settings[0].date_formats if language_settings else []
+        )
+
+    def parse_positions(
+        self, metadata: str, has_location: bool
+    ) -> tuple[Position, Position]:
+        loc_meta, _ = metadata.strip()[1:].rsplit("|", 1)
+        loc_meta = loc_meta.replace(" ", "")
+        for delimiter in self._range_delimiters:
+            loc_meta = loc_meta.replace(delimiter, "_")
+        for delimiter in self._page_and_loc_delimiters:
+            loc_meta = loc_meta.replace(delimiter, ";")
+        cleaned = self._NOT_POSITION_CHARS.sub("", loc_meta)
+
+        parts = [_parse_int_pair(item) for item in cleaned.split(";")]
+        absent_value = (-1, -1)
+        if len(parts) == 1:
+            return (
+                (absent_value, parts[0]) if has_location else (parts[0], absent_value)
+            )
+        return parts[0], parts[1]
+
+    def search_month(self, date_part: str) -> tuple[int | None, frozenset[Lang]]:
+        words = date_part.lower().split()
+        for month, (value, langs) in self._month_names.items():
+            if month in words:
+                return value, langs
+        return None, self.languages
+
+    def parse_datetime(self, date_part: str, month: int | None) -> datetime:
+        if len(self._language_names) > 1 and not self._ambiguity_reported:
+            logger.warning(
+                "Multiple languages found, %s, using: %s",
+                self._language_names,
+                self._language_names[0],
+            )
+            self._ambiguity_reported = True
+        numbers = []
+        if first_digit := self._DIGIT.search(date_part):
+            numbers = [
+                self._twelve_hour_marks.get(token, token)
+                for token in self._date_tokens.findall(date_part, first_digit.start())
+            ]
+        datetime_parts = parse_datetime_parts(numbers, self._date_formats)
+        if not datetime_parts:
+            return datetime(1970, 1, 1)
+        if "month" not in datetime_parts and month:
+            datetime_parts["month"] = month
+        return datetime(**datetime_parts, tzinfo=None)
+
+
+def _parse_int_pair(text: str) -> Position:
+    ints = text.split("_")
+    if len(ints) == 1:
+        return int(ints[0]), int(ints[0])
+    return int(ints[0]), int(ints[1])
+
+
 class PositionParser:
     def __init__(
         self,
@@ -358,43 +592,50 @@ class DatetimeParser:
                     return value
         return None
 
-    def _parse_datetime_parts(self) -> dict[str, int]:  # noqa: C901
+    def _parse_datetime_parts(self) -> dict[str, int]:
         numbers = self._cleaned.split(" ")
         langs = list(self.search_langs)
         if len(langs) > 1:
             logger.warning("Multiple languages found, %s, using: %s", langs, langs[0])
-        for date_format in self._date_formats[langs[0]]:
-            result: dict[str, int] = {}
-            if len(date_format) != len(numbers):
-                continue
-            parsed_date = dict(zip(date_format, numbers))
-            for type, part_value in parsed_date.items():
-                if type == DatePart.YEAR:
-                    result["year"] = int(part_value)
-                elif type == DatePart.MONTH:
-                    result["month"] = int(part_value)
-                elif type == DatePart.MONTH_ISO:
-                    result["month"] = int(part_value) + 1
-                elif type == DatePart.DAY:
-                    result["day"] = int(part_value)
-                elif type == DatePart.TIME:
-                    hour, minute, second = (int(num) for num in part_value.split(":"))
-                    if parsed_date.get(DatePart.TWElVE_HOUR_MARK) == "PM":
-                        hour = (hour + 12) % 24
-                    result |= {"hour": hour, "minute": minute, "second": second}
-            if self._check_datetime_parts(result):
-                return result
-        return {}
-
-    def _check_datetime_parts(self, parts: dict[str, int]) -> bool:
-        parts = parts.copy()
-        if "month" not in parts:
-            parts["month"] = 1
-        if set(parts) != {"year", "month", "day", "hour", "minute", "second"}:
-            return False
+        return parse_datetime_parts(numbers, self._date_formats[langs[0]])
+
+
+def parse_datetime_parts(  # noqa: C901
+    numbers: list[str], date_formats: list[tuple[DatePart, ...]]
+) -> dict[str, int]:
+    for date_format in date_formats:
+        result: dict[str, int] = {}
+        if len(date_format) != len(numbers):
+            continue
+        parsed_date = dict(zip(date_format, numbers))
+        for type, part_value in parsed_date.items():
+            if type == DatePart.YEAR:
+                result["year"] = int(part_value)
+            elif type == DatePart.MONTH:
+                result["month"] = int(part_value)
+            elif type == DatePart.MONTH_ISO:
+                result["month"] = int(part_value) + 1
+            elif type == DatePart.DAY:
+                result["day"] = int(part_value)
+            elif type == DatePart.TIME:
+                hour, minute, second = (int(num) for num in part_value.split(":"))
+                if parsed_date.get(DatePart.TWElVE_HOUR_MARK) == "PM":
+                    hour = (hour + 12) % 24
+                result |= {"hour": hour, "minute": minute, "second": second}
+        if _check_datetime_parts(result):
+            return result
+    return {}
+
+
+def _check_datetime_parts(parts: dict[str, int]) -> bool:
+    parts = parts.copy()
+    if "month" not in parts:
+        parts["month"] = 1
+    if set(parts) != {"year", "month", "day", "hour", "minute", "second"}:
+        return False
 
-        try:
-            datetime(**parts, tzinfo=None)
-        except (ValueError, TypeError):
-            return False
-        return True
+    try:
+        datetime(**parts, tzinfo=None)
+    except (ValueError, TypeError):
+        return False
+    return True
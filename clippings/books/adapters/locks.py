@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError
+
+from clippings.books.exceptions import ImportInProgressError, ImportLockLostError
+from clippings.books.ports import ImportLockABC
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from motor.motor_asyncio import AsyncIOMotorDatabase
+
+logger = logging.getLogger(__name__)
+
+ACQUIRE_TIMEOUT = 5 * 60
+TIMEOUT_MESSAGE = "Another import is still in progress, please try again later"
+LOST_MESSAGE = "Import was interrupted by another import, please try again"
+
+
+class MemoryImportLock(ImportLockABC):
+    """Stand-in for a single process: holders wait on `asyncio.Lock`."""
+
+    def __init__(
+        self,
+        locks_map: dict[str, asyncio.Lock],
+        user_id: str,
+        *,
+        timeout: float = ACQUIRE_TIMEOUT,
+    ) -> None:
+        self._locks = locks_map
+        self._user_id = user_id
+        self._timeout = timeout
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncGenerator[None, None]:
+        lock = self._locks.setdefault(self._user_id, asyncio.Lock())
+        try:
+            await asyncio.wait_for(lock.acquire(), self._timeout)
+        except asyncio.TimeoutError:
+            raise ImportInProgressError(TIMEOUT_MESSAGE) from None
+        try:
+            yield
+        finally:
+            lock.release()
+
+    def check_held(self) -> None:
+        pass
+
+
+class MongoImportLock(ImportLockABC):
+    """
+    Lease of a user's lock, shared by all processes and nodes. The holder
+    renews the lease while it holds the lock; if it dies, other holders can
+    acquire the lock after the lease is expired, and the TTL index removes
+    abandoned leases. Lease times are set by the clients, so their clocks
+    must be in sync.
+
+    If the lease can't be renewed in time (e.g. the event loop was blocked
+    or Mongo was unavailable), `check_held` raises, so the holder stops
+    before its next write instead of racing with the next holder.
+    """
+
+    COLLECTION_NAME = "import_locks"
+    INDEXES = [
+        IndexModel(
+            [("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0
+        ),
+    ]
+    LEASE_DURATION = timedelta(seconds=60)
+    POLL_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        user_id: str,
+        *,
+        timeout: float = ACQUIRE_TIMEOUT,
+    ) -> None:
+        self._collection = db[self.COLLECTION_NAME]
+        self._user_id = user_id
+        self._timeout = timeout
+        self._lease_expires_at: datetime | None = None
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncGenerator[None, None]:
+        loop = asyncio.get_running_loop()
+        owner = uuid4().hex
+        deadline = loop.time() + self._timeout
+        while not await self._try_acquire(owner):
+            if loop.time() >= deadline:
+                raise ImportInProgressError(TIMEOUT_MESSAGE)
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+        renewal = asyncio.create_task(self._renew(owner))
+        try:
+            yield
+        finally:
+            self._lease_expires_at = None
+            renewal.cancel()
+            await asyncio.gather(renewal, return_exceptions=True)
+            await self._collection.delete_one({"_id": self._user_id, "owner": owner})
+
+    def check_held(self) -> None:
+        # the lease is renewed ahead of time, so a lease that is about
+        # to expire is already considered lost
+        margin = self.LEASE_DURATION / 3
+        if self._lease_expires_at is None or (
+            datetime.now(timezone.utc) + margin >= self._lease_expires_at
+        ):
+            raise ImportLockLostError(LOST_MESSAGE)
+
+    async def _try_acquire(self, owner: str) -> bool:
+        now = datetime.now(timezone.utc)
+        expires_at = now + self.LEASE_DURATION
+        try:
+            # inserts a lease if there is none, takes over an expired one
+            # and fails with duplicate `_id` if the lease is held
+            await self._collection.update_one(
+                {"_id": self._user_id, "expires_at": {"$lte": now}},
+                {"$set": {"owner": owner, "expires_at": expires_at}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        self._lease_expires_at = expires_at
+        return True
+
+    async def _renew(self, owner: str) -> None:
+        while True:
+            await asyncio.sleep(self.LEASE_DURATION.total_seconds() / 3)
+            expires_at = datetime.now(timezone.utc) + self.LEASE_DURATION
+            result = await self._collection.update_one(
+                {"_id": self._user_id, "owner": owner},
+                {"$set": {"expires_at": expires_at}},
+            )
+            if not result.matched_count:
+                logger.warning("Import lock of user %s is lost", self._user_id)
+                self._lease_expires_at = None
+                return
+            self._lease_expires_at = expires_at
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import io
+import mmap
+import threading
+from collections import deque
+from contextlib import contextmanager
 from typing import TYPE_CHECKING, BinaryIO
 
+import mmh3
+
 from clippings.books.adapters.kindle_parser.parser import KindleClippingsParser
 from clippings.books.dtos import BookDTO, ClippingImportCandidateDTO
-from clippings.books.entities import ClippingType
+from clippings.books.entities import ClippingType, ImportFingerprint
 from clippings.books.ports import ClippingsReaderABC
+from clippings.seedwork.exceptions import DomainError
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Generator, Iterator
+
+    from clippings.books.adapters.kindle_parser.parser import RawClipping
 
 
 class MockClippingsReader(ClippingsReaderABC):
@@ -21,33 +33,246 @@ class MockClippingsReader(ClippingsReaderABC):
 
 
 class KindleClippingsReader(ClippingsReaderABC):
-    def __init__(self, file_object: BinaryIO) -> None:
+    """
+    Reads whole clippings between separator lines with bytes-level search
+    and decodes each of them once. Big files (e.g. uploads that are already
+    spooled to disk) are memory-mapped instead of being read into memory.
+
+    Parsing is CPU bound, so it runs in a thread of the default executor
+    and candidates are passed back to the event loop in batches through
+    a bounded queue: the parser waits while the consumer is behind.
+
+    If a process pool is given, files of at least `PARALLEL_MIN_SIZE`
+    bytes are split at record boundaries into chunks of about `CHUNK_SIZE`
+    bytes, which are parsed in the pool. The pool is shared between
+    readers, so it's created and shut down by the caller. Candidates
+    are still returned in file order.
+
+    Files usually grow by appending records, so if the file starts with
+    the part that was imported before (checked by its length and mmh3 hash),
+    only the records after it are parsed.
+    """
+
+    SEPARATOR = b"=========="
+    BOM = b"\xef\xbb\xbf"
+    MMAP_MIN_SIZE = 1024 * 1024
+    BATCH_SIZE = 500
+    QUEUE_SIZE = 4
+    PARALLEL_MIN_SIZE = 8 * 1024 * 1024
+    CHUNK_SIZE = 1024 * 1024
+    # limit of chunks sliced from the buffer and results waiting for their turn
+    MAX_PENDING_CHUNKS = 8
+
+    def __init__(
+        self,
+        file_object: BinaryIO,
+        *,
+        process_pool: concurrent.futures.Executor | None = None,
+    ) -> None:
         self._file_object = file_object
-        self._encoding = "utf-8-sig"
+        self._encoding = "utf-8"
+        self._process_pool = process_pool
+        self._start = 0
+        self._fingerprint: ImportFingerprint | None = None
+
+    async def skip_imported(self, fingerprint: ImportFingerprint) -> bool:
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, self._starts_with, fingerprint):
+            self._start = fingerprint.size
+            return True
+        return False
+
+    def get_fingerprint(self) -> ImportFingerprint | None:
+        return self._fingerprint
 
     async def read(self) -> AsyncGenerator[ClippingImportCandidateDTO, None]:
-        parser = KindleClippingsParser()
-        for raw_line in self._file_object:
-            line = raw_line.decode(self._encoding)
-            parser.add_line(line)
-            if clipping := parser.get_clipping():
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[list[ClippingImportCandidateDTO] | None] = asyncio.Queue(
+            maxsize=self.QUEUE_SIZE
+        )
+        stop = threading.Event()
+        producer = loop.run_in_executor(None, self._produce, loop, queue, stop)
+        try:
+            while (batch := await queue.get()) is not None:
+                for candidate in batch:
+                    yield candidate
+        finally:
+            stop.set()
+            await producer
+
+    def _produce(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue[list[ClippingImportCandidateDTO] | None],
+        stop: threading.Event,
+    ) -> None:
+        def put(item: list[ClippingImportCandidateDTO] | None) -> bool:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            while not stop.is_set():
                 try:
-                    clipping_type = ClippingType(clipping["type"])
-                except ValueError:
+                    future.result(timeout=0.1)
+                except concurrent.futures.TimeoutError:
                     continue
+                return True
+            future.cancel()
+            return False
+
+        try:
+            batch = []
+            for candidate in self.iter_candidates():
+                batch.append(candidate)
+                if len(batch) >= self.BATCH_SIZE:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch:
+                put(batch)
+        finally:
+            put(None)
+
+    def iter_candidates(self) -> Iterator[ClippingImportCandidateDTO]:
+        """Parse the file synchronously."""
+        with self._open_buffer() as buffer:
+            size = len(buffer) - self._start
+            if self._process_pool is not None and size >= self.PARALLEL_MIN_SIZE:
+                yield from self._parse_in_parallel(buffer, self._process_pool)
+            else:
+                yield from self._parse_records(buffer, self._start)
+            end = self._complete_records_end(buffer, self._start) or self._start
+            self._fingerprint = ImportFingerprint(
+                size=end, hash=self._hash_prefix(buffer, end)
+            )
+
+    def _parse_records(
+        self, buffer: bytes | mmap.mmap, start: int = 0
+    ) -> Iterator[ClippingImportCandidateDTO]:
+        parser = KindleClippingsParser()
+        view = memoryview(buffer)
+        try:
+            for record_start, record_end in self._iter_records(buffer, start):
+                with view[record_start:record_end] as record:
+                    text = str(record, self._encoding)
+                clipping = parser.parse_record(text)
+                if clipping is None or isinstance(clipping, DomainError):
+                    continue
+                if candidate := raw_clipping_to_candidate(clipping):
+                    yield candidate
+        finally:
+            view.release()
+
+    def _parse_in_parallel(
+        self, buffer: bytes | mmap.mmap, executor: concurrent.futures.Executor
+    ) -> Iterator[ClippingImportCandidateDTO]:
+        pending: deque[concurrent.futures.Future[list[ClippingImportCandidateDTO]]] = (
+            deque()
+        )
+        try:
+            for start, end in self._iter_chunks(buffer, self._start):
+                pending.append(executor.submit(_parse_chunk, buffer[start:end]))
+                if len(pending) >= self.MAX_PENDING_CHUNKS:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _iter_chunks(
+        self, buffer: bytes | mmap.mmap, start: int = 0
+    ) -> Iterator[tuple[int, int]]:
+        """
+        Yield bounds of chunks which start at the beginning of a record.
+        The last chunk lasts to the end of the buffer.
+        """
+        chunk_start = None
+        for record_start, _ in self._iter_records(buffer, start):
+            if chunk_start is None:
+                chunk_start = record_start
+            elif record_start - chunk_start >= self.CHUNK_SIZE:
+                yield chunk_start, record_start
+                chunk_start = record_start
+        if chunk_start is not None:
+            yield chunk_start, len(buffer)
+
+    def _iter_records(
+        self, buffer: bytes | mmap.mmap, start: int = 0
+    ) -> Iterator[tuple[int, int]]:
+        """
+        Yield bounds of records which are followed by a separator line,
+        `start` must be the beginning of a record.
+        """
+        if start == 0 and buffer[: len(self.BOM)] == self.BOM:
+            start = len(self.BOM)
+        position = start
+        while (found := buffer.find(self.SEPARATOR, position)) != -1:
+            line_start = buffer.rfind(b"\n", start, found) + 1 or start
+            line_end = buffer.find(b"\n", found)
+            if line_end == -1:
+                line_end = len(buffer)
+            line = buffer[line_start:line_end].removeprefix(self.BOM)
+            if line.strip() == self.SEPARATOR:
+                yield start, line_start
+                start = line_end + 1
+            position = max(start, found + len(self.SEPARATOR))
+
+    def _complete_records_end(self, buffer: bytes | mmap.mmap, start: int = 0) -> int:
+        """Position after the separator line of the last record or 0."""
+        if not (last_record := deque(self._iter_records(buffer, start), maxlen=1)):
+            return 0
+        _, record_end = last_record[0]
+        return buffer.find(b"\n", record_end) + 1 or len(buffer)
+
+    def _starts_with(self, fingerprint: ImportFingerprint) -> bool:
+        with self._open_buffer() as buffer:
+            return fingerprint.size <= len(buffer) and fingerprint.hash == (
+                self._hash_prefix(buffer, fingerprint.size)
+            )
+
+    @staticmethod
+    def _hash_prefix(buffer: bytes | mmap.mmap, size: int) -> str:
+        with memoryview(buffer) as view, view[:size] as prefix:
+            return mmh3.mmh3_x64_128_digest(prefix).hex()
+
+    @contextmanager
+    def _open_buffer(self) -> Generator[bytes | mmap.mmap, None, None]:
+        self._file_object.seek(0, io.SEEK_END)
+        size = self._file_object.tell()
+        self._file_object.seek(0)
+        if size >= self.MMAP_MIN_SIZE:
+            try:
+                fileno = self._file_object.fileno()
+            except (AttributeError, io.UnsupportedOperation):
+                pass
+            else:
+                with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as buffer:
+                    yield buffer
+                return
+        yield self._file_object.read()
+
+
+def _parse_chunk(chunk: bytes) -> list[ClippingImportCandidateDTO]:
+    reader = KindleClippingsReader(io.BytesIO(chunk))
+    return list(reader._parse_records(chunk))
+
+
+def raw_clipping_to_candidate(
+    clipping: RawClipping,
+) -> ClippingImportCandidateDTO | None:
+    try:
+        clipping_type = ClippingType(clipping["type"])
+    except ValueError:
+        return None
 
-                yield ClippingImportCandidateDTO(
-                    book=BookDTO(
-                        title=clipping["title"],
-                        authors=[
-                            item.strip()
-                            for item in clipping["authors"].split(";")
-                            if item.strip()
-                        ],
-                    ),
-                    type=clipping_type,
-                    content="\n".join(clipping["content"]).strip(),
-                    page=clipping["page"],
-                    location=clipping["location"],
-                    added_at=clipping["added_at"],
-                )
+    return ClippingImportCandidateDTO(
+        book=BookDTO(
+            title=clipping["title"],
+            authors=[
+                item.strip() for item in clipping["authors"].split(";") if item.strip()
+            ],
+        ),
+        type=clipping_type,
+        content="\n".join(clipping["content"]).strip(),
+        page=clipping["page"],
+        location=clipping["location"],
+        added_at=clipping["added_at"],
+    )
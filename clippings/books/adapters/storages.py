@@ -1,23 +1,46 @@
 from __future__ import annotations
 
-from dataclasses import asdict
-from datetime import datetime
-from enum import Enum
+import time
+import uuid
 from typing import TYPE_CHECKING, Any
 
-from dacite import Config, from_dict
-from pymongo import ReplaceOne
-
-from clippings.books.entities import Book, DeletedHash
-from clippings.books.ports import BooksStorageABC, DeletedHashStorageABC
+from bson import Binary
+from prometheus_client import Counter
+from pymongo import ASCENDING, IndexModel, ReplaceOne, ReturnDocument
+
+from clippings.books.dtos import BookSummaryDTO
+from clippings.books.entities import (
+    Book,
+    Clipping,
+    DeletedHash,
+    ImportFingerprint,
+    ImportJob,
+    InlineNote,
+)
+from clippings.books.ports import (
+    BookPatchStorageABC,
+    BooksStorageABC,
+    DeletedHashStorageABC,
+    ImportFingerprintStorageABC,
+    ImportJobsStorageABC,
+)
+from clippings.books.serializers import (
+    book_from_dict,
+    book_to_dict,
+    clipping_to_dict,
+    import_job_from_dict,
+    import_job_to_dict,
+    inline_note_to_dict,
+)
+from clippings.utils.bloom import BloomFilter
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator, Callable, Mapping
 
-    from motor.motor_asyncio import AsyncIOMotorDatabase
+    from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
 
 
-class MemoryBooksStorage(BooksStorageABC):
+class MemoryBooksStorage(BooksStorageABC, BookPatchStorageABC):
     def __init__(self, books_map: dict[str, Book] | None = None) -> None:
         self.books: dict[str, Book] = {} if books_map is None else books_map
 
@@ -50,6 +73,8 @@ class MemoryBooksStorage(BooksStorageABC):
         self, query: BooksStorageABC.FindQuery = BooksStorageABC.DEFAULT_FIND_QUERY
     ) -> AsyncGenerator[Book, None]:
         books = sorted(self.books.values(), key=lambda b: (b.title, b.id))
+        if query.after is not None:
+            books = [book for book in books if (book.title, book.id) > query.after]
         start = query.start
         if query.limit is None:
             for book in books[start:]:
@@ -59,40 +84,155 @@ class MemoryBooksStorage(BooksStorageABC):
         for book in books[start:end]:
             yield book
 
+    async def find_summaries(
+        self, query: BooksStorageABC.FindQuery = BooksStorageABC.DEFAULT_FIND_QUERY
+    ) -> list[BookSummaryDTO]:
+        return [
+            BookSummaryDTO(
+                id=book.id,
+                title=book.title,
+                first_author=book.authors[0] if book.authors else None,
+                cover_image_small=book.meta.cover_image_small if book.meta else None,
+                rating=book.rating,
+                clippings_count=len(book.clippings),
+                last_clipping_added_at=max(
+                    (clipping.added_at for clipping in book.clippings), default=None
+                ),
+            )
+            async for book in self.find_iter(query)
+        ]
+
     async def count(self, query: BooksStorageABC.FindQuery) -> int:
+        if query == self.FindQuery(start=0, limit=None):
+            return len(self.books)
         return len(await self.find(query))
 
     async def distinct_authors(self) -> list[str]:
         return list({author for book in self.books.values() for author in book.authors})
 
+    # Stored books are shared with callers, so patches can arrive for changes
+    # that already applied to them. Every patch must be idempotent.
+
+    async def set_clipping_content(
+        self, book_id: str, clipping_id: str, content: str
+    ) -> None:
+        if clipping := self._get_clipping(book_id, clipping_id):
+            clipping.content = content
+
+    async def insert_clipping(
+        self, book_id: str, clipping: Clipping, position: int
+    ) -> None:
+        book = self.books.get(book_id)
+        if book is not None and book.get_clipping(clipping.id) is None:
+            book.clippings.insert(position, clipping)
+
+    async def remove_clipping(self, book_id: str, clipping_id: str) -> None:
+        book = self.books.get(book_id)
+        if book is not None and (clipping := book.get_clipping(clipping_id)):
+            book.remove_clipping(clipping)
+
+    async def add_inline_note(
+        self, book_id: str, clipping_id: str, inline_note: InlineNote
+    ) -> None:
+        clipping = self._get_clipping(book_id, clipping_id)
+        if clipping is not None and clipping.get_inline_note(inline_note.id) is None:
+            clipping.add_inline_note(inline_note)
+
+    async def set_inline_note_content(
+        self, book_id: str, clipping_id: str, inline_note_id: str, content: str
+    ) -> None:
+        if inline_note := self._get_inline_note(book_id, clipping_id, inline_note_id):
+            inline_note.content = content
+
+    async def remove_inline_note(
+        self, book_id: str, clipping_id: str, inline_note_id: str
+    ) -> None:
+        clipping = self._get_clipping(book_id, clipping_id)
+        if clipping is not None and (
+            inline_note := clipping.get_inline_note(inline_note_id)
+        ):
+            clipping.remove_inline_note(inline_note)
+
+    async def unlink_inline_note(
+        self,
+        book_id: str,
+        clipping_id: str,
+        inline_note_id: str,
+        restored_clipping: Clipping,
+        position: int,
+    ) -> None:
+        await self.remove_inline_note(book_id, clipping_id, inline_note_id)
+        await self.insert_clipping(book_id, restored_clipping, position)
+
+    def _get_clipping(self, book_id: str, clipping_id: str) -> Clipping | None:
+        book = self.books.get(book_id)
+        return book.get_clipping(clipping_id) if book else None
+
+    def _get_inline_note(
+        self, book_id: str, clipping_id: str, inline_note_id: str
+    ) -> InlineNote | None:
+        clipping = self._get_clipping(book_id, clipping_id)
+        return clipping.get_inline_note(inline_note_id) if clipping else None
+
 
 def mongo_book_serializer(book: Book, user_id: str) -> dict:
-    book_dict = asdict(book)
-    book_dict["_id"] = f"{user_id}|{book_dict['id']}"
+    book_dict = book_to_dict(book)
+    book_dict["_id"] = f"{user_id}|{book.id}"
     book_dict["user_id"] = user_id
-    for clipping in book_dict["clippings"]:
-        clipping["type"] = clipping["type"].value
     return book_dict
 
 
-def mongo_book_deserializer(book: dict) -> Book:
-    book_dict = book.copy()
-    return from_dict(
-        data_class=Book,
-        data=book_dict,
-        config=Config(forward_references={"datetime": datetime}, cast=[tuple, Enum]),
-    )
+def mongo_clipping_serializer(clipping: Clipping) -> dict:
+    return clipping_to_dict(clipping)
+
 
+def mongo_inline_note_serializer(inline_note: InlineNote) -> dict:
+    return inline_note_to_dict(inline_note)
+
+
+def mongo_book_deserializer(book: dict) -> Book:
+    return book_from_dict(book)
+
+
+class MongoBooksStorage(BooksStorageABC, BookPatchStorageABC):
+    """
+    With `use_counter` the total count of books of the user is kept in
+    a counter document, which is incremented after each write of books.
+    Mongo (standalone) can't do both writes in one transaction, so the
+    counter drifts if the process dies between them, and a write made
+    while the counter is re-checked can be counted twice. The counter is
+    re-checked with `count_documents` on read once per
+    `COUNTER_CHECK_INTERVAL` seconds, which bounds how long a drift lasts.
+    """
+
+    COLLECTION_NAME = "books"
+    COUNTERS_COLLECTION_NAME = "books_counters"
+    COUNTER_CHECK_INTERVAL = 60 * 60
+    INDEXES = [
+        IndexModel(
+            [("user_id", ASCENDING), ("title", ASCENDING), ("id", ASCENDING)],
+            name="user_id_title_id",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("id", ASCENDING)],
+            name="user_id_id_unique",
+            unique=True,
+        ),
+    ]
 
-class MongoBooksStorage(BooksStorageABC):
     def __init__(
         self,
         db: AsyncIOMotorDatabase,
         user_id: str,
         serializer: Callable[[Book, str], dict[str, Any]] = mongo_book_serializer,
         deserializer: Callable[[dict], Book] = mongo_book_deserializer,
+        use_counter: bool = False,
     ) -> None:
-        self._collection = db["books"]
+        self._collection = db[self.COLLECTION_NAME]
+        # Per-user books counter, so the total count doesn't depend
+        # on the number of books
+        self._counters = db[self.COUNTERS_COLLECTION_NAME] if use_counter else None
+        self._counter_exists = False
         self._user_id = user_id
         self._serializer = serializer
         self._deserializer = deserializer
@@ -108,11 +248,13 @@ class MongoBooksStorage(BooksStorageABC):
         return [self._deserializer(dict(book)) for book in books]
 
     async def add(self, book: Book) -> None:
-        await self._collection.replace_one(
+        await self._ensure_counter()
+        result = await self._collection.replace_one(
             {"id": book.id, "user_id": self._user_id},
             self._serializer(book, self._user_id),
             upsert=True,
         )
+        await self._inc_counter(0 if result.upserted_id is None else 1)
 
     async def extend(self, books: list[Book]) -> None:
         operations: list[ReplaceOne[Mapping[str, Any]]] = [
@@ -123,10 +265,16 @@ class MongoBooksStorage(BooksStorageABC):
             )
             for book in books
         ]
-        await self._collection.bulk_write(operations)
+        await self._ensure_counter()
+        result = await self._collection.bulk_write(operations)
+        await self._inc_counter(result.upserted_count)
 
     async def remove(self, book: Book) -> None:
-        await self._collection.delete_one({"id": book.id, "user_id": self._user_id})
+        await self._ensure_counter()
+        result = await self._collection.delete_one(
+            {"id": book.id, "user_id": self._user_id}
+        )
+        await self._inc_counter(-result.deleted_count)
 
     async def find(
         self, query: BooksStorageABC.FindQuery = BooksStorageABC.DEFAULT_FIND_QUERY
@@ -140,7 +288,7 @@ class MongoBooksStorage(BooksStorageABC):
             return
 
         cursor = (
-            self._collection.find({"user_id": self._user_id})
+            self._collection.find(self._find_filter(query))
             .sort([("title", 1), ("id", 1)])
             .skip(query.start)
         )
@@ -150,23 +298,127 @@ class MongoBooksStorage(BooksStorageABC):
         async for book in cursor:
             yield self._deserializer(dict(book))
 
-    async def count(self, query: BooksStorageABC.FindQuery) -> int:
+    async def find_summaries(
+        self, query: BooksStorageABC.FindQuery = BooksStorageABC.DEFAULT_FIND_QUERY
+    ) -> list[BookSummaryDTO]:
         if query.limit == 0:
-            return 0
+            return []
 
         pipeline: list[dict[str, Any]] = [
-            {"$match": {"user_id": self._user_id}},
+            {"$match": self._find_filter(query)},
+            {"$sort": {"title": 1, "id": 1}},
             {"$skip": query.start},
         ]
-
         if query.limit is not None:
             pipeline.append({"$limit": query.limit})
-
-        pipeline.append({"$count": "total"})
+        pipeline.append(
+            {
+                "$project": {
+                    "_id": 0,
+                    "id": 1,
+                    "title": 1,
+                    "first_author": {"$arrayElemAt": ["$authors", 0]},
+                    "cover_image_small": "$meta.cover_image_small",
+                    "rating": 1,
+                    "clippings_count": {"$size": "$clippings"},
+                    "last_clipping_added_at": {"$max": "$clippings.added_at"},
+                }
+            }
+        )
 
         result = await self._collection.aggregate(pipeline).to_list(None)
+        return [
+            BookSummaryDTO(
+                id=doc["id"],
+                title=doc["title"],
+                first_author=doc.get("first_author"),
+                cover_image_small=doc.get("cover_image_small"),
+                rating=doc.get("rating"),
+                clippings_count=doc["clippings_count"],
+                last_clipping_added_at=doc.get("last_clipping_added_at"),
+            )
+            for doc in result
+        ]
+
+    async def count(self, query: BooksStorageABC.FindQuery) -> int:
+        if query.limit == 0:
+            return 0
+        if self._counters is not None and query == self.FindQuery(start=0, limit=None):
+            return await self._get_counter()
 
-        return result[0]["total"] if result else 0
+        kwargs: dict[str, Any] = {"skip": query.start}
+        if query.limit is not None:
+            kwargs["limit"] = query.limit
+        return await self._collection.count_documents(
+            self._find_filter(query), **kwargs
+        )
+
+    async def _get_counter(self) -> int:
+        if self._counters is None:
+            return await self._collection.count_documents({"user_id": self._user_id})
+        counter = await self._counters.find_one({"_id": self._user_id})
+        if counter is None:
+            return await self._create_counter(self._counters)
+        if time.time() - counter.get("checked_at", 0) >= self.COUNTER_CHECK_INTERVAL:
+            return await self._check_counter(self._counters, counter["count"])
+        return counter["count"]
+
+    async def _check_counter(
+        self, counters: AsyncIOMotorCollection, counter_value: int
+    ) -> int:
+        count = await self._collection.count_documents({"user_id": self._user_id})
+        # the counter isn't replaced if it was incremented in the meantime,
+        # the check is repeated on the next read then
+        await counters.update_one(
+            {"_id": self._user_id, "count": counter_value},
+            {"$set": {"count": count, "checked_at": time.time()}},
+        )
+        return count
+
+    async def _ensure_counter(self) -> None:
+        """
+        Create the counter before the first write of books, so `$inc`
+        after the write always has a document to update.
+        """
+        if self._counters is None or self._counter_exists:
+            return
+        if await self._counters.find_one({"_id": self._user_id}) is None:
+            await self._create_counter(self._counters)
+        self._counter_exists = True
+
+    async def _create_counter(self, counters: AsyncIOMotorCollection) -> int:
+        # Books counted here were written before any counter of the user
+        # existed: every writer creates the counter before its own write,
+        # so a write that can be seen by `count_documents` here either
+        # predates counters or makes this upsert a no-op.
+        count = await self._collection.count_documents({"user_id": self._user_id})
+        counter = await counters.find_one_and_update(
+            {"_id": self._user_id},
+            {"$setOnInsert": {"count": count, "checked_at": time.time()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return counter["count"]
+
+    async def _inc_counter(self, value: int) -> None:
+        if self._counters is not None and value:
+            await self._counters.update_one(
+                {"_id": self._user_id}, {"$inc": {"count": value}}
+            )
+
+    def _find_filter(self, query: BooksStorageABC.FindQuery) -> dict[str, Any]:
+        if query.after is None:
+            return {"user_id": self._user_id}
+        # range predicate on (title, id) so it can be served by the
+        # (user_id, title, id) index without skipping documents
+        title, book_id = query.after
+        return {
+            "user_id": self._user_id,
+            "$or": [
+                {"title": {"$gt": title}},
+                {"title": title, "id": {"$gt": book_id}},
+            ],
+        }
 
     async def distinct_authors(self) -> list[str]:
         pipeline: list[dict[str, Any]] = [
@@ -177,6 +429,154 @@ class MongoBooksStorage(BooksStorageABC):
         result = await self._collection.aggregate(pipeline).to_list(None)
         return [doc["_id"] for doc in result]
 
+    async def set_clipping_content(
+        self, book_id: str, clipping_id: str, content: str
+    ) -> None:
+        await self._update_book(
+            {"clippings.id": clipping_id},
+            {"$set": {"clippings.$.content": content}},
+            book_id=book_id,
+        )
+
+    async def insert_clipping(
+        self, book_id: str, clipping: Clipping, position: int
+    ) -> None:
+        await self._update_book(
+            {"clippings.id": {"$ne": clipping.id}},
+            {
+                "$push": {
+                    "clippings": {
+                        "$each": [mongo_clipping_serializer(clipping)],
+                        "$position": position,
+                    }
+                }
+            },
+            book_id=book_id,
+        )
+
+    async def remove_clipping(self, book_id: str, clipping_id: str) -> None:
+        await self._update_book(
+            {}, {"$pull": {"clippings": {"id": clipping_id}}}, book_id=book_id
+        )
+
+    async def add_inline_note(
+        self, book_id: str, clipping_id: str, inline_note: InlineNote
+    ) -> None:
+        await self._update_book(
+            {
+                "clippings": {
+                    "$elemMatch": {
+                        "id": clipping_id,
+                        "inline_notes.id": {"$ne": inline_note.id},
+                    }
+                }
+            },
+            {
+                "$push": {
+                    "clippings.$.inline_notes": mongo_inline_note_serializer(
+                        inline_note
+                    )
+                }
+            },
+            book_id=book_id,
+        )
+
+    async def set_inline_note_content(
+        self, book_id: str, clipping_id: str, inline_note_id: str, content: str
+    ) -> None:
+        await self._update_book(
+            {},
+            {"$set": {"clippings.$[clipping].inline_notes.$[note].content": content}},
+            book_id=book_id,
+            array_filters=[{"clipping.id": clipping_id}, {"note.id": inline_note_id}],
+        )
+
+    async def remove_inline_note(
+        self, book_id: str, clipping_id: str, inline_note_id: str
+    ) -> None:
+        await self._update_book(
+            {},
+            {"$pull": {"clippings.$[clipping].inline_notes": {"id": inline_note_id}}},
+            book_id=book_id,
+            array_filters=[{"clipping.id": clipping_id}],
+        )
+
+    async def unlink_inline_note(
+        self,
+        book_id: str,
+        clipping_id: str,
+        inline_note_id: str,
+        restored_clipping: Clipping,
+        position: int,
+    ) -> None:
+        # Both changes are made to the `clippings` array, which operators
+        # like $pull and $push can't do in one update, so it's rebuilt
+        # with an aggregation pipeline
+        other_inline_notes = {
+            "$filter": {
+                "input": "$$clipping.inline_notes",
+                "as": "note",
+                "cond": {"$ne": ["$$note.id", inline_note_id]},
+            }
+        }
+        without_inline_note = {
+            "$map": {
+                "input": "$clippings",
+                "as": "clipping",
+                "in": {
+                    "$cond": [
+                        {"$eq": ["$$clipping.id", clipping_id]},
+                        {
+                            "$mergeObjects": [
+                                "$$clipping",
+                                {"inline_notes": other_inline_notes},
+                            ]
+                        },
+                        "$$clipping",
+                    ]
+                },
+            }
+        }
+        head = [] if position == 0 else {"$slice": ["$clippings", position]}
+        # the count of three-argument $slice must be positive
+        tail = {
+            "$slice": [
+                "$clippings",
+                position,
+                {"$max": [{"$size": "$clippings"}, 1]},
+            ]
+        }
+        restored = {"$literal": mongo_clipping_serializer(restored_clipping)}
+        with_restored_clipping = {
+            "$cond": [
+                {"$in": [restored_clipping.id, "$clippings.id"]},
+                "$clippings",
+                {"$concatArrays": [head, [restored], tail]},
+            ]
+        }
+        await self._update_book(
+            {},
+            [
+                {"$set": {"clippings": without_inline_note}},
+                {"$set": {"clippings": with_restored_clipping}},
+            ],
+            book_id=book_id,
+        )
+
+    async def _update_book(
+        self,
+        query: dict[str, Any],
+        update: dict[str, Any] | list[dict[str, Any]],
+        *,
+        book_id: str,
+        array_filters: list[dict[str, Any]] | None = None,
+    ) -> None:
+        await self._collection.update_one(
+            {"id": book_id, "user_id": self._user_id, **query},
+            update,
+            array_filters=array_filters,
+        )
+
 
 class MemoryDeletedHashStorage(DeletedHashStorageABC):
     def __init__(self, hashes_map: dict[str, DeletedHash] | None = None) -> None:
@@ -185,6 +585,9 @@ class MemoryDeletedHashStorage(DeletedHashStorageABC):
     async def get_all(self) -> list[DeletedHash]:
         return list(self.hashes.values())
 
+    async def contains_many(self, ids: list[str]) -> set[str]:
+        return {hash_id for hash_id in ids if hash_id in self.hashes}
+
     async def add(self, deleted_hash: DeletedHash) -> None:
         self.hashes[deleted_hash.id] = deleted_hash
 
@@ -195,18 +598,71 @@ class MemoryDeletedHashStorage(DeletedHashStorageABC):
         self.hashes.clear()
 
 
+BLOOM_LOOKUPS = Counter(
+    "deleted_hashes_bloom_lookups",
+    "Deleted hashes checked against the Bloom filter",
+)
+BLOOM_POSITIVES = Counter(
+    "deleted_hashes_bloom_positives",
+    "Deleted hashes that passed the Bloom filter and were checked in the database",
+)
+BLOOM_FALSE_POSITIVES = Counter(
+    "deleted_hashes_bloom_false_positives",
+    "Deleted hashes that passed the Bloom filter but weren't found in the database",
+)
+BLOOM_REBUILDS = Counter(
+    "deleted_hashes_bloom_rebuilds",
+    "How many times the Bloom filter of deleted hashes was rebuilt",
+)
+
+
 class MongoDeletedHashStorage(DeletedHashStorageABC):
+    """
+    Besides the hashes, keeps a per-user Bloom filter of them, so most
+    lookups of not deleted hashes don't hit the hashes collection.
+    Filter is rebuilt lazily when it's missing or full. Every write
+    of the filter sets a new random `version`, which is used for
+    optimistic locking.
+    """
+
+    COLLECTION_NAME = "deleted_hashes"
+    FILTERS_COLLECTION_NAME = "deleted_hashes_filters"
+    INDEXES = [IndexModel([("user_id", ASCENDING)], name="user_id")]
+    FILTER_MIN_CAPACITY = 1000
+    FILTER_ERROR_RATE = 0.01
+    FILTER_UPDATE_ATTEMPTS = 3
+
     def __init__(self, db: AsyncIOMotorDatabase, user_id: str) -> None:
-        self._collection = db["deleted_hashes"]
+        self._collection = db[self.COLLECTION_NAME]
+        self._filters = db[self.FILTERS_COLLECTION_NAME]
         self._user_id = user_id
 
     async def get_all(self) -> list[DeletedHash]:
         docs = await self._collection.find({"user_id": self._user_id}).to_list(None)
         return [DeletedHash(doc["_id"]) for doc in docs]
 
+    async def contains_many(self, ids: list[str]) -> set[str]:
+        if not ids:
+            return set()
+        doc = await self._filters.find_one({"_id": self._user_id})
+        bloom = self._bloom_from_doc(doc) if doc else await self._rebuild_filter()
+        candidates = [hash_id for hash_id in ids if hash_id in bloom]
+        BLOOM_LOOKUPS.inc(len(ids))
+        if not candidates:
+            return set()
+        docs = self._collection.find(
+            {"_id": {"$in": candidates}, "user_id": self._user_id},
+            projection={"_id": 1},
+        )
+        result = {doc["_id"] async for doc in docs}
+        BLOOM_POSITIVES.inc(len(candidates))
+        BLOOM_FALSE_POSITIVES.inc(sum(1 for item in candidates if item not in result))
+        return result
+
     async def add(self, hash: DeletedHash) -> None:
         doc = {"_id": hash.id, "user_id": self._user_id}
         await self._collection.replace_one({"_id": hash.id}, doc, upsert=True)
+        await self._add_to_filter(hash.id)
 
     async def extend(self, hashes: list[DeletedHash]) -> None:
         operations: list[ReplaceOne[Mapping[str, Any]]] = [
@@ -218,6 +674,149 @@ class MongoDeletedHashStorage(DeletedHashStorageABC):
             for hash in hashes
         ]
         await self._collection.bulk_write(operations)
+        await self._rebuild_filter()
 
     async def clear(self) -> None:
         await self._collection.delete_many({"user_id": self._user_id})
+        await self._rebuild_filter()
+
+    async def _add_to_filter(self, hash_id: str) -> None:
+        # filter must never miss a hash, so it's updated only if it wasn't
+        # rewritten (e.g. rebuilt) since it was read
+        for _ in range(self.FILTER_UPDATE_ATTEMPTS):
+            doc = await self._filters.find_one({"_id": self._user_id})
+            if doc is None:
+                return
+            if doc["items"] >= doc["capacity"]:
+                break
+            bloom = self._bloom_from_doc(doc)
+            bloom.add(hash_id)
+            result = await self._filters.update_one(
+                {"_id": self._user_id, "version": doc.get("version")},
+                {
+                    "$set": {
+                        "bits": Binary(bytes(bloom.bits)),
+                        "version": uuid.uuid4().hex,
+                    },
+                    "$inc": {"items": 1},
+                },
+            )
+            if result.modified_count:
+                return
+        # will be rebuilt on the next lookup
+        await self._filters.delete_one({"_id": self._user_id})
+
+    async def _rebuild_filter(self) -> BloomFilter:
+        BLOOM_REBUILDS.inc()
+        docs = self._collection.find({"user_id": self._user_id}, projection={"_id": 1})
+        ids = [doc["_id"] async for doc in docs]
+        capacity = max(len(ids) * 2, self.FILTER_MIN_CAPACITY)
+        bloom = BloomFilter.for_capacity(capacity, self.FILTER_ERROR_RATE)
+        for hash_id in ids:
+            bloom.add(hash_id)
+        await self._filters.replace_one(
+            {"_id": self._user_id},
+            {
+                "size": bloom.size,
+                "hash_count": bloom.hash_count,
+                "bits": Binary(bytes(bloom.bits)),
+                "capacity": capacity,
+                "items": len(ids),
+                "version": uuid.uuid4().hex,
+            },
+            upsert=True,
+        )
+        # hashes added while we were building the filter could be missed
+        current_count = await self._collection.count_documents(
+            {"user_id": self._user_id}
+        )
+        if current_count != len(ids):
+            await self._filters.delete_one({"_id": self._user_id})
+        return bloom
+
+    def _bloom_from_doc(self, doc: Mapping[str, Any]) -> BloomFilter:
+        return BloomFilter(
+            size=doc["size"], hash_count=doc["hash_count"], bits=doc["bits"]
+        )
+
+
+class MemoryImportJobsStorage(ImportJobsStorageABC):
+    def __init__(self, jobs_map: dict[str, ImportJob] | None = None) -> None:
+        self.jobs: dict[str, ImportJob] = {} if jobs_map is None else jobs_map
+
+    async def get(self, id: str) -> ImportJob | None:
+        return self.jobs.get(id)
+
+    async def save(self, job: ImportJob) -> None:
+        self.jobs[job.id] = job
+
+
+class MongoImportJobsStorage(ImportJobsStorageABC):
+    COLLECTION_NAME = "import_jobs"
+    FINISHED_JOBS_TTL_SECONDS = 7 * 24 * 60 * 60
+    # unfinished jobs have no `finished_at`, so they aren't expired
+    INDEXES = [
+        IndexModel(
+            [("finished_at", ASCENDING)],
+            name="finished_at_ttl",
+            expireAfterSeconds=FINISHED_JOBS_TTL_SECONDS,
+        ),
+    ]
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self._collection = db[self.COLLECTION_NAME]
+
+    async def get(self, id: str) -> ImportJob | None:
+        doc = await self._collection.find_one({"_id": id})
+        return import_job_from_dict(doc) if doc else None
+
+    async def save(self, job: ImportJob) -> None:
+        await self._collection.replace_one(
+            {"_id": job.id}, {"_id": job.id, **import_job_to_dict(job)}, upsert=True
+        )
+
+
+class MemoryImportFingerprintStorage(ImportFingerprintStorageABC):
+    def __init__(
+        self,
+        fingerprints_map: dict[str, ImportFingerprint] | None = None,
+        *,
+        user_id: str,
+    ) -> None:
+        self.fingerprints: dict[str, ImportFingerprint] = (
+            {} if fingerprints_map is None else fingerprints_map
+        )
+        self._user_id = user_id
+
+    async def get(self) -> ImportFingerprint | None:
+        return self.fingerprints.get(self._user_id)
+
+    async def set(self, fingerprint: ImportFingerprint) -> None:
+        self.fingerprints[self._user_id] = fingerprint
+
+    async def clear(self) -> None:
+        self.fingerprints.pop(self._user_id, None)
+
+
+class MongoImportFingerprintStorage(ImportFingerprintStorageABC):
+    COLLECTION_NAME = "import_fingerprints"
+
+    def __init__(self, db: AsyncIOMotorDatabase, user_id: str) -> None:
+        self._collection = db[self.COLLECTION_NAME]
+        self._user_id = user_id
+
+    async def get(self) -> ImportFingerprint | None:
+        doc = await self._collection.find_one({"_id": self._user_id})
+        if doc is None:
+            return None
+        return ImportFingerprint(size=doc["size"], hash=doc["hash"])
+
+    async def set(self, fingerprint: ImportFingerprint) -> None:
+        await self._collection.replace_one(
+            {"_id": self._user_id},
+            {"size": fingerprint.size, "hash": fingerprint.hash},
+            upsert=True,
+        )
+
+    async def clear(self) -> None:
+        await self._collection.delete_one({"_id": self._user_id})
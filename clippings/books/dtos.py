@@ -32,3 +32,39 @@ class BookInfoSearchResultDTO:
     authors: list[str]
     cover_image_small: str | None
     cover_image_big: str | None
+
+
+@dataclass
+class BookSummaryDTO:
+    id: str
+    title: str
+    first_author: str | None
+    cover_image_small: str | None
+    rating: int | None
+    clippings_count: int
+    last_clipping_added_at: datetime | None
+
+
+@dataclass
+class ImportedBookDTO:
+    title: str
+    authors: str
+    imported_clippings_count: int
+    is_new: bool
+
+
+@dataclass
+class ImportPreviewDTO:
+    """
+    What import would do with clippings of a book: add new ones (notes among
+    them can be linked to highlights as inline notes) and skip ones that were
+    deleted by the user or are already in the book.
+    """
+
+    title: str
+    authors: str
+    is_new: bool
+    new_clippings_count: int = 0
+    deleted_clippings_count: int = 0
+    duplicate_clippings_count: int = 0
+    linked_notes_count: int = 0
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import bisect
+import operator
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import TYPE_CHECKING, TypeAlias
+from itertools import compress
+from typing import TYPE_CHECKING, Protocol, TypeAlias
 
 from clippings.books.constants import (
     BOOK_AUTHOR_MAX_LENGTH,
@@ -21,19 +24,45 @@ from clippings.seedwork.exceptions import (
 from clippings.seedwork.validators import truncate_string
 
 if TYPE_CHECKING:
-    from datetime import datetime
+    from collections.abc import Sequence
+    from datetime import datetime, timedelta
 
+    from clippings.books.dtos import ImportedBookDTO
     from clippings.books.ports import InlineNoteIdGenerator
 
 
-@dataclass
+class _WithId(Protocol):
+    id: str
+
+
+def _find_position(
+    items: Sequence[_WithId], index: dict[str, int] | None, item_id: str
+) -> tuple[int | None, dict[str, int]]:
+    """
+    Find position of item by id using (and returning) id->position index.
+    Lists of entities are public and can be changed directly,
+    so a hit is verified and a stale or missing entry triggers a rebuild.
+    """
+    if index is not None:
+        position = index.get(item_id)
+        if (
+            position is not None
+            and position < len(items)
+            and items[position].id == item_id
+        ):
+            return position, index
+    index = {item.id: i for i, item in enumerate(items)}
+    return index.get(item_id), index
+
+
+@dataclass(slots=True)
 class BookMeta:
     isbns: list[str]
     cover_image_small: str | None
     cover_image_big: str | None
 
 
-@dataclass
+@dataclass(slots=True)
 class Book:
     UNKNOWN_AUTHOR = "Unknown Author"
 
@@ -44,6 +73,9 @@ class Book:
     review: str = ""
     rating: int | None = None
     meta: BookMeta | None = None
+    _clippings_index: dict[str, int] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         if len(self.id) > 13:
@@ -69,66 +101,129 @@ class Book:
         self.authors = authors.split(" & ")
 
     def get_clipping(self, clipping_id: str) -> Clipping | None:
-        for clipping in self.clippings:
-            if clipping.id == clipping_id:
-                return clipping
-        return None
+        position = self.get_clipping_position(clipping_id)
+        return None if position is None else self.clippings[position]
+
+    def get_clipping_position(self, clipping_id: str) -> int | None:
+        position, self._clippings_index = _find_position(
+            self.clippings, self._clippings_index, clipping_id
+        )
+        return position
 
     def remove_clipping(self, clipping: Clipping) -> None:
-        for i, item in enumerate(self.clippings):
-            if clipping.id == item.id:
-                del self.clippings[i]
-                break
+        position = self.get_clipping_position(clipping.id)
+        if position is not None:
+            del self.clippings[position]
+            self._clippings_index = None
 
     def add_clippings(self, clippings: list[Clipping]) -> int:
-        existed_ids = set()
+        """
+        Add clippings that are not in the book yet (also skipping ones that
+        are linked as inline notes). If clippings of the book are already
+        in reading order, only new clippings are sorted and then merged in,
+        otherwise all of them are sorted.
+        """
+        known_ids = self._get_known_ids()
+        new_clippings = []
+        for clipping in clippings:
+            if clipping.id not in known_ids:
+                new_clippings.append(clipping)
+                known_ids.add(clipping.id)
+                for inline_note in clipping.inline_notes:
+                    if inline_note.original_id:
+                        known_ids.add(inline_note.original_id)
+        if new_clippings:
+            self._merge_in_reading_order(new_clippings)
+        return len(new_clippings)
+
+    def _get_known_ids(self) -> set[str]:
+        # not cached: inline notes can be changed through their clippings
+        known_ids = set()
         for clipping in self.clippings:
-            existed_ids.add(clipping.id)
+            known_ids.add(clipping.id)
             for inline_note in clipping.inline_notes:
                 if inline_note.original_id:
-                    existed_ids.add(inline_note.original_id)
+                    known_ids.add(inline_note.original_id)
+        return known_ids
 
-        added_count = 0
-        for clipping in clippings:
-            if clipping.id not in existed_ids:
-                self.clippings.append(clipping)
-                added_count += 1
-                existed_ids.add(clipping.id)
-        self._sort_clippings_in_reading_order()
-        return added_count
+    def _merge_in_reading_order(self, new_clippings: list[Clipping]) -> None:
+        # few clippings: binary search for each one is cheaper than a sort
+        few_new = len(new_clippings) * len(self.clippings).bit_length() < len(
+            self.clippings
+        )
+        # but it needs ordered clippings, which isn't guaranteed
+        # e.g. for legacy or restored books
+        if few_new and _is_in_reading_order(self.clippings):
+            new_clippings.sort(key=_reading_order_key)
+            low = 0
+            for clipping in new_clippings:
+                low = bisect.bisect_right(
+                    self.clippings,
+                    _reading_order_key(clipping),
+                    lo=low,
+                    key=_reading_order_key,
+                )
+                self.clippings.insert(low, clipping)
+                low += 1
+        else:
+            # timsort finds the already ordered run and merges new clippings into it
+            self.clippings.extend(new_clippings)
+            self.clippings.sort(key=_reading_order_key)
+        self._clippings_index = None
 
     def _sort_clippings_in_reading_order(self) -> None:
-        clipping_type_order = {
-            ClippingType.HIGHLIGHT: 0,
-            ClippingType.NOTE: 1,
-            ClippingType.UNLINKED_NOTE: 1,
-        }
-        self.clippings.sort(
-            key=lambda cl: (cl.position_id, clipping_type_order[cl.type])
-        )
+        self.clippings.sort(key=_reading_order_key)
+        self._clippings_index = None
 
     def link_notes(self, *, inline_note_id_generator: InlineNoteIdGenerator) -> None:
         self._sort_clippings_in_reading_order()
+        self._link_ordered_notes(inline_note_id_generator)
+
+    def add_and_link_clippings(
+        self,
+        clippings: list[Clipping],
+        *,
+        inline_note_id_generator: InlineNoteIdGenerator,
+    ) -> int:
+        """
+        Same as `add_clippings` followed by `link_notes`, but relies on order
+        kept by `add_clippings` and sorts clippings again only if they aren't
+        in reading order.
+        """
+        added_count = self.add_clippings(clippings)
+        if not added_count and not _is_in_reading_order(self.clippings):
+            # `add_clippings` puts clippings in order only if it adds some
+            self._sort_clippings_in_reading_order()
+        self._link_ordered_notes(inline_note_id_generator)
+        return added_count
+
+    def _link_ordered_notes(
+        self, inline_note_id_generator: InlineNoteIdGenerator
+    ) -> None:
         pos_to_highlight: dict[Position, Clipping] = {}
-        to_delete = []
-        for i, cl in enumerate(self.clippings):
+        not_linked = []
+        for cl in self.clippings:
             if cl.type == ClippingType.HIGHLIGHT:
                 pos_to_highlight[cl.position_id] = cl
-            elif cl.type == ClippingType.NOTE and cl.position_id in pos_to_highlight:
-                prev_hl = pos_to_highlight[cl.position_id]
-                prev_hl.inline_notes.append(
+            elif cl.type == ClippingType.NOTE and (
+                highlight := pos_to_highlight.get(cl.position_id)
+            ):
+                highlight.add_inline_note(
                     InlineNote.create_from_clipping(
                         cl, id_generator=inline_note_id_generator
                     )
                 )
-                to_delete.append(i)
+                continue
+            not_linked.append(cl)
 
-        for i in reversed(to_delete):
-            del self.clippings[i]
+        if len(not_linked) != len(self.clippings):
+            self.clippings[:] = not_linked
+            self._clippings_index = None
 
     def unlink_inline_note(
         self, clipping_id: str, inline_note_id: str
-    ) -> None | DomainError:
+    ) -> Clipping | DomainError:
+        """Turn the inline note back into a clipping and return the clipping."""
         clipping = self.get_clipping(clipping_id)
         if clipping is None:
             return CantFindEntityError(f"Clipping with id {clipping_id} not found")
@@ -143,7 +238,7 @@ class Book:
             return new_clipping
         clipping.remove_inline_note(inline_note)
         self.add_clippings([new_clipping])
-        return None
+        return new_clipping
 
 
 class ClippingType(Enum):
@@ -152,7 +247,37 @@ class ClippingType(Enum):
     UNLINKED_NOTE = "unlinked_note"
 
 
-@dataclass
+_CLIPPING_TYPE_ORDER = {
+    ClippingType.HIGHLIGHT: 0,
+    ClippingType.NOTE: 1,
+    ClippingType.UNLINKED_NOTE: 1,
+}
+
+
+def _reading_order_key(clipping: Clipping) -> tuple[Position, int]:
+    # same as `position_id`, inlined: called for every clipping on each sort
+    return (
+        (clipping.page[0], clipping.location[0]),
+        _CLIPPING_TYPE_ORDER[clipping.type],
+    )
+
+
+def _is_in_reading_order(clippings: list[Clipping]) -> bool:
+    # positions are compared first: hashing of `ClippingType` for the full key
+    # is slow, and it's needed only for clippings with the same position
+    positions = [(clipping.page[0], clipping.location[0]) for clipping in clippings]
+    if not all(map(operator.le, positions, positions[1:])):
+        return False
+    same_position = compress(
+        range(len(positions) - 1), map(operator.eq, positions, positions[1:])
+    )
+    return all(
+        _reading_order_key(clippings[i]) <= _reading_order_key(clippings[i + 1])
+        for i in same_position
+    )
+
+
+@dataclass(slots=True)
 class InlineNote:
     id: str
     content: str
@@ -197,7 +322,7 @@ class InlineNote:
 Position: TypeAlias = tuple[int, int]
 
 
-@dataclass
+@dataclass(slots=True)
 class Clipping:
     id: str
     page: Position
@@ -206,6 +331,9 @@ class Clipping:
     content: str
     inline_notes: list[InlineNote]
     added_at: datetime
+    _inline_notes_index: dict[str, int] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         if len(self.id) > 13:
@@ -219,19 +347,25 @@ class Clipping:
         return self.page[0], self.location[0]
 
     def get_inline_note(self, note_id: str) -> InlineNote | None:
-        for note in self.inline_notes:
-            if note.id == note_id:
-                return note
-        return None
+        position = self._get_inline_note_position(note_id)
+        return None if position is None else self.inline_notes[position]
 
     def remove_inline_note(self, inline_note: InlineNote) -> None:
-        for i, item in enumerate(self.inline_notes):
-            if inline_note.id == item.id:
-                del self.inline_notes[i]
-                break
+        position = self._get_inline_note_position(inline_note.id)
+        if position is not None:
+            del self.inline_notes[position]
+            self._inline_notes_index = None
 
     def add_inline_note(self, inline_note: InlineNote) -> None:
         self.inline_notes.append(inline_note)
+        if self._inline_notes_index is not None:
+            self._inline_notes_index[inline_note.id] = len(self.inline_notes) - 1
+
+    def _get_inline_note_position(self, note_id: str) -> int | None:
+        position, self._inline_notes_index = _find_position(
+            self.inline_notes, self._inline_notes_index, note_id
+        )
+        return position
 
     def restore(self, inline_note: InlineNote) -> Clipping | DomainError:
         if not inline_note.automatically_linked or not inline_note.original_id:
@@ -247,7 +381,7 @@ class Clipping:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DeletedHash:
     id: str
 
@@ -260,3 +394,88 @@ class DeletedHash:
         if not clipping_id:
             return cls(id=book_id)
         return cls(id=f"{book_id}:{clipping_id}")
+
+
+@dataclass(slots=True)
+class ImportFingerprint:
+    """
+    Length and hash of the beginning of a clippings file, which ends
+    with a complete record and is already imported.
+    """
+
+    size: int
+    hash: str
+
+
+class ImportStage(Enum):
+    PARSE = "parse"
+    DEDUPE = "dedupe"
+    ENRICH = "enrich"
+    WRITE = "write"
+
+
+class ImportJobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class ImportStageProgress:
+    stage: ImportStage
+    done: int = 0
+    total: int | None = None
+
+
+@dataclass(slots=True)
+class ImportJob:
+    id: str
+    user_id: str
+    status: ImportJobStatus
+    created_at: datetime
+    updated_at: datetime
+    stages: list[ImportStageProgress] = field(
+        default_factory=lambda: [ImportStageProgress(stage) for stage in ImportStage]
+    )
+    result: list[ImportedBookDTO] = field(default_factory=list)
+    error: str | None = None
+    finished_at: datetime | None = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (ImportJobStatus.DONE, ImportJobStatus.FAILED)
+
+    def is_stale(self, now: datetime, timeout: timedelta) -> bool:
+        """Not finished job that wasn't updated for a long time, e.g. after restart."""
+        return not self.is_finished and now - self.updated_at > timeout
+
+    def get_stage(self, stage: ImportStage) -> ImportStageProgress:
+        for progress in self.stages:
+            if progress.stage == stage:
+                return progress
+        progress = ImportStageProgress(stage)
+        self.stages.append(progress)
+        return progress
+
+    def start(self, now: datetime) -> None:
+        self.status = ImportJobStatus.RUNNING
+        self.updated_at = now
+
+    def update_progress(
+        self, stage: ImportStage, done: int, total: int | None, now: datetime
+    ) -> None:
+        progress = self.get_stage(stage)
+        progress.done = done
+        progress.total = total
+        self.updated_at = now
+
+    def finish(self, result: list[ImportedBookDTO], now: datetime) -> None:
+        self.status = ImportJobStatus.DONE
+        self.result = result
+        self.updated_at = self.finished_at = now
+
+    def fail(self, error: str, now: datetime) -> None:
+        self.status = ImportJobStatus.FAILED
+        self.error = error
+        self.updated_at = self.finished_at = now
@@ -0,0 +1,9 @@
+from clippings.seedwork.exceptions import DomainError
+
+
+class ImportInProgressError(DomainError):
+    pass
+
+
+class ImportLockLostError(ImportInProgressError):
+    """The lock expired while it was held, another import could take it."""
@@ -6,10 +6,25 @@ from typing import TYPE_CHECKING, Protocol
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
+    from contextlib import AbstractAsyncContextManager
     from datetime import datetime
 
-    from clippings.books.dtos import BookInfoSearchResultDTO, ClippingImportCandidateDTO
-    from clippings.books.entities import Book, ClippingType, DeletedHash, Position
+    from clippings.books.dtos import (
+        BookInfoSearchResultDTO,
+        BookSummaryDTO,
+        ClippingImportCandidateDTO,
+    )
+    from clippings.books.entities import (
+        Book,
+        Clipping,
+        ClippingType,
+        DeletedHash,
+        ImportFingerprint,
+        ImportJob,
+        ImportStage,
+        InlineNote,
+        Position,
+    )
 
 
 class BooksStorageABC(abc.ABC):
@@ -17,6 +32,9 @@ class BooksStorageABC(abc.ABC):
     class FindQuery:
         start: int = 0
         limit: int | None = 10
+        # (title, id) of the last seen book; results start right after it.
+        # Unlike `start` it doesn't slow down on deep pages
+        after: tuple[str, str] | None = None
 
     DEFAULT_FIND_QUERY = FindQuery()
 
@@ -50,6 +68,12 @@ class BooksStorageABC(abc.ABC):
     ) -> AsyncGenerator[Book, None]:
         pass
 
+    @abc.abstractmethod
+    async def find_summaries(
+        self, query: FindQuery = DEFAULT_FIND_QUERY
+    ) -> list[BookSummaryDTO]:
+        """Same as `find`, but without loading clippings of the books"""
+
     @abc.abstractmethod
     async def count(self, query: FindQuery) -> int:
         pass
@@ -59,11 +83,70 @@ class BooksStorageABC(abc.ABC):
         pass
 
 
+class BookPatchStorageABC(abc.ABC):
+    """
+    Targeted updates of clippings and inline notes inside of a stored book.
+    Changes only the given parts of the book instead of writing it whole.
+    """
+
+    @abc.abstractmethod
+    async def set_clipping_content(
+        self, book_id: str, clipping_id: str, content: str
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def insert_clipping(
+        self, book_id: str, clipping: Clipping, position: int
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def remove_clipping(self, book_id: str, clipping_id: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def add_inline_note(
+        self, book_id: str, clipping_id: str, inline_note: InlineNote
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def set_inline_note_content(
+        self, book_id: str, clipping_id: str, inline_note_id: str, content: str
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def remove_inline_note(
+        self, book_id: str, clipping_id: str, inline_note_id: str
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def unlink_inline_note(
+        self,
+        book_id: str,
+        clipping_id: str,
+        inline_note_id: str,
+        restored_clipping: Clipping,
+        position: int,
+    ) -> None:
+        """
+        Remove the inline note and insert the clipping restored from it
+        in one update.
+        """
+
+
 class DeletedHashStorageABC(abc.ABC):
     @abc.abstractmethod
     async def get_all(self) -> list[DeletedHash]:
         pass
 
+    @abc.abstractmethod
+    async def contains_many(self, ids: list[str]) -> set[str]:
+        """Return subset of `ids` that are in the storage"""
+
     @abc.abstractmethod
     async def add(self, deleted_hash: DeletedHash) -> None:
         pass
@@ -77,11 +160,69 @@ class DeletedHashStorageABC(abc.ABC):
         pass
 
 
+class ImportJobsStorageABC(abc.ABC):
+    """Import jobs of all users, unlike other storages it isn't user scoped."""
+
+    @abc.abstractmethod
+    async def get(self, id: str) -> ImportJob | None:
+        pass
+
+    @abc.abstractmethod
+    async def save(self, job: ImportJob) -> None:
+        pass
+
+
+class ImportFingerprintStorageABC(abc.ABC):
+    @abc.abstractmethod
+    async def get(self) -> ImportFingerprint | None:
+        pass
+
+    @abc.abstractmethod
+    async def set(self, fingerprint: ImportFingerprint) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def clear(self) -> None:
+        pass
+
+
+class ImportLockABC(abc.ABC):
+    """
+    Lock of a user's books for imports and restores: they merge books
+    in memory, so concurrent ones would overwrite each other's changes.
+    """
+
+    @abc.abstractmethod
+    def hold(self) -> AbstractAsyncContextManager[None]:
+        """Wait for the lock, raise `ImportInProgressError` on timeout."""
+
+    @abc.abstractmethod
+    def check_held(self) -> None:
+        """
+        Raise `ImportLockLostError` if the lock was lost while it's held.
+        Must be called before every write made under the lock.
+        """
+
+
 class ClippingsReaderABC(abc.ABC):
     @abc.abstractmethod
     def read(self) -> AsyncGenerator[ClippingImportCandidateDTO, None]:
         pass
 
+    async def skip_imported(self, fingerprint: ImportFingerprint) -> bool:
+        """
+        Make `read` skip the beginning of the input if it's the one
+        `fingerprint` was made of. Return `True` if it's skipped.
+        """
+        return False
+
+    def get_fingerprint(self) -> ImportFingerprint | None:
+        """
+        Fingerprint of the input, available after `read` is finished.
+        `None` if the reader doesn't support fingerprints.
+        """
+        return None
+
 
 class BookInfoClientABC(abc.ABC):
     @abc.abstractmethod
@@ -117,3 +258,10 @@ class ClippingIdGenerator(Protocol):
 class InlineNoteIdGenerator(Protocol):
     def __call__(self) -> str:
         pass
+
+
+class ImportProgressListener(Protocol):
+    async def __call__(
+        self, stage: ImportStage, done: int, total: int | None = None
+    ) -> None:
+        pass
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from clippings.books.dtos import ImportedBookDTO
+from clippings.books.entities import (
+    Book,
+    BookMeta,
+    Clipping,
+    ClippingType,
+    ImportJob,
+    ImportJobStatus,
+    ImportStage,
+    ImportStageProgress,
+    InlineNote,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    DatetimeHook = Callable[[Any], datetime]
+
+
+def _keep_datetime(value: Any) -> datetime:
+    if not isinstance(value, datetime):
+        raise TypeError(f"Expected datetime, got {type(value).__name__}")
+    return value
+
+
+def book_from_dict(
+    data: Mapping[str, Any], *, datetime_hook: DatetimeHook = _keep_datetime
+) -> Book:
+    """
+    Build `Book` with nested entities from a plain dict.
+
+    Entities are created through their constructors, so `__post_init__`
+    validation and truncation still apply. Unknown keys (e.g. `_id`, `user_id`)
+    are ignored. `datetime_hook` converts raw `added_at` values:
+    by default they must already be `datetime` objects (as returned by Mongo).
+    """
+    meta = data.get("meta")
+    return Book(
+        id=data["id"],
+        title=data["title"],
+        authors=list(data["authors"]),
+        clippings=[
+            clipping_from_dict(clipping, datetime_hook=datetime_hook)
+            for clipping in data["clippings"]
+        ],
+        review=data.get("review", ""),
+        rating=data.get("rating"),
+        meta=None if meta is None else book_meta_from_dict(meta),
+    )
+
+
+def book_meta_from_dict(data: Mapping[str, Any]) -> BookMeta:
+    return BookMeta(
+        isbns=list(data["isbns"]),
+        cover_image_small=data.get("cover_image_small"),
+        cover_image_big=data.get("cover_image_big"),
+    )
+
+
+def clipping_from_dict(
+    data: Mapping[str, Any], *, datetime_hook: DatetimeHook = _keep_datetime
+) -> Clipping:
+    page_start, page_end = data["page"]
+    location_start, location_end = data["location"]
+    return Clipping(
+        id=data["id"],
+        page=(page_start, page_end),
+        location=(location_start, location_end),
+        type=ClippingType(data["type"]),
+        content=data["content"],
+        inline_notes=[
+            inline_note_from_dict(note, datetime_hook=datetime_hook)
+            for note in data["inline_notes"]
+        ],
+        added_at=datetime_hook(data["added_at"]),
+    )
+
+
+def inline_note_from_dict(
+    data: Mapping[str, Any], *, datetime_hook: DatetimeHook = _keep_datetime
+) -> InlineNote:
+    return InlineNote(
+        id=data["id"],
+        content=data["content"],
+        original_id=data.get("original_id"),
+        automatically_linked=data["automatically_linked"],
+        added_at=datetime_hook(data["added_at"]),
+    )
+
+
+def book_to_dict(book: Book) -> dict[str, Any]:
+    """
+    Single pass counterpart of `dataclasses.asdict` for `Book`.
+
+    Immutable values (strings, tuples, datetimes) are shared instead of being
+    deep copied and `ClippingType` is stored by value.
+    """
+    return {
+        "id": book.id,
+        "title": book.title,
+        "authors": list(book.authors),
+        "clippings": [clipping_to_dict(clipping) for clipping in book.clippings],
+        "review": book.review,
+        "rating": book.rating,
+        "meta": None if book.meta is None else book_meta_to_dict(book.meta),
+    }
+
+
+def book_meta_to_dict(meta: BookMeta) -> dict[str, Any]:
+    return {
+        "isbns": list(meta.isbns),
+        "cover_image_small": meta.cover_image_small,
+        "cover_image_big": meta.cover_image_big,
+    }
+
+
+def clipping_to_dict(clipping: Clipping) -> dict[str, Any]:
+    return {
+        "id": clipping.id,
+        "page": clipping.page,
+        "location": clipping.location,
+        "type": clipping.type.value,
+        "content": clipping.content,
+        "inline_notes": [inline_note_to_dict(note) for note in clipping.inline_notes],
+        "added_at": clipping.added_at,
+    }
+
+
+def inline_note_to_dict(inline_note: InlineNote) -> dict[str, Any]:
+    return {
+        "id": inline_note.id,
+        "content": inline_note.content,
+        "original_id": inline_note.original_id,
+        "automatically_linked": inline_note.automatically_linked,
+        "added_at": inline_note.added_at,
+    }
+
+
+def import_job_to_dict(job: ImportJob) -> dict[str, Any]:
+    return {
+        "id": job.id,
+        "user_id": job.user_id,
+        "status": job.status.value,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "stages": [
+            {
+                "stage": progress.stage.value,
+                "done": progress.done,
+                "total": progress.total,
+            }
+            for progress in job.stages
+        ],
+        "result": [
+            {
+                "title": item.title,
+                "authors": item.authors,
+                "imported_clippings_count": item.imported_clippings_count,
+                "is_new": item.is_new,
+            }
+            for item in job.result
+        ],
+        "error": job.error,
+        "finished_at": job.finished_at,
+    }
+
+
+def import_job_from_dict(data: Mapping[str, Any]) -> ImportJob:
+    return ImportJob(
+        id=data["id"],
+        user_id=data["user_id"],
+        status=ImportJobStatus(data["status"]),
+        created_at=data["created_at"],
+        updated_at=data["updated_at"],
+        stages=[
+            ImportStageProgress(
+                stage=ImportStage(progress["stage"]),
+                done=progress["done"],
+                total=progress["total"],
+            )
+            for progress in data["stages"]
+        ],
+        result=[
+            ImportedBookDTO(
+                title=item["title"],
+                authors=item["authors"],
+                imported_clippings_count=item["imported_clippings_count"],
+                is_new=item["is_new"],
+            )
+            for item in data["result"]
+        ],
+        error=data.get("error"),
+        finished_at=data.get("finished_at"),
+    )
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-from typing import TYPE_CHECKING
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Protocol
 
 from clippings.books.entities import Book, BookMeta
-from clippings.seedwork.exceptions import QuotaExceededError
+from clippings.seedwork.exceptions import DomainError, QuotaExceededError
 
 if TYPE_CHECKING:
     from clippings.users.entities import User
@@ -19,17 +22,44 @@ except ImportError:
         return (iterable[i : i + n] for i in range(0, len(iterable), n))
 
 
+class Closable(Protocol):
+    def close(self) -> None:
+        pass
+
+
 if TYPE_CHECKING:
-    from clippings.books.ports import BookInfoClientABC
+    from collections.abc import Awaitable, Callable
+
+    from clippings.books.dtos import ImportedBookDTO
+    from clippings.books.entities import ImportJob, ImportStage
+    from clippings.books.ports import (
+        BookInfoClientABC,
+        ImportJobsStorageABC,
+        ImportProgressListener,
+    )
+
+    ImportJobRun = Callable[[ImportProgressListener], Awaitable[list[ImportedBookDTO]]]
+    QueuedImportJob = tuple[ImportJob, ImportJobRun, Closable | None]
+
+logger = logging.getLogger(__name__)
 
 
 class EnrichBooksMetaService:
     def __init__(self, book_info_client: BookInfoClientABC) -> None:
         self._book_info_client = book_info_client
 
-    async def execute(self, books: list[Book]) -> None:
+    async def execute(
+        self,
+        books: list[Book],
+        on_progress: Callable[[int], Awaitable[None]] | None = None,
+    ) -> None:
+        """`on_progress` is called with count of processed books after each batch."""
+        done = 0
         for batch in batched(books, 4):
             await asyncio.gather(*[self._enrich(book) for book in batch])
+            done += len(batch)
+            if on_progress is not None:
+                await on_progress(done)
 
     async def _enrich(self, book: Book) -> Book:
         author = book.get_first_author()
@@ -77,3 +107,134 @@ def check_clippings_per_book_limit(
             user_id=user.id,
             book_title=book_title or "",
         )
+
+
+class ImportJobsRunner:
+    """
+    Runs import jobs in the background on `workers_count` asyncio workers,
+    so the request that created a job doesn't wait for it.
+    Progress is saved at most once per `PROGRESS_SAVE_INTERVAL` seconds.
+
+    Jobs of a user are run one after another: the next one is queued only
+    when the previous one is finished, so workers aren't blocked waiting
+    for a user's import lock while jobs of other users are queued.
+
+    A job can be submitted with a resource it needs (e.g. the uploaded
+    file), which the runner closes when the job is finished or won't be run.
+
+    Jobs aren't resumed after restart, they become stale instead
+    (see `ImportJob.is_stale`).
+    """
+
+    PROGRESS_SAVE_INTERVAL = 0.5
+    STALE_JOB_TIMEOUT = timedelta(minutes=15)
+
+    def __init__(
+        self,
+        storage: ImportJobsStorageABC,
+        workers_count: int = 2,
+        max_queued_jobs: int = 100,
+    ) -> None:
+        self._storage = storage
+        self._workers_count = workers_count
+        self._max_queued_jobs = max_queued_jobs
+        self._queue: asyncio.Queue[QueuedImportJob] = asyncio.Queue()
+        # jobs waiting for the running or queued job of their user
+        self._waiting: dict[str, deque[QueuedImportJob]] = {}
+        self._unfinished_count = 0
+        self._workers: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self._workers_count)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while not self._queue.empty():
+            _, _, resource = self._queue.get_nowait()
+            _close_resource(resource)
+        for waiting in self._waiting.values():
+            for _, _, resource in waiting:
+                _close_resource(resource)
+        self._waiting.clear()
+
+    async def join(self) -> None:
+        """Wait until all submitted jobs are finished."""
+        await self._queue.join()
+
+    async def submit(
+        self,
+        job: ImportJob,
+        run: ImportJobRun,
+        resource: Closable | None = None,
+    ) -> None | DomainError:
+        if self._unfinished_count >= self._max_queued_jobs:
+            _close_resource(resource)
+            return DomainError("Too many imports in progress, please try again later")
+        try:
+            await self._storage.save(job)
+        except BaseException:
+            _close_resource(resource)
+            raise
+        self._unfinished_count += 1
+        if job.user_id in self._waiting:
+            self._waiting[job.user_id].append((job, run, resource))
+        else:
+            self._waiting[job.user_id] = deque()
+            self._queue.put_nowait((job, run, resource))
+        return None
+
+    async def _work(self) -> None:
+        while True:
+            job, run, resource = await self._queue.get()
+            try:
+                await self._run(job, run)
+            except Exception:
+                # e.g. the storage is unavailable, the worker must survive it
+                logger.exception("Can't run import job %s", job.id)
+            finally:
+                _close_resource(resource)
+                self._unfinished_count -= 1
+                self._queue_next_of_user(job.user_id)
+                self._queue.task_done()
+
+    def _queue_next_of_user(self, user_id: str) -> None:
+        if waiting := self._waiting[user_id]:
+            self._queue.put_nowait(waiting.popleft())
+        else:
+            del self._waiting[user_id]
+
+    async def _run(self, job: ImportJob, run: ImportJobRun) -> None:
+        loop = asyncio.get_running_loop()
+        job.start(datetime.now())
+        await self._storage.save(job)
+        saved_at = loop.time()
+
+        async def progress_listener(
+            stage: ImportStage, done: int, total: int | None = None
+        ) -> None:
+            nonlocal saved_at
+            job.update_progress(stage, done, total, datetime.now())
+            if loop.time() - saved_at >= self.PROGRESS_SAVE_INTERVAL:
+                saved_at = loop.time()
+                await self._storage.save(job)
+
+        try:
+            result = await run(progress_listener)
+        except DomainError as e:
+            job.fail(str(e), datetime.now())
+        except Exception:
+            logger.exception("Import job %s failed", job.id)
+            job.fail("Something went wrong while importing clippings", datetime.now())
+        else:
+            job.finish(result, datetime.now())
+        await self._storage.save(job)
+
+
+def _close_resource(resource: Closable | None) -> None:
+    if resource is not None:
+        resource.close()
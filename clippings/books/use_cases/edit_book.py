@@ -9,8 +9,10 @@ from clippings.seedwork.exceptions import CantFindEntityError, DomainError
 
 if TYPE_CHECKING:
     from clippings.books.ports import (
+        BookPatchStorageABC,
         BooksStorageABC,
         DeletedHashStorageABC,
+        ImportFingerprintStorageABC,
         InlineNoteIdGenerator,
     )
     from clippings.books.services import EnrichBooksMetaService
@@ -98,8 +100,11 @@ class ClippingFieldsDTO:
 
 
 class EditClippingUseCase:
-    def __init__(self, book_storage: BooksStorageABC):
+    def __init__(
+        self, book_storage: BooksStorageABC, book_patch_storage: BookPatchStorageABC
+    ):
         self._book_storage = book_storage
+        self._book_patch_storage = book_patch_storage
 
     async def execute(self, data: ClippingFieldsDTO) -> None | DomainError:
         book = await self._book_storage.get(data.book_id)
@@ -111,7 +116,9 @@ class EditClippingUseCase:
                 f"Can't find clipping with id: {data.id}; Book id: {data.book_id}"
             )
         clipping.content = data.content
-        await self._book_storage.add(book)
+        await self._book_patch_storage.set_clipping_content(
+            book.id, clipping.id, clipping.content
+        )
         return None
 
 
@@ -119,9 +126,11 @@ class AddInlineNoteUseCase:
     def __init__(
         self,
         book_storage: BooksStorageABC,
+        book_patch_storage: BookPatchStorageABC,
         inline_note_id_generator: InlineNoteIdGenerator,
     ):
         self._book_storage = book_storage
+        self._book_patch_storage = book_patch_storage
         self._inline_note_id_generator = inline_note_id_generator
 
     async def execute(
@@ -141,13 +150,18 @@ class AddInlineNoteUseCase:
             id_generator=self._inline_note_id_generator,
         )
         clipping.add_inline_note(inline_note)
-        await self._book_storage.add(book)
+        await self._book_patch_storage.add_inline_note(
+            book.id, clipping.id, inline_note
+        )
         return None
 
 
 class EditInlineNoteUseCase:
-    def __init__(self, book_storage: BooksStorageABC):
+    def __init__(
+        self, book_storage: BooksStorageABC, book_patch_storage: BookPatchStorageABC
+    ):
         self._book_storage = book_storage
+        self._book_patch_storage = book_patch_storage
 
     async def execute(
         self, book_id: str, clipping_id: str, inline_note_id: str, content: str
@@ -166,7 +180,9 @@ class EditInlineNoteUseCase:
                 f"Can't find inline note with id: {inline_note_id}"
             )
         inline_note.content = content
-        await self._book_storage.add(book)
+        await self._book_patch_storage.set_inline_note_content(
+            book.id, clipping.id, inline_note.id, inline_note.content
+        )
         return None
 
 
@@ -188,9 +204,13 @@ class DeleteBookUseCase:
 
 class DeleteClippingUseCase:
     def __init__(
-        self, book_storage: BooksStorageABC, deleted_hash_storage: DeletedHashStorageABC
+        self,
+        book_storage: BooksStorageABC,
+        book_patch_storage: BookPatchStorageABC,
+        deleted_hash_storage: DeletedHashStorageABC,
     ):
         self._book_storage = book_storage
+        self._book_patch_storage = book_patch_storage
         self._deleted_hash_storage = deleted_hash_storage
 
     async def execute(self, book_id: str, clipping_id: str) -> None | DomainError:
@@ -199,7 +219,7 @@ class DeleteClippingUseCase:
             return CantFindEntityError(f"Can't find book with id: {book_id}")
         if clipping := book.get_clipping(clipping_id):
             book.remove_clipping(clipping)
-            await self._book_storage.add(book)
+            await self._book_patch_storage.remove_clipping(book.id, clipping.id)
             await self._deleted_hash_storage.add(
                 DeletedHash.from_ids(book.id, clipping_id=clipping_id)
             )
@@ -218,9 +238,13 @@ class DeleteClippingUseCase:
 
 class DeleteInlineNoteUseCase:
     def __init__(
-        self, book_storage: BooksStorageABC, deleted_hash_storage: DeletedHashStorageABC
+        self,
+        book_storage: BooksStorageABC,
+        book_patch_storage: BookPatchStorageABC,
+        deleted_hash_storage: DeletedHashStorageABC,
     ):
         self._book_storage = book_storage
+        self._book_patch_storage = book_patch_storage
         self._deleted_hash_storage = deleted_hash_storage
 
     async def execute(
@@ -240,7 +264,9 @@ class DeleteInlineNoteUseCase:
                 f"Can't find inline note with id: {inline_note_id}"
             )
         clipping.remove_inline_note(inline_note)
-        await self._book_storage.add(book)
+        await self._book_patch_storage.remove_inline_note(
+            book.id, clipping.id, inline_note.id
+        )
         if inline_note.automatically_linked:
             await self._deleted_hash_storage.add(
                 DeletedHash.from_ids(book_id, clipping_id=inline_note.original_id)
@@ -249,8 +275,11 @@ class DeleteInlineNoteUseCase:
 
 
 class UnlinkInlineNoteUseCase:
-    def __init__(self, book_storage: BooksStorageABC):
+    def __init__(
+        self, book_storage: BooksStorageABC, book_patch_storage: BookPatchStorageABC
+    ):
         self._book_storage = book_storage
+        self._book_patch_storage = book_patch_storage
 
     async def execute(
         self, book_id: str, clipping_id: str, inline_note_id: str
@@ -259,17 +288,32 @@ class UnlinkInlineNoteUseCase:
         if book is None:
             return CantFindEntityError(f"Can't find book with id: {book_id}")
 
-        result = book.unlink_inline_note(clipping_id, inline_note_id)
-        if isinstance(result, DomainError):
-            return result
-        await self._book_storage.add(book)
+        restored_clipping = book.unlink_inline_note(clipping_id, inline_note_id)
+        if isinstance(restored_clipping, DomainError):
+            return restored_clipping
+        position = book.get_clipping_position(restored_clipping.id)
+        if position is None:
+            return CantFindEntityError(
+                f"Can't find clipping with id: {restored_clipping.id} "
+                f"in book with id: {book_id}"
+            )
+        await self._book_patch_storage.unlink_inline_note(
+            book.id, clipping_id, inline_note_id, restored_clipping, position
+        )
         return None
 
 
 class ClearDeletedHashesUseCase:
-    def __init__(self, deleted_hash_storage: DeletedHashStorageABC):
+    def __init__(
+        self,
+        deleted_hash_storage: DeletedHashStorageABC,
+        fingerprint_storage: ImportFingerprintStorageABC,
+    ):
         self._deleted_hash_storage = deleted_hash_storage
+        self._fingerprint_storage = fingerprint_storage
 
     async def execute(self) -> None:
         await self._deleted_hash_storage.clear()
+        # deleted clippings must be imported again from the whole file
+        await self._fingerprint_storage.clear()
         return None
@@ -69,9 +69,11 @@ class ExportDataUseCase:
         deleted_hash_serializer: Callable[
             [DeletedHash], str
         ] = deleted_hash_json_serializer,
+        batch_size: int = 100,
     ) -> None:
         self._book_storage = book_storage
         self._deleted_hash_storage = deleted_hash_storage
+        self._batch_size = batch_size
         self._book_serializer = book_serializer
         self._deleted_hash_serializer = deleted_hash_serializer
         self._version = "1"
@@ -86,13 +88,27 @@ class ExportDataUseCase:
         )
 
     async def _generate_data(self) -> AsyncGenerator[str, None]:
-        query = self._book_storage.FindQuery(start=0, limit=None)
         yield self._format_item(json.dumps({"version": self._version}))
-        async for book in self._book_storage.find_iter(query):
+        async for book in self._iter_books():
             yield self._format_item(self._book_serializer(book))
 
         for deleted_hash in await self._deleted_hash_storage.get_all():
             yield self._format_item(self._deleted_hash_serializer(deleted_hash))
 
+    async def _iter_books(self) -> AsyncGenerator[Book, None]:
+        # Walk books in batches by (title, id) cursor, so we don't keep
+        # database cursor open while the client is slowly downloading data
+        after = None
+        while True:
+            query = self._book_storage.FindQuery(
+                start=0, limit=self._batch_size, after=after
+            )
+            books = await self._book_storage.find(query)
+            for book in books:
+                yield book
+            if len(books) < self._batch_size:
+                return
+            after = (books[-1].title, books[-1].id)
+
     def _format_item(self, item: str) -> str:
         return f"{item}\n"
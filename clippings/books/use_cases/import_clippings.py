@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import Counter
 from typing import TYPE_CHECKING
 
-from clippings.books.entities import Book, Clipping, DeletedHash
+from clippings.books.dtos import ImportedBookDTO, ImportPreviewDTO
+from clippings.books.entities import Book, Clipping, DeletedHash, ImportStage
+from clippings.books.serializers import book_from_dict, book_to_dict
 from clippings.books.services import (
     EnrichBooksMetaService,
     check_book_limit,
@@ -18,20 +20,39 @@ if TYPE_CHECKING:
         ClippingIdGenerator,
         ClippingsReaderABC,
         DeletedHashStorageABC,
+        ImportFingerprintStorageABC,
+        ImportLockABC,
+        ImportProgressListener,
         InlineNoteIdGenerator,
     )
+    from clippings.users.entities import User
     from clippings.users.ports import UsersStorageABC
 
 
-@dataclass
-class ImportedBookDTO:
-    title: str
-    authors: str
-    imported_clippings_count: int
-    is_new: bool
+class ImportClippingsUseCase:
+    """
+    Imports clippings in a single pass over the reader. Candidates are grouped
+    per book and committed when `MAX_PENDING_CLIPPINGS` of them are read and
+    at the end of the file, `COMMIT_BATCH_SIZE` books at a time, so memory use
+    doesn't depend on the file size or on the count of books of the user.
 
+    Quotas of all pending books are checked before the first of their batches
+    is written, so an import that exceeds a quota writes nothing, unless
+    the file has more than `MAX_PENDING_CLIPPINGS` clippings: books committed
+    from earlier parts of such file stay imported.
+
+    Fingerprint of the input is saved after a successful import, so the next
+    import of the same growing file reads only records appended since then.
+    Imports of a user are serialized by `lock`, an import that waited for
+    another one reads only records that the other one hasn't imported.
+    The lock is checked before every write, an import that lost it fails
+    with `ImportLockLostError` without writing anything more.
+    """
+
+    DELETED_HASHES_BATCH_SIZE = 1000
+    MAX_PENDING_CLIPPINGS = 10_000
+    COMMIT_BATCH_SIZE = 100
 
-class ImportClippingsUseCase:
     def __init__(
         self,
         storage: BooksStorageABC,
@@ -42,6 +63,9 @@ class ImportClippingsUseCase:
         clipping_id_generator: ClippingIdGenerator,
         inline_note_id_generator: InlineNoteIdGenerator,
         users_storage: UsersStorageABC,
+        fingerprint_storage: ImportFingerprintStorageABC,
+        lock: ImportLockABC,
+        progress_listener: ImportProgressListener | None = None,
     ) -> None:
         self._storage = storage
         self._reader = reader
@@ -51,15 +75,95 @@ class ImportClippingsUseCase:
         self._clipping_id_generator = clipping_id_generator
         self._inline_note_id_generator = inline_note_id_generator
         self._users_storage = users_storage
+        self._fingerprint_storage = fingerprint_storage
+        self._lock = lock
+        self._progress_listener = progress_listener
+        self._enriched_count = 0
+        self._written_count = 0
+        self._previews: dict[str, ImportPreviewDTO] = {}
+        self._not_written_books: dict[str, Book] = {}
+        self._not_written_new_books_count = 0
+
+    async def execute(self, user_id: str) -> list[ImportedBookDTO]:
+        async with self._lock.hold():
+            previews = await self._import(user_id, dry_run=False)
+        return [
+            ImportedBookDTO(
+                title=preview.title,
+                authors=preview.authors,
+                imported_clippings_count=preview.new_clippings_count,
+                is_new=preview.is_new,
+            )
+            for preview in previews
+            if preview.new_clippings_count
+        ]
 
-    async def execute(self, user_id: str) -> list[ImportedBookDTO]:  # noqa: C901
+    async def preview(self, user_id: str) -> list[ImportPreviewDTO]:
+        """
+        Dry run of the import: the same reads and checks are made, but
+        nothing is written. Books of previous batches are kept in memory
+        instead of being written, so the memory use isn't bounded
+        by `COMMIT_BATCH_SIZE`.
+        """
+        return await self._import(user_id, dry_run=True)
+
+    async def _import(  # noqa: C901
+        self, user_id: str, *, dry_run: bool
+    ) -> list[ImportPreviewDTO]:
         user = await self._users_storage.get(user_id)
         if not user:
             raise CantFindEntityError(f"User with id '{user_id}' not found.")
 
+        self._enriched_count = 0
+        self._written_count = 0
+        self._previews = {}
+        self._not_written_books = {}
+        self._not_written_new_books_count = 0
         book_id_to_book_map: dict[str, Book] = {}
         book_id_to_clippings_map: dict[str, list[Clipping]] = {}
-        deleted_hashes = await self._deleted_hash_storage.get_all()
+        deleted_counts: Counter[str] = Counter()
+        not_checked_clippings: list[tuple[str, str, Clipping]] = []
+        pending_count = 0
+        parsed_count = 0
+        checked_count = 0
+
+        async def add_not_deleted_clippings() -> None:
+            nonlocal checked_count
+            deleted_hashes = await self._deleted_hash_storage.contains_many(
+                [hash_id for hash_id, _, _ in not_checked_clippings]
+            )
+            for hash_id, book_id, clipping in not_checked_clippings:
+                if hash_id in deleted_hashes:
+                    deleted_counts[book_id] += 1
+                else:
+                    book_id_to_clippings_map.setdefault(book_id, []).append(clipping)
+            checked_count += len(not_checked_clippings)
+            not_checked_clippings.clear()
+            await self._report_progress(ImportStage.PARSE, parsed_count)
+            await self._report_progress(ImportStage.DEDUPE, checked_count)
+
+        async def commit_pending() -> None:
+            nonlocal pending_count
+            await add_not_deleted_clippings()
+            books = list(book_id_to_book_map.values())
+            if not dry_run and len(books) > self.COMMIT_BATCH_SIZE:
+                await self._check_quotas(user, books, book_id_to_clippings_map)
+            for i in range(0, len(books), self.COMMIT_BATCH_SIZE):
+                await self._commit(
+                    user,
+                    books[i : i + self.COMMIT_BATCH_SIZE],
+                    book_id_to_clippings_map,
+                    deleted_counts,
+                    dry_run=dry_run,
+                )
+            book_id_to_book_map.clear()
+            book_id_to_clippings_map.clear()
+            deleted_counts.clear()
+            pending_count = 0
+
+        if fingerprint := await self._fingerprint_storage.get():
+            await self._reader.skip_imported(fingerprint)
+
         async for candidate in self._reader.read():
             book_id = self._book_id_generator(candidate.book)
             if book_id not in book_id_to_book_map:
@@ -82,19 +186,62 @@ class ImportClippingsUseCase:
             clipping_deleted_hash = DeletedHash.from_ids(
                 book_id, clipping_id=clipping.id
             )
-            if clipping_deleted_hash in deleted_hashes:
-                continue
-            book_id_to_clippings_map.setdefault(book_id, []).append(clipping)
+            not_checked_clippings.append((clipping_deleted_hash.id, book_id, clipping))
+            parsed_count += 1
+            pending_count += 1
+            if pending_count >= self.MAX_PENDING_CLIPPINGS:
+                await commit_pending()
+            elif len(not_checked_clippings) >= self.DELETED_HASHES_BATCH_SIZE:
+                await add_not_deleted_clippings()
+        await commit_pending()
+        if not dry_run and (fingerprint := self._reader.get_fingerprint()):
+            self._lock.check_held()
+            await self._fingerprint_storage.set(fingerprint)
+
+        await self._report_progress(ImportStage.PARSE, parsed_count, parsed_count)
+        await self._report_progress(ImportStage.DEDUPE, checked_count, parsed_count)
+        await self._report_progress(
+            ImportStage.ENRICH, self._enriched_count, self._enriched_count
+        )
+        await self._report_progress(
+            ImportStage.WRITE, self._written_count, self._written_count
+        )
+        return list(self._previews.values())
 
-        books_from_storage = await self._storage.get_many(list(book_id_to_book_map))
+    async def _commit(  # noqa: C901
+        self,
+        user: User,
+        books: list[Book],
+        book_id_to_clippings_map: dict[str, list[Clipping]],
+        deleted_counts: Counter[str],
+        *,
+        dry_run: bool,
+    ) -> None:
+        books_from_storage = await self._storage.get_many(
+            [book.id for book in books if book.id not in self._not_written_books]
+        )
+        if dry_run:
+            # memory storage returns stored books themselves
+            books_from_storage = [
+                book_from_dict(book_to_dict(book)) for book in books_from_storage
+            ]
         books_from_storage_by_id = {book.id: book for book in books_from_storage}
+        for book in books:
+            if not_written_book := self._not_written_books.get(book.id):
+                books_from_storage_by_id[book.id] = not_written_book
+        deleted_books_hashes = await self._deleted_hash_storage.contains_many(
+            [
+                DeletedHash.from_ids(book.id).id
+                for book in books
+                if book.id not in books_from_storage_by_id
+            ]
+        )
 
         to_update: list[Book] = []
         books_to_add_meta = []
-        statistics: list[ImportedBookDTO] = []
-        for candidate_book_id, book in book_id_to_book_map.items():
-            new_clippings = book_id_to_clippings_map.get(candidate_book_id, [])
-            if existed_book := books_from_storage_by_id.get(candidate_book_id):
+        for book in books:
+            new_clippings = book_id_to_clippings_map.get(book.id, [])
+            if existed_book := books_from_storage_by_id.get(book.id):
                 if new_clippings:
                     check_clippings_per_book_limit(
                         user,
@@ -102,19 +249,24 @@ class ImportClippingsUseCase:
                         clippings_being_added_count=len(new_clippings),
                         book_title=existed_book.title,
                     )
-                if added := existed_book.add_clippings(new_clippings):
+                added, linked = self._add_clippings(existed_book, new_clippings)
+                if added:
                     to_update.append(existed_book)
-                    statistics.append(
-                        ImportedBookDTO(
-                            title=existed_book.title,
-                            authors=existed_book.authors_to_str(),
-                            imported_clippings_count=added,
-                            is_new=False,
-                        )
-                    )
+                self._add_to_preview(
+                    existed_book,
+                    is_new=False,
+                    new=added,
+                    deleted=deleted_counts[book.id],
+                    duplicate=len(new_clippings) - added,
+                    linked=linked,
+                )
             else:
-                book_deleted_hash = DeletedHash.from_ids(book.id)
-                if book_deleted_hash in deleted_hashes:
+                if DeletedHash.from_ids(book.id).id in deleted_books_hashes:
+                    self._add_to_preview(
+                        book,
+                        is_new=False,
+                        deleted=deleted_counts[book.id] + len(new_clippings),
+                    )
                     continue
 
                 if new_clippings:
@@ -125,34 +277,132 @@ class ImportClippingsUseCase:
                         book_title=book.title,
                     )
 
-                # Add clippings (even if empty, to create the book object
-                # if it's truly new and not filtered)
-                # The add_clippings method handles the actual addition.
-                # If new_clippings is empty, len(book.clippings) will be 0.
-                book.add_clippings(new_clippings)
+                added, linked = self._add_clippings(book, new_clippings)
 
                 if new_clippings:
                     to_update.append(book)
                     books_to_add_meta.append(book)
-                    statistics.append(
-                        ImportedBookDTO(
-                            title=book.title,
-                            authors=book.authors_to_str(),
-                            imported_clippings_count=len(book.clippings),
-                            is_new=True,
-                        )
-                    )
+                self._add_to_preview(
+                    book,
+                    is_new=bool(new_clippings),
+                    new=added,
+                    deleted=deleted_counts[book.id],
+                    duplicate=len(new_clippings) - added,
+                    linked=linked,
+                )
 
         if books_to_add_meta:
             current_user_book_count = await self._storage.count(
-                self._storage.FindQuery()
+                self._storage.FindQuery(start=0, limit=None)
             )
-            check_book_limit(user, current_user_book_count, len(books_to_add_meta))
+            check_book_limit(
+                user,
+                current_user_book_count + self._not_written_new_books_count,
+                len(books_to_add_meta),
+            )
+
+        if dry_run:
+            self._not_written_books.update((book.id, book) for book in to_update)
+            self._not_written_new_books_count += len(books_to_add_meta)
+            return
+
+        enriched_before = self._enriched_count
 
-        await self._enrich_books_meta_service.execute(books_to_add_meta)
-        for book in to_update:
-            book.link_notes(inline_note_id_generator=self._inline_note_id_generator)
+        async def on_enrich_progress(done: int) -> None:
+            self._enriched_count = enriched_before + done
+            await self._report_progress(ImportStage.ENRICH, self._enriched_count)
+
+        await self._enrich_books_meta_service.execute(
+            books_to_add_meta, on_progress=on_enrich_progress
+        )
 
         if to_update:
+            self._lock.check_held()
             await self._storage.extend(to_update)
-        return statistics
+            self._written_count += len(to_update)
+            await self._report_progress(ImportStage.WRITE, self._written_count)
+
+    async def _check_quotas(
+        self,
+        user: User,
+        books: list[Book],
+        book_id_to_clippings_map: dict[str, list[Clipping]],
+    ) -> None:
+        """
+        The same checks as `_commit` does, for books of all batches. Stored
+        books are read batch by batch and only their clippings counts are kept.
+        """
+        new_books_count = 0
+        for i in range(0, len(books), self.COMMIT_BATCH_SIZE):
+            batch = [
+                book
+                for book in books[i : i + self.COMMIT_BATCH_SIZE]
+                if book_id_to_clippings_map.get(book.id)
+            ]
+            stored_clippings_counts = {
+                book.id: len(book.clippings)
+                for book in await self._storage.get_many([book.id for book in batch])
+            }
+            deleted_books_hashes = await self._deleted_hash_storage.contains_many(
+                [
+                    DeletedHash.from_ids(book.id).id
+                    for book in batch
+                    if book.id not in stored_clippings_counts
+                ]
+            )
+            for book in batch:
+                if book.id in stored_clippings_counts:
+                    current_count = stored_clippings_counts[book.id]
+                elif DeletedHash.from_ids(book.id).id in deleted_books_hashes:
+                    continue
+                else:
+                    current_count = 0
+                    new_books_count += 1
+                check_clippings_per_book_limit(
+                    user,
+                    book_current_clipping_count=current_count,
+                    clippings_being_added_count=len(book_id_to_clippings_map[book.id]),
+                    book_title=book.title,
+                )
+
+        if new_books_count:
+            current_user_book_count = await self._storage.count(
+                self._storage.FindQuery(start=0, limit=None)
+            )
+            check_book_limit(user, current_user_book_count, new_books_count)
+
+    def _add_clippings(self, book: Book, clippings: list[Clipping]) -> tuple[int, int]:
+        """Return counts of added clippings and of notes linked to highlights."""
+        clippings_count = len(book.clippings)
+        added = book.add_and_link_clippings(
+            clippings, inline_note_id_generator=self._inline_note_id_generator
+        )
+        return added, clippings_count + added - len(book.clippings)
+
+    def _add_to_preview(
+        self,
+        book: Book,
+        *,
+        is_new: bool,
+        new: int = 0,
+        deleted: int = 0,
+        duplicate: int = 0,
+        linked: int = 0,
+    ) -> None:
+        if not (new or deleted or duplicate or linked):
+            return
+        # a book can be committed several times during one import
+        if not (preview := self._previews.get(book.id)):
+            preview = self._previews[book.id] = ImportPreviewDTO(
+                title=book.title, authors=book.authors_to_str(), is_new=is_new
+            )
+        preview.new_clippings_count += new
+        preview.deleted_clippings_count += deleted
+        preview.duplicate_clippings_count += duplicate
+        preview.linked_notes_count += linked
+
+    async def _report_progress(
+        self, stage: ImportStage, done: int, total: int | None = None
+    ) -> None:
+        if self._progress_listener is not None:
+            await self._progress_listener(stage, done, total)
@@ -2,10 +2,9 @@ from __future__ import annotations
 
 import json
 from datetime import datetime
-from enum import Enum
 from typing import TYPE_CHECKING
 
-from dacite import Config, from_dict
+from dacite import from_dict
 from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
@@ -19,7 +18,14 @@ from clippings.books.constants import (
     CLIPPING_MAX_INLINE_NOTES,
 )
 from clippings.books.entities import Book, DeletedHash
-from clippings.books.ports import BooksStorageABC, DeletedHashStorageABC
+from clippings.books.exceptions import ImportInProgressError
+from clippings.books.ports import (
+    BooksStorageABC,
+    DeletedHashStorageABC,
+    ImportFingerprintStorageABC,
+    ImportLockABC,
+)
+from clippings.books.serializers import book_from_dict
 from clippings.books.services import (
     EnrichBooksMetaService,
     check_book_limit,
@@ -30,10 +36,12 @@ from clippings.seedwork.exceptions import (
     DomainError,
     QuotaExceededError,
 )
+from clippings.utils.streams import as_async_iterable
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable
+    from collections.abc import AsyncIterable, Callable, Iterable
 
+    from clippings.users.entities import User
     from clippings.users.ports import UsersStorageABC
 
 DATA_SCHEMA = {
@@ -151,15 +159,7 @@ def validate_format(data: dict) -> None | InvalidDataError:
 
 
 def book_json_deserializer(data: dict) -> Book:
-    return from_dict(
-        data_class=Book,
-        data=data,
-        config=Config(
-            forward_references={"datetime": datetime},
-            cast=[tuple, Enum],
-            type_hooks={datetime: datetime.fromisoformat},
-        ),
-    )
+    return book_from_dict(data, datetime_hook=datetime.fromisoformat)
 
 
 def deleted_hash_json_deserializer(data: dict) -> DeletedHash:
@@ -173,6 +173,8 @@ class RestoreDataUseCase:
         deleted_hash_storage: DeletedHashStorageABC,
         users_storage: UsersStorageABC,
         enrich_books_meta_service: EnrichBooksMetaService,
+        fingerprint_storage: ImportFingerprintStorageABC,
+        lock: ImportLockABC,
         book_deserializer: Callable[[dict], Book] = book_json_deserializer,
         deleted_hash_deserializer: Callable[
             [dict], DeletedHash
@@ -182,33 +184,42 @@ class RestoreDataUseCase:
         self._deleted_hash_storage = deleted_hash_storage
         self._users_storage = users_storage
         self._enrich_books_meta_service = enrich_books_meta_service
+        self._fingerprint_storage = fingerprint_storage
+        self._lock = lock
         self._book_deserializer = book_deserializer
         self._deleted_hash_deserializer = deleted_hash_deserializer
 
     async def execute(  # noqa: C901
-        self, data: Iterable[bytes], user_id: str
-    ) -> None | InvalidDataError | CantFindEntityError | QuotaExceededError:
+        self, data: Iterable[bytes] | AsyncIterable[bytes], user_id: str
+    ) -> (
+        None
+        | InvalidDataError
+        | CantFindEntityError
+        | QuotaExceededError
+        | ImportInProgressError
+    ):
         user = await self._users_storage.get(user_id)
         if not user:
             raise CantFindEntityError(f"User with id '{user_id}' not found.")
 
-        data_iter = iter(data)
-        next(data_iter)  # version
-
         book_json_data_list: list[dict] = []
         deleted_hashes_to_restore: list[DeletedHash] = []
 
-        for i, item in enumerate(data_iter):
+        line_number = 0
+        async for item in as_async_iterable(data):
+            line_number += 1
+            if line_number == 1:
+                continue  # version
             try:
                 item_str = item.decode("utf-8")
             except UnicodeDecodeError:
-                return InvalidDataError(f"Invalid encoding at line {i + 2}")
+                return InvalidDataError(f"Invalid encoding at line {line_number}")
 
             if item_str := item_str.strip():
                 try:
                     json_data = json.loads(item_str)
                 except json.JSONDecodeError:
-                    return InvalidDataError(f"Invalid JSON at line {i + 2}")
+                    return InvalidDataError(f"Invalid JSON at line {line_number}")
                 if error := validate_format(json_data):
                     return error
 
@@ -221,9 +232,24 @@ class RestoreDataUseCase:
                 else:
                     raise RuntimeError("Unreachable code")
 
+        try:
+            async with self._lock.hold():
+                await self._restore(
+                    user, book_json_data_list, deleted_hashes_to_restore
+                )
+        except ImportInProgressError as e:
+            return e
+        return None
+
+    async def _restore(
+        self,
+        user: User,
+        book_json_data_list: list[dict],
+        deleted_hashes_to_restore: list[DeletedHash],
+    ) -> None:
         if book_json_data_list:
             current_user_book_count = await self._book_storage.count(
-                BooksStorageABC.FindQuery()
+                BooksStorageABC.FindQuery(start=0, limit=None)
             )
             check_book_limit(user, current_user_book_count, len(book_json_data_list))
 
@@ -241,8 +267,12 @@ class RestoreDataUseCase:
 
         if books_to_restore:
             await self._enrich_books_meta_service.execute(books_to_restore)
+            self._lock.check_held()
             await self._book_storage.extend(books_to_restore)
+            # restored books replace the stored ones, clippings imported
+            # after the backup was made must be imported again
+            await self._fingerprint_storage.clear()
 
         if deleted_hashes_to_restore:
+            self._lock.check_held()
             await self._deleted_hash_storage.extend(deleted_hashes_to_restore)
-        return None
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from clippings.cli.controllers import MongoIndexesController
+from clippings.cli.core import AsyncCommand, render_result
+
+if TYPE_CHECKING:
+    import argparse
+
+
+class MongoIndexesCommand(AsyncCommand):
+    """Create MongoDB indexes and report drift and query plans"""
+
+    @classmethod
+    def setup_parser(cls, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Don't create indexes, only report drift (exit code 1 if any)",
+        )
+
+    async def run(self, args: argparse.Namespace) -> None:
+        controller = MongoIndexesController()
+        result = await controller.execute(check_only=args.check)
+        render_result(result)
@@ -5,12 +5,24 @@ from typing import TYPE_CHECKING
 
 from picodi import Provide, inject
 
-from clippings.deps import get_password_hasher, get_users_storage
+from clippings.deps import (
+    MONGO_COLLECTIONS,
+    get_mongo_database,
+    get_password_hasher,
+    get_users_storage,
+)
 from clippings.seedwork.exceptions import DomainError
 from clippings.users.adapters.id_generators import user_id_generator
 from clippings.users.use_cases.create_user import CreateUserUseCase, UserToCreateDTO
+from clippings.utils.mongo import (
+    ensure_indexes,
+    find_indexes_drift,
+    winning_plan_stages,
+)
 
 if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorCursor, AsyncIOMotorDatabase
+
     from clippings.users.ports import PasswordHasherABC, UsersStorageABC
 
 
@@ -55,3 +67,49 @@ class CreateUserController:
         if isinstance(result, DomainError):
             return Result(message=str(result), exit_code=1)
         return Result(message=f"User {nickname} created with id '{result}'")
+
+
+class MongoIndexesController:
+    PROBE_USER_ID = "index-probe-user"
+    BAD_STAGES = frozenset({"COLLSCAN", "SORT"})
+
+    @inject
+    def __init__(self, db: AsyncIOMotorDatabase = Provide(get_mongo_database)):
+        self._db = db
+
+    async def execute(self, check_only: bool = False) -> Result:
+        lines = []
+        if not check_only:
+            created = await ensure_indexes(self._db, MONGO_COLLECTIONS)
+            lines.append(f"Ensured indexes: {', '.join(created) or '-'}")
+
+        problems = await find_indexes_drift(self._db, MONGO_COLLECTIONS)
+        for name, cursor in self._query_probes():
+            stages = winning_plan_stages(await cursor.explain())
+            lines.append(f"{name}: {' <- '.join(stages)}")
+            if bad_stages := self.BAD_STAGES.intersection(
+                stage.partition("(")[0] for stage in stages
+            ):
+                problems.append(f"{name}: plan uses {', '.join(sorted(bad_stages))}")
+
+        lines.extend(f"PROBLEM: {problem}" for problem in problems)
+        return Result(message="\n".join(lines), exit_code=1 if problems else 0)
+
+    def _query_probes(self) -> list[tuple[str, AsyncIOMotorCursor]]:
+        """Queries with the same shape as the hot paths of Mongo storages."""
+        user_id = self.PROBE_USER_ID
+        books = self._db["books"]
+        return [
+            (
+                "books list page",
+                books.find({"user_id": user_id})
+                .sort([("title", 1), ("id", 1)])
+                .limit(10),
+            ),
+            ("book by id", books.find({"id": "book-id", "user_id": user_id})),
+            (
+                "deleted hashes",
+                self._db["deleted_hashes"].find({"user_id": user_id}),
+            ),
+            ("user by nickname", self._db["users"].find({"nickname": "nickname"})),
+        ]
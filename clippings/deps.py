@@ -1,29 +1,42 @@
 from __future__ import annotations
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import TYPE_CHECKING, Any
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from picodi import Provide, Registry, SingletonScope, registry
+from picodi import Provide, Registry, SingletonScope, inject, registry
 
+from clippings.books.adapters.locks import MemoryImportLock, MongoImportLock
 from clippings.books.adapters.storages import (
     MemoryBooksStorage,
     MemoryDeletedHashStorage,
+    MemoryImportFingerprintStorage,
+    MemoryImportJobsStorage,
     MongoBooksStorage,
     MongoDeletedHashStorage,
+    MongoImportFingerprintStorage,
+    MongoImportJobsStorage,
 )
 from clippings.books.use_cases.book_info import GoogleBookInfoClient, MockBookInfoClient
 from clippings.settings import AdaptersSettings, InfrastructureSettings
 from clippings.users.adapters.password_hashers import PBKDF2PasswordHasher
 from clippings.users.adapters.storages import MemoryUsersStorage, MongoUsersStorage
+from clippings.utils.mongo import PoolMetricsListener, ensure_indexes
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator, Callable
+    import asyncio
+    from collections.abc import AsyncGenerator, Callable, Generator
 
-    from clippings.books.entities import Book, DeletedHash
+    from clippings.books.entities import Book, DeletedHash, ImportFingerprint, ImportJob
     from clippings.books.ports import (
         BookInfoClientABC,
+        BookPatchStorageABC,
         BooksStorageABC,
         DeletedHashStorageABC,
+        ImportFingerprintStorageABC,
+        ImportJobsStorageABC,
+        ImportLockABC,
     )
     from clippings.users.entities import User
     from clippings.users.ports import PasswordHasherABC, UsersStorageABC
@@ -56,12 +69,41 @@ def get_user_books_map(
     return books_map.setdefault(user_id, {})
 
 
+@registry.set_scope(scope_class=SingletonScope)
 def get_mongo_client(
     infra_settings: InfrastructureSettings = Provide(get_infrastructure_settings),
-) -> AsyncIOMotorClient:
+) -> Generator[AsyncIOMotorClient, None, None]:
     if not infra_settings.mongo:
         raise ValueError("Mongo settings are not provided")
-    return AsyncIOMotorClient(infra_settings.mongo.uri)
+
+    client: AsyncIOMotorClient = AsyncIOMotorClient(
+        infra_settings.mongo.uri,
+        event_listeners=[PoolMetricsListener()],
+        **infra_settings.mongo.client_options(),
+    )
+    try:
+        yield client
+    finally:
+        client.close()
+
+
+MONGO_COLLECTIONS = (
+    MongoBooksStorage,
+    MongoDeletedHashStorage,
+    MongoUsersStorage,
+    MongoImportJobsStorage,
+    MongoImportLock,
+)
+
+
+@inject
+async def ensure_mongo_indexes_if_enabled(
+    infra_settings: InfrastructureSettings = Provide(get_infrastructure_settings),
+) -> None:
+    if not infra_settings.mongo or not infra_settings.mongo.ensure_indexes:
+        return
+    with registry.resolve(get_mongo_database) as db:
+        await ensure_indexes(db, MONGO_COLLECTIONS)
 
 
 def get_mongo_database_name() -> str:
@@ -89,8 +131,10 @@ def get_memory_books_storage(
 def get_mongo_books_storage(
     db: AsyncIOMotorDatabase = Provide(get_mongo_database),
     user_id: str = Provide(get_user_id),
+    infra_settings: InfrastructureSettings = Provide(get_infrastructure_settings),
 ) -> MongoBooksStorage:
-    return MongoBooksStorage(db, user_id=user_id)
+    use_counter = bool(infra_settings.mongo and infra_settings.mongo.books_counter)
+    return MongoBooksStorage(db, user_id=user_id, use_counter=use_counter)
 
 
 def get_books_storage(
@@ -105,6 +149,18 @@ def get_books_storage(
         return storage
 
 
+def get_book_patch_storage(
+    registry: Registry,
+    infra_settings: InfrastructureSettings = Provide(get_infrastructure_settings),
+) -> BookPatchStorageABC:
+    variants: dict[str, Callable[..., Any]] = {
+        "memory": get_memory_books_storage,
+        "mongo": get_mongo_books_storage,
+    }
+    with registry.resolve(variants[infra_settings.adapters.books_storage]) as storage:
+        return storage
+
+
 @registry.set_scope(scope_class=SingletonScope, auto_init=True)
 async def get_deleted_hashes_map() -> dict[str, dict[str, DeletedHash]]:
     return {}
@@ -146,6 +202,103 @@ def get_deleted_hash_storage(
         return storage
 
 
+@registry.set_scope(scope_class=SingletonScope, auto_init=True)
+async def get_import_fingerprints_map() -> dict[str, ImportFingerprint]:
+    return {}
+
+
+def get_memory_import_fingerprint_storage(
+    fingerprints_map: dict[str, ImportFingerprint] = Provide(
+        get_import_fingerprints_map
+    ),
+    user_id: str = Provide(get_user_id),
+) -> MemoryImportFingerprintStorage:
+    return MemoryImportFingerprintStorage(fingerprints_map, user_id=user_id)
+
+
+def get_mongo_import_fingerprint_storage(
+    db: AsyncIOMotorDatabase = Provide(get_mongo_database),
+    user_id: str = Provide(get_user_id),
+) -> MongoImportFingerprintStorage:
+    return MongoImportFingerprintStorage(db, user_id)
+
+
+def get_import_fingerprint_storage(
+    registry: Registry,
+    infra_settings: InfrastructureSettings = Provide(get_infrastructure_settings),
+) -> ImportFingerprintStorageABC:
+    variants: dict[str, Callable[..., Any]] = {
+        "memory": get_memory_import_fingerprint_storage,
+        "mongo": get_mongo_import_fingerprint_storage,
+    }
+    with registry.resolve(
+        variants[infra_settings.adapters.import_fingerprint_storage]
+    ) as storage:
+        return storage
+
+
+@registry.set_scope(scope_class=SingletonScope, auto_init=True)
+async def get_import_locks_map() -> dict[str, asyncio.Lock]:
+    return {}
+
+
+def get_memory_import_lock(
+    locks_map: dict[str, asyncio.Lock] = Provide(get_import_locks_map),
+    user_id: str = Provide(get_user_id),
+) -> MemoryImportLock:
+    return MemoryImportLock(locks_map, user_id)
+
+
+def get_mongo_import_lock(
+    db: AsyncIOMotorDatabase = Provide(get_mongo_database),
+    user_id: str = Provide(get_user_id),
+) -> MongoImportLock:
+    return MongoImportLock(db, user_id)
+
+
+def get_import_lock(
+    registry: Registry,
+    infra_settings: InfrastructureSettings = Provide(get_infrastructure_settings),
+) -> ImportLockABC:
+    variants: dict[str, Callable[..., Any]] = {
+        "memory": get_memory_import_lock,
+        "mongo": get_mongo_import_lock,
+    }
+    with registry.resolve(variants[infra_settings.adapters.import_lock]) as lock:
+        return lock
+
+
+@registry.set_scope(scope_class=SingletonScope, auto_init=True)
+async def get_import_jobs_map() -> dict[str, ImportJob]:
+    return {}
+
+
+def get_memory_import_jobs_storage(
+    jobs_map: dict[str, ImportJob] = Provide(get_import_jobs_map),
+) -> MemoryImportJobsStorage:
+    return MemoryImportJobsStorage(jobs_map)
+
+
+def get_mongo_import_jobs_storage(
+    db: AsyncIOMotorDatabase = Provide(get_mongo_database),
+) -> MongoImportJobsStorage:
+    return MongoImportJobsStorage(db)
+
+
+def get_import_jobs_storage(
+    registry: Registry,
+    infra_settings: InfrastructureSettings = Provide(get_infrastructure_settings),
+) -> ImportJobsStorageABC:
+    variants: dict[str, Callable[..., Any]] = {
+        "memory": get_memory_import_jobs_storage,
+        "mongo": get_mongo_import_jobs_storage,
+    }
+    with registry.resolve(
+        variants[infra_settings.adapters.import_jobs_storage]
+    ) as storage:
+        return storage
+
+
 def get_memory_users_storage(
     users_map: dict = Provide(get_users_map),
 ) -> MemoryUsersStorage:
@@ -170,6 +323,25 @@ def get_users_storage(
         return storage
 
 
+@registry.set_scope(scope_class=SingletonScope, auto_init=True)
+def get_parse_process_pool(
+    infra_settings: InfrastructureSettings = Provide(get_infrastructure_settings),
+) -> Generator[ProcessPoolExecutor | None, None, None]:
+    if not infra_settings.adapters.parse_workers:
+        yield None
+        return
+    # "spawn" because files are parsed in threads and forking
+    # a multithreaded process is unsafe
+    pool = ProcessPoolExecutor(
+        max_workers=infra_settings.adapters.parse_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    try:
+        yield pool
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
 def get_password_hasher() -> PasswordHasherABC:
     return PBKDF2PasswordHasher()
 
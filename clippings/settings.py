@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 from dynaconf import Dynaconf
 
@@ -20,13 +20,44 @@ settings = Dynaconf(
 @dataclass
 class MongoSettings:
     uri: str
+    max_pool_size: int = 100
+    min_pool_size: int = 0
+    max_idle_time_ms: int | None = None
+    wait_queue_timeout_ms: int | None = None
+    ensure_indexes: bool = False
+    books_counter: bool = False
 
     @classmethod
     def create_from_config(cls) -> MongoSettings | None:
         try:
-            return cls(uri=settings.mongo.uri)
+            mongo_conf = settings.mongo
+            uri = mongo_conf.uri
         except AttributeError:
             return None
+        optional_fields = (
+            "max_pool_size",
+            "min_pool_size",
+            "max_idle_time_ms",
+            "wait_queue_timeout_ms",
+            "ensure_indexes",
+            "books_counter",
+        )
+        params = {}
+        for name in optional_fields:
+            if (value := mongo_conf.get(name)) is not None:
+                params[name] = value
+        return cls(uri=uri, **params)
+
+    def client_options(self) -> dict[str, Any]:
+        options: dict[str, Any] = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+        }
+        if self.max_idle_time_ms is not None:
+            options["maxIdleTimeMS"] = self.max_idle_time_ms
+        if self.wait_queue_timeout_ms is not None:
+            options["waitQueueTimeoutMS"] = self.wait_queue_timeout_ms
+        return options
 
 
 @dataclass
@@ -34,7 +65,12 @@ class AdaptersSettings:
     books_storage: Literal["mongo", "memory", "notset"]
     users_storage: Literal["mongo", "memory", "notset"]
     deleted_hash_storage: Literal["mongo", "memory", "notset"]
+    import_jobs_storage: Literal["mongo", "memory", "notset"]
+    import_fingerprint_storage: Literal["mongo", "memory", "notset"]
+    import_lock: Literal["mongo", "memory", "notset"]
     book_info_client: Literal["mock", "google", "notset"]
+    # processes parsing big imported files, 0 to parse them sequentially
+    parse_workers: int = 0
 
     @classmethod
     def create_from_config(cls) -> AdaptersSettings:
@@ -43,7 +79,13 @@ class AdaptersSettings:
             books_storage=adapters_conf.get("books_storage") or "notset",
             users_storage=adapters_conf.get("users_storage") or "notset",
             deleted_hash_storage=adapters_conf.get("deleted_hash_storage") or "notset",
+            import_jobs_storage=adapters_conf.get("import_jobs_storage") or "notset",
+            import_fingerprint_storage=(
+                adapters_conf.get("import_fingerprint_storage") or "notset"
+            ),
+            import_lock=adapters_conf.get("import_lock") or "notset",
             book_info_client=adapters_conf.get("book_info_client") or "notset",
+            parse_workers=adapters_conf.get("parse_workers") or 0,
         )
 
     def has_value(self, value: str) -> bool:
@@ -58,6 +100,9 @@ class AdaptersSettings:
             books_storage="mongo",
             users_storage="mongo",
             deleted_hash_storage="mongo",
+            import_jobs_storage="mongo",
+            import_fingerprint_storage="mongo",
+            import_lock="mongo",
             book_info_client="google",
         )
 
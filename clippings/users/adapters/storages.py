@@ -4,6 +4,7 @@ from dataclasses import asdict
 from typing import TYPE_CHECKING, Any
 
 from dacite import from_dict
+from pymongo import ASCENDING, IndexModel
 
 from clippings.users.entities import User
 from clippings.users.ports import UsersStorageABC
@@ -47,13 +48,18 @@ def mongo_user_deserializer(user: dict) -> User:
 
 
 class MongoUsersStorage(UsersStorageABC):
+    COLLECTION_NAME = "users"
+    INDEXES = [
+        IndexModel([("nickname", ASCENDING)], name="nickname_unique", unique=True)
+    ]
+
     def __init__(
         self,
         db: AsyncIOMotorDatabase,
         serializer: Callable[[User], dict[str, Any]] = mongo_user_serializer,
         deserializer: Callable[[dict], User] = mongo_user_deserializer,
     ) -> None:
-        self._collection = db["users"]
+        self._collection = db[self.COLLECTION_NAME]
         self._serializer = serializer
         self._deserializer = deserializer
 
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import math
+
+import mmh3
+
+
+class BloomFilter:
+    """
+    Probabilistic set: `in` can return false positives, but never
+    false negatives.
+    """
+
+    def __init__(self, size: int, hash_count: int, bits: bytes | None = None) -> None:
+        if size <= 0 or hash_count <= 0:
+            raise ValueError("Size and hash count must be positive")
+        self.size = size
+        self.hash_count = hash_count
+        bits_len = (size + 7) // 8
+        if bits is not None and len(bits) != bits_len:
+            raise ValueError(f"Expected {bits_len} bytes of bits, got {len(bits)}")
+        self.bits = bytearray(bits_len) if bits is None else bytearray(bits)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.01) -> BloomFilter:
+        capacity = max(capacity, 1)
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        hash_count = max(1, round(size / capacity * math.log(2)))
+        return cls(size=size, hash_count=hash_count)
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def _positions(self, item: str) -> list[int]:
+        # Kirsch-Mitzenmacher: k hashes from two halves of a single 128-bit hash
+        h1, h2 = mmh3.hash64(item, signed=False)
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
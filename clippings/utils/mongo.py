@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Protocol
+
+from prometheus_client import Counter, Gauge
+from pymongo.monitoring import ConnectionPoolListener
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from motor.motor_asyncio import AsyncIOMotorDatabase
+    from pymongo import IndexModel
+    from pymongo.monitoring import (
+        ConnectionCheckedInEvent,
+        ConnectionCheckedOutEvent,
+        ConnectionCheckOutFailedEvent,
+        ConnectionCheckOutStartedEvent,
+        ConnectionClosedEvent,
+        ConnectionCreatedEvent,
+        ConnectionReadyEvent,
+        PoolClearedEvent,
+        PoolClosedEvent,
+        PoolCreatedEvent,
+        PoolReadyEvent,
+    )
+
+
+POOL_MAX_SIZE = Gauge(
+    "mongo_pool_max_size",
+    "Max size of the MongoDB connection pool",
+    ["address"],
+)
+POOL_CONNECTIONS = Gauge(
+    "mongo_pool_connections",
+    "Open connections in the MongoDB connection pool",
+    ["address"],
+)
+POOL_CHECKED_OUT_CONNECTIONS = Gauge(
+    "mongo_pool_checked_out_connections",
+    "Connections currently checked out from the MongoDB connection pool",
+    ["address"],
+)
+POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures",
+    "Failed attempts to check out a connection from the MongoDB connection pool",
+    ["address", "reason"],
+)
+POOL_CLEARED = Counter(
+    "mongo_pool_cleared",
+    "How many times the MongoDB connection pool was cleared",
+    ["address"],
+)
+
+
+def _address_label(address: tuple[str, int | None]) -> str:
+    host, port = address
+    return host if port is None else f"{host}:{port}"
+
+
+class PoolMetricsListener(ConnectionPoolListener):
+    """Expose connection pool stats of the Mongo client as Prometheus metrics."""
+
+    def pool_created(self, event: PoolCreatedEvent) -> None:
+        if max_pool_size := event.options.get("maxPoolSize"):
+            POOL_MAX_SIZE.labels(_address_label(event.address)).set(max_pool_size)
+
+    def pool_ready(self, event: PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: PoolClearedEvent) -> None:
+        POOL_CLEARED.labels(_address_label(event.address)).inc()
+
+    def pool_closed(self, event: PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: ConnectionCreatedEvent) -> None:
+        POOL_CONNECTIONS.labels(_address_label(event.address)).inc()
+
+    def connection_ready(self, event: ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: ConnectionClosedEvent) -> None:
+        POOL_CONNECTIONS.labels(_address_label(event.address)).dec()
+
+    def connection_check_out_started(
+        self, event: ConnectionCheckOutStartedEvent
+    ) -> None:
+        pass
+
+    def connection_check_out_failed(self, event: ConnectionCheckOutFailedEvent) -> None:
+        POOL_CHECKOUT_FAILURES.labels(_address_label(event.address), event.reason).inc()
+
+    def connection_checked_out(self, event: ConnectionCheckedOutEvent) -> None:
+        POOL_CHECKED_OUT_CONNECTIONS.labels(_address_label(event.address)).inc()
+
+    def connection_checked_in(self, event: ConnectionCheckedInEvent) -> None:
+        POOL_CHECKED_OUT_CONNECTIONS.labels(_address_label(event.address)).dec()
+
+
+INDEX_OPTIONS_TO_VERIFY = ("unique", "sparse", "expireAfterSeconds")
+
+
+class MongoCollectionSpec(Protocol):
+    COLLECTION_NAME: str
+    INDEXES: list[IndexModel]
+
+
+async def ensure_indexes(
+    db: AsyncIOMotorDatabase, specs: Iterable[MongoCollectionSpec]
+) -> list[str]:
+    """
+    Create declared indexes. `createIndexes` is a no-op for indexes
+    that already exist with the same spec, so it is safe to call on every startup.
+    """
+    created = []
+    for spec in specs:
+        if spec.INDEXES:
+            created += await db[spec.COLLECTION_NAME].create_indexes(spec.INDEXES)
+    return created
+
+
+async def find_indexes_drift(
+    db: AsyncIOMotorDatabase, specs: Iterable[MongoCollectionSpec]
+) -> list[str]:
+    """Compare declared indexes with the ones that exist in the database."""
+    problems = []
+    for spec in specs:
+        collection = db[spec.COLLECTION_NAME]
+        existing = await collection.index_information()
+        existing_by_key = {
+            _normalize_index_key(info["key"]): (name, info)
+            for name, info in existing.items()
+        }
+        for index in spec.INDEXES:
+            expected = index.document
+            key = _normalize_index_key(expected["key"].items())
+            if key not in existing_by_key:
+                problems.append(
+                    f"{collection.name}: index {expected['name']} is missing"
+                )
+                continue
+            name, info = existing_by_key[key]
+            for option in INDEX_OPTIONS_TO_VERIFY:
+                if info.get(option) != expected.get(option):
+                    problems.append(
+                        f"{collection.name}: index {name} has {option}="
+                        f"{info.get(option)!r}, expected {expected.get(option)!r}"
+                    )
+    return problems
+
+
+def _normalize_index_key(key: Any) -> tuple[tuple[str, Any], ...]:
+    return tuple(
+        (field, int(direction) if isinstance(direction, float) else direction)
+        for field, direction in key
+    )
+
+
+def winning_plan_stages(explain_result: Mapping[str, Any]) -> list[str]:
+    """
+    Flatten the winning plan of an ``explain()`` result into a list of stages,
+    starting from the root. Index scans are reported with the index name,
+    e.g. ``["FETCH", "IXSCAN(user_id_title_id)"]``.
+    """
+    stages = []
+    plan: Mapping[str, Any] | None = explain_result["queryPlanner"]["winningPlan"]
+    while plan:
+        # slot based execution engine wraps classic plan into `queryPlan`
+        plan = plan.get("queryPlan", plan)
+        stage = plan["stage"]
+        if index_name := plan.get("indexName"):
+            stage = f"{stage}({index_name})"
+        stages.append(stage)
+        if input_stages := plan.get("inputStages"):
+            plan = input_stages[0]
+        else:
+            plan = plan.get("inputStage")
+    return stages
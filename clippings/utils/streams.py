@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterable
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Iterable
+
+T = TypeVar("T")
+
+
+async def aiter_lines(chunks: AsyncIterable[bytes]) -> AsyncGenerator[bytes, None]:
+    """
+    Split a stream of byte chunks into lines. Like iteration over a binary
+    file, lines keep their line breaks and the last one may not have it.
+    """
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            yield bytes(buffer[start : end + 1])
+            start = end + 1
+        del buffer[:start]
+    if buffer:
+        yield bytes(buffer)
+
+
+async def as_async_iterable(
+    items: Iterable[T] | AsyncIterable[T],
+) -> AsyncGenerator[T, None]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
@@ -23,8 +23,10 @@ from clippings.books.use_cases.edit_book import (
 )
 from clippings.deps import (
     get_book_info_client,
+    get_book_patch_storage,
     get_books_storage,
     get_deleted_hash_storage,
+    get_import_fingerprint_storage,
 )
 from clippings.seedwork.exceptions import DomainError
 from clippings.web.controllers.responses import HTMLResponse, RedirectResponse, Response
@@ -40,8 +42,10 @@ from clippings.web.presenters.urls import urls_manager
 if TYPE_CHECKING:
     from clippings.books.ports import (
         BookInfoClientABC,
+        BookPatchStorageABC,
         BooksStorageABC,
         DeletedHashStorageABC,
+        ImportFingerprintStorageABC,
     )
 
 
@@ -185,12 +189,18 @@ class UpdateBookInfoController:
 class UpdateClippingController:
     @inject
     def __init__(
-        self, books_storage: BooksStorageABC = Provide(get_books_storage)
+        self,
+        books_storage: BooksStorageABC = Provide(get_books_storage),
+        book_patch_storage: BookPatchStorageABC = Provide(get_book_patch_storage),
     ) -> None:
         self._books_storage = books_storage
+        self._book_patch_storage = book_patch_storage
 
     async def fire(self, book_id: str, clipping_id: str, content: str) -> Response:
-        use_case = EditClippingUseCase(book_storage=self._books_storage)
+        use_case = EditClippingUseCase(
+            book_storage=self._books_storage,
+            book_patch_storage=self._book_patch_storage,
+        )
         result = await use_case.execute(
             ClippingFieldsDTO(
                 id=clipping_id,
@@ -210,13 +220,17 @@ class UpdateClippingController:
 class AddInlineNoteController:
     @inject
     def __init__(
-        self, books_storage: BooksStorageABC = Provide(get_books_storage)
+        self,
+        books_storage: BooksStorageABC = Provide(get_books_storage),
+        book_patch_storage: BookPatchStorageABC = Provide(get_book_patch_storage),
     ) -> None:
         self._books_storage = books_storage
+        self._book_patch_storage = book_patch_storage
 
     async def fire(self, book_id: str, clipping_id: str, content: str) -> Response:
         use_case = AddInlineNoteUseCase(
             book_storage=self._books_storage,
+            book_patch_storage=self._book_patch_storage,
             inline_note_id_generator=inline_note_id_generator,
         )
         result = await use_case.execute(
@@ -234,14 +248,20 @@ class AddInlineNoteController:
 class EditInlineNoteController:
     @inject
     def __init__(
-        self, books_storage: BooksStorageABC = Provide(get_books_storage)
+        self,
+        books_storage: BooksStorageABC = Provide(get_books_storage),
+        book_patch_storage: BookPatchStorageABC = Provide(get_book_patch_storage),
     ) -> None:
         self._books_storage = books_storage
+        self._book_patch_storage = book_patch_storage
 
     async def fire(
         self, book_id: str, clipping_id: str, inline_note_id: str, content: str
     ) -> Response:
-        use_case = EditInlineNoteUseCase(book_storage=self._books_storage)
+        use_case = EditInlineNoteUseCase(
+            book_storage=self._books_storage,
+            book_patch_storage=self._book_patch_storage,
+        )
         result = await use_case.execute(
             book_id=book_id,
             clipping_id=clipping_id,
@@ -263,14 +283,20 @@ class EditInlineNoteController:
 class UnlinkInlineNoteController:
     @inject
     def __init__(
-        self, books_storage: BooksStorageABC = Provide(get_books_storage)
+        self,
+        books_storage: BooksStorageABC = Provide(get_books_storage),
+        book_patch_storage: BookPatchStorageABC = Provide(get_book_patch_storage),
     ) -> None:
         self._books_storage = books_storage
+        self._book_patch_storage = book_patch_storage
 
     async def fire(
         self, book_id: str, clipping_id: str, inline_note_id: str
     ) -> Response:
-        use_case = UnlinkInlineNoteUseCase(book_storage=self._books_storage)
+        use_case = UnlinkInlineNoteUseCase(
+            book_storage=self._books_storage,
+            book_patch_storage=self._book_patch_storage,
+        )
         result = await use_case.execute(
             book_id=book_id,
             clipping_id=clipping_id,
@@ -314,14 +340,17 @@ class DeleteClippingController:
     def __init__(
         self,
         books_storage: BooksStorageABC = Provide(get_books_storage),
+        book_patch_storage: BookPatchStorageABC = Provide(get_book_patch_storage),
         deleted_hash_storage: DeletedHashStorageABC = Provide(get_deleted_hash_storage),
     ) -> None:
         self._books_storage = books_storage
+        self._book_patch_storage = book_patch_storage
         self._deleted_hash_storage = deleted_hash_storage
 
     async def fire(self, book_id: str, clipping_id: str) -> HTMLResponse:
         use_case = DeleteClippingUseCase(
             book_storage=self._books_storage,
+            book_patch_storage=self._book_patch_storage,
             deleted_hash_storage=self._deleted_hash_storage,
         )
         result = await use_case.execute(book_id, clipping_id)
@@ -335,9 +364,11 @@ class DeleteInlineNoteController:
     def __init__(
         self,
         books_storage: BooksStorageABC = Provide(get_books_storage),
+        book_patch_storage: BookPatchStorageABC = Provide(get_book_patch_storage),
         deleted_hash_storage: DeletedHashStorageABC = Provide(get_deleted_hash_storage),
     ) -> None:
         self._books_storage = books_storage
+        self._book_patch_storage = book_patch_storage
         self._deleted_hash_storage = deleted_hash_storage
 
     async def fire(
@@ -345,6 +376,7 @@ class DeleteInlineNoteController:
     ) -> Response:
         use_case = DeleteInlineNoteUseCase(
             book_storage=self._books_storage,
+            book_patch_storage=self._book_patch_storage,
             deleted_hash_storage=self._deleted_hash_storage,
         )
         result = await use_case.execute(
@@ -369,12 +401,17 @@ class ClearDeletedHashesController:
     def __init__(
         self,
         deleted_hash_storage: DeletedHashStorageABC = Provide(get_deleted_hash_storage),
+        fingerprint_storage: ImportFingerprintStorageABC = Provide(
+            get_import_fingerprint_storage
+        ),
     ) -> None:
         self._deleted_hash_storage = deleted_hash_storage
+        self._fingerprint_storage = fingerprint_storage
 
     async def fire(self) -> Response:
         use_case = ClearDeletedHashesUseCase(
-            deleted_hash_storage=self._deleted_hash_storage
+            deleted_hash_storage=self._deleted_hash_storage,
+            fingerprint_storage=self._fingerprint_storage,
         )
         await use_case.execute()
         return HTMLResponse(payload="Ok", status_code=200)
@@ -7,7 +7,7 @@ from picodi import Provide, inject
 from clippings.deps import get_books_storage
 from clippings.web.controllers.responses import HTMLResponse
 from clippings.web.presenters.book.list_page import BooksListPagePresenter
-from clippings.web.presenters.pagination import classic_pagination_calculator
+from clippings.web.presenters.pagination import cursor_pagination_calculator
 from clippings.web.presenters.urls import urls_manager
 
 if TYPE_CHECKING:
@@ -22,11 +22,13 @@ class RenderBookListController:
     ) -> None:
         self._books_storage = books_storage
 
-    async def fire(self, page: int, on_page: int) -> HTMLResponse:
+    async def fire(
+        self, page: int, on_page: int, after: str | None = None
+    ) -> HTMLResponse:
         presenter = BooksListPagePresenter(
             storage=self._books_storage,
-            pagination_calculator=classic_pagination_calculator,
+            pagination_calculator=cursor_pagination_calculator,
             urls_manager=urls_manager,
         )
-        result = await presenter.present(page=page, on_page=on_page)
+        result = await presenter.present(page=page, on_page=on_page, after=after)
         return HTMLResponse.from_presenter_result(result)
@@ -1,35 +1,55 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, BinaryIO
+import asyncio
+import tempfile
+from datetime import datetime
+from typing import TYPE_CHECKING
 
 from picodi import Provide, inject
 
 from clippings.books.adapters.id_generators import (
     book_id_generator,
     clipping_id_generator,
+    import_job_id_generator,
     inline_note_id_generator,
 )
 from clippings.books.adapters.readers import KindleClippingsReader
-from clippings.books.services import EnrichBooksMetaService
+from clippings.books.entities import ImportJob, ImportJobStatus
+from clippings.books.services import EnrichBooksMetaService, ImportJobsRunner
 from clippings.books.use_cases.import_clippings import ImportClippingsUseCase
 from clippings.deps import (
     get_book_info_client,
     get_books_storage,
     get_deleted_hash_storage,
+    get_import_fingerprint_storage,
+    get_import_jobs_storage,
+    get_import_lock,
+    get_parse_process_pool,
     get_users_storage,
 )
+from clippings.seedwork.exceptions import DomainError
 from clippings.web.controllers.responses import HTMLResponse
+from clippings.web.deps import get_import_jobs_runner
 from clippings.web.presenters.book.clippings_import_page import (
     ClippingsImportPagePresenter,
-    ImportClippingsResultPresenter,
+    ImportClippingsPreviewPresenter,
+    ImportJobPresenter,
 )
 from clippings.web.presenters.urls import urls_manager
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterable
+    from concurrent.futures import Executor
+
+    from clippings.books.dtos import ImportedBookDTO
     from clippings.books.ports import (
         BookInfoClientABC,
         BooksStorageABC,
         DeletedHashStorageABC,
+        ImportFingerprintStorageABC,
+        ImportJobsStorageABC,
+        ImportLockABC,
+        ImportProgressListener,
     )
     from clippings.users.ports import UsersStorageABC
 
@@ -42,6 +62,11 @@ class RenderClippingsImportPageController:
 
 
 class ClippingsImportController:
+    """
+    Receives the file and runs the import in the background.
+    Responds with the job progress, which is polled until the job is finished.
+    """
+
     @inject
     def __init__(
         self,
@@ -49,27 +74,145 @@ class ClippingsImportController:
         deleted_hash_storage: DeletedHashStorageABC = Provide(get_deleted_hash_storage),
         book_info_client: BookInfoClientABC = Provide(get_book_info_client),
         users_storage: UsersStorageABC = Provide(get_users_storage),
+        import_jobs_storage: ImportJobsStorageABC = Provide(get_import_jobs_storage),
+        import_jobs_runner: ImportJobsRunner = Provide(get_import_jobs_runner),
+        fingerprint_storage: ImportFingerprintStorageABC = Provide(
+            get_import_fingerprint_storage
+        ),
+        import_lock: ImportLockABC = Provide(get_import_lock),
+        parse_process_pool: Executor | None = Provide(get_parse_process_pool),
     ) -> None:
         self._books_storage = books_storage
         self._deleted_hash_storage = deleted_hash_storage
         self._book_info_client = book_info_client
         self._users_storage = users_storage
+        self._import_jobs_storage = import_jobs_storage
+        self._import_jobs_runner = import_jobs_runner
+        self._fingerprint_storage = fingerprint_storage
+        self._import_lock = import_lock
+        self._parse_process_pool = parse_process_pool
+
+    async def fire(self, file: AsyncIterable[bytes], user_id: str) -> HTMLResponse:
+        # the request body can't be read after the response is sent
+        loop = asyncio.get_running_loop()
+        received = tempfile.TemporaryFile()  # noqa: SIM115
+        try:
+            async for chunk in file:
+                await loop.run_in_executor(None, received.write, chunk)
+        except BaseException:
+            received.close()
+            raise
 
-    async def fire(self, file: BinaryIO, user_id: str) -> HTMLResponse:
-        clippings_reader = KindleClippingsReader(file)
-        enrich_books_meta_service = EnrichBooksMetaService(self._book_info_client)
-        import_use_case = ImportClippingsUseCase(
-            storage=self._books_storage,
-            reader=clippings_reader,
-            deleted_hash_storage=self._deleted_hash_storage,
-            enrich_books_meta_service=enrich_books_meta_service,
-            book_id_generator=book_id_generator,
-            clipping_id_generator=clipping_id_generator,
-            inline_note_id_generator=inline_note_id_generator,
-            users_storage=self._users_storage,
+        async def run(
+            progress_listener: ImportProgressListener,
+        ) -> list[ImportedBookDTO]:
+            import_use_case = ImportClippingsUseCase(
+                storage=self._books_storage,
+                reader=KindleClippingsReader(
+                    received, process_pool=self._parse_process_pool
+                ),
+                deleted_hash_storage=self._deleted_hash_storage,
+                enrich_books_meta_service=EnrichBooksMetaService(
+                    self._book_info_client
+                ),
+                book_id_generator=book_id_generator,
+                clipping_id_generator=clipping_id_generator,
+                inline_note_id_generator=inline_note_id_generator,
+                users_storage=self._users_storage,
+                fingerprint_storage=self._fingerprint_storage,
+                lock=self._import_lock,
+                progress_listener=progress_listener,
+            )
+            return await import_use_case.execute(user_id)
+
+        now = datetime.now()
+        job = ImportJob(
+            id=import_job_id_generator(),
+            user_id=user_id,
+            status=ImportJobStatus.QUEUED,
+            created_at=now,
+            updated_at=now,
         )
-        statistics = await import_use_case.execute(user_id)
+        # the runner closes the file when the job is finished or won't be run
+        if error := await self._import_jobs_runner.submit(job, run, resource=received):
+            return HTMLResponse(payload=str(error))
+
+        presenter = ImportJobPresenter(
+            storage=self._import_jobs_storage, urls_manager=urls_manager
+        )
+        result = await presenter.present(job.id, user_id=user_id)
+        return HTMLResponse.from_presenter_result(result)
+
+
+class ClippingsImportPreviewController:
+    """
+    Shows what import of the file would do without writing anything.
+    """
 
-        presenter = ImportClippingsResultPresenter()
-        result = await presenter.present(statistics)
+    @inject
+    def __init__(
+        self,
+        books_storage: BooksStorageABC = Provide(get_books_storage),
+        deleted_hash_storage: DeletedHashStorageABC = Provide(get_deleted_hash_storage),
+        book_info_client: BookInfoClientABC = Provide(get_book_info_client),
+        users_storage: UsersStorageABC = Provide(get_users_storage),
+        fingerprint_storage: ImportFingerprintStorageABC = Provide(
+            get_import_fingerprint_storage
+        ),
+        import_lock: ImportLockABC = Provide(get_import_lock),
+        parse_process_pool: Executor | None = Provide(get_parse_process_pool),
+    ) -> None:
+        self._books_storage = books_storage
+        self._deleted_hash_storage = deleted_hash_storage
+        self._book_info_client = book_info_client
+        self._users_storage = users_storage
+        self._fingerprint_storage = fingerprint_storage
+        self._import_lock = import_lock
+        self._parse_process_pool = parse_process_pool
+
+    async def fire(self, file: AsyncIterable[bytes], user_id: str) -> HTMLResponse:
+        loop = asyncio.get_running_loop()
+        with tempfile.TemporaryFile() as received:
+            async for chunk in file:
+                await loop.run_in_executor(None, received.write, chunk)
+
+            import_use_case = ImportClippingsUseCase(
+                storage=self._books_storage,
+                reader=KindleClippingsReader(
+                    received, process_pool=self._parse_process_pool
+                ),
+                deleted_hash_storage=self._deleted_hash_storage,
+                enrich_books_meta_service=EnrichBooksMetaService(
+                    self._book_info_client
+                ),
+                book_id_generator=book_id_generator,
+                clipping_id_generator=clipping_id_generator,
+                inline_note_id_generator=inline_note_id_generator,
+                users_storage=self._users_storage,
+                fingerprint_storage=self._fingerprint_storage,
+                lock=self._import_lock,
+            )
+            try:
+                previews = await import_use_case.preview(user_id)
+            except DomainError as e:
+                return HTMLResponse(payload=str(e))
+
+        presenter = ImportClippingsPreviewPresenter()
+        result = await presenter.present(previews)
+        return HTMLResponse.from_presenter_result(result)
+
+
+class RenderImportJobController:
+    @inject
+    def __init__(
+        self,
+        import_jobs_storage: ImportJobsStorageABC = Provide(get_import_jobs_storage),
+    ) -> None:
+        self._import_jobs_storage = import_jobs_storage
+
+    async def fire(self, job_id: str, user_id: str) -> HTMLResponse:
+        presenter = ImportJobPresenter(
+            storage=self._import_jobs_storage, urls_manager=urls_manager
+        )
+        result = await presenter.present(job_id, user_id=user_id)
         return HTMLResponse.from_presenter_result(result)
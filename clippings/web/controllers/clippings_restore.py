@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, BinaryIO
+from typing import TYPE_CHECKING
 
+from multipart.exceptions import MultipartParseError
 from picodi import Provide, inject
 
 from clippings.books.services import EnrichBooksMetaService
@@ -10,16 +11,23 @@ from clippings.deps import (
     get_book_info_client,
     get_books_storage,
     get_deleted_hash_storage,
+    get_import_fingerprint_storage,
+    get_import_lock,
     get_users_storage,
 )
 from clippings.seedwork.exceptions import DomainError
+from clippings.utils.streams import aiter_lines
 from clippings.web.controllers.responses import HTMLResponse, Response
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterable
+
     from clippings.books.ports import (
         BookInfoClientABC,
         BooksStorageABC,
         DeletedHashStorageABC,
+        ImportFingerprintStorageABC,
+        ImportLockABC,
     )
     from clippings.users.ports import UsersStorageABC
 
@@ -32,22 +40,33 @@ class ClippingsRestoreController:
         deleted_hash_storage: DeletedHashStorageABC = Provide(get_deleted_hash_storage),
         book_info_client: BookInfoClientABC = Provide(get_book_info_client),
         users_storage: UsersStorageABC = Provide(get_users_storage),
+        fingerprint_storage: ImportFingerprintStorageABC = Provide(
+            get_import_fingerprint_storage
+        ),
+        import_lock: ImportLockABC = Provide(get_import_lock),
     ) -> None:
         self._books_storage = books_storage
         self._deleted_hash_storage = deleted_hash_storage
         self._book_info_client = book_info_client
         self._users_storage = users_storage
+        self._fingerprint_storage = fingerprint_storage
+        self._import_lock = import_lock
 
-    async def fire(self, backup: BinaryIO, user_id: str) -> Response:
+    async def fire(self, backup: AsyncIterable[bytes], user_id: str) -> Response:
         enrich_books_meta_service = EnrichBooksMetaService(self._book_info_client)
         use_case = RestoreDataUseCase(
             book_storage=self._books_storage,
             deleted_hash_storage=self._deleted_hash_storage,
             enrich_books_meta_service=enrich_books_meta_service,
             users_storage=self._users_storage,
+            fingerprint_storage=self._fingerprint_storage,
+            lock=self._import_lock,
         )
         try:
-            result = await use_case.execute(backup, user_id=user_id)
+            result = await use_case.execute(aiter_lines(backup), user_id=user_id)
+        except MultipartParseError:
+            # broken request body, not a restore failure
+            raise
         except Exception:  # noqa: PIE786
             return HTMLResponse(payload="Something went wrong while restoring data")
         if isinstance(result, DomainError):
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from picodi import Provide, registry
+from picodi import Provide, SingletonScope, registry
 from picodi.integrations.starlette import RequestScope
 
+from clippings.books.services import ImportJobsRunner
 from clippings.deps import (
     get_default_adapters,
+    get_import_jobs_storage,
     get_password_hasher,
     get_user_id,
     get_users_storage,
@@ -15,7 +17,9 @@ from clippings.settings import AdaptersSettings
 from clippings.users.use_cases.auth import AuthenticateUserUseCase
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
 
+    from clippings.books.ports import ImportJobsStorageABC
     from clippings.users.ports import PasswordHasherABC, UsersStorageABC
 
 
@@ -43,5 +47,17 @@ def get_auth_use_case(
     )
 
 
+@registry.set_scope(scope_class=SingletonScope, auto_init=True)
+async def get_import_jobs_runner(
+    storage: ImportJobsStorageABC = Provide(get_import_jobs_storage),
+) -> AsyncGenerator[ImportJobsRunner, None]:
+    runner = ImportJobsRunner(storage)
+    runner.start()
+    try:
+        yield runner
+    finally:
+        await runner.stop()
+
+
 registry.override(get_user_id, get_user_id_from_request)
 registry.override(get_default_adapters, get_default_adapters_for_web)
@@ -13,7 +13,7 @@ from starlette.routing import Mount, Route
 from starlette.staticfiles import StaticFiles
 from starlette_exporter import PrometheusMiddleware, handle_metrics
 
-from clippings.deps import get_infrastructure_settings
+from clippings.deps import ensure_mongo_indexes_if_enabled, get_infrastructure_settings
 from clippings.web.auth import BasicAuthBackend
 from clippings.web.middleware import ClosingSlashMiddleware
 from clippings.web.presenters.urls import urls_manager
@@ -26,6 +26,7 @@ CURRENT_DIR = Path(__file__).parent
 @contextlib.asynccontextmanager
 async def lifespan(app: Starlette) -> AsyncGenerator[None, None]:  # noqa: U100
     async with registry.alifespan():
+        await ensure_mongo_indexes_if_enabled()
         yield
 
 
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from clippings.web.presenters.dtos import ActionDTO, PresenterResult
+from clippings.books.entities import ImportJobStatus, ImportStage
+from clippings.books.services import ImportJobsRunner
+from clippings.web.presenters.book.system_pages import (
+    NotFoundDTO,
+    not_found_page_presenter,
+)
+from clippings.web.presenters.dtos import ActionDTO, PresenterResult, UrlDTO
 from clippings.web.presenters.html_renderers import make_html_renderer
 
 if TYPE_CHECKING:
-    from clippings.books.use_cases.import_clippings import ImportedBookDTO
+    from clippings.books.dtos import ImportedBookDTO, ImportPreviewDTO
+    from clippings.books.entities import ImportStageProgress
+    from clippings.books.ports import ImportJobsStorageABC
     from clippings.web.presenters.urls import UrlsManager
 
 
@@ -15,6 +24,7 @@ if TYPE_CHECKING:
 class ImportPageDTO:
     page_title: str
     import_action: ActionDTO
+    preview_action: ActionDTO
 
 
 class ClippingsImportPagePresenter:
@@ -29,6 +39,11 @@ class ClippingsImportPagePresenter:
                 label="Save",
                 url=self._urls_manager.build_url("clipping_upload"),
             ),
+            preview_action=ActionDTO(
+                id="import_preview",
+                label="Preview",
+                url=self._urls_manager.build_url("clipping_upload_preview"),
+            ),
         )
         return PresenterResult(
             data=data,
@@ -73,3 +88,132 @@ class ImportClippingsResultPresenter:
             ),
             renderer=make_html_renderer("book/clippings_import_result.jinja2"),
         )
+
+
+@dataclass
+class ImportPreviewResultDTO:
+    title: str
+    is_empty: bool
+    empty_message: str
+    items: list[ImportPreviewItemDTO]
+
+
+@dataclass
+class ImportPreviewItemDTO:
+    book_name: str
+    new_label: str | None
+    summary: str
+
+
+class ImportClippingsPreviewPresenter:
+    async def present(
+        self, previews: list[ImportPreviewDTO]
+    ) -> PresenterResult[ImportPreviewResultDTO]:
+        return PresenterResult(
+            data=ImportPreviewResultDTO(
+                title="Import preview",
+                is_empty=not bool(previews),
+                empty_message="No clippings to import",
+                items=[
+                    ImportPreviewItemDTO(
+                        book_name=f"{item.title} by {item.authors}",
+                        new_label="[NEW]" if item.is_new else None,
+                        summary=self._make_summary(item),
+                    )
+                    for item in previews
+                ],
+            ),
+            renderer=make_html_renderer("book/clippings_import_preview.jinja2"),
+        )
+
+    def _make_summary(self, preview: ImportPreviewDTO) -> str:
+        parts = [f"{preview.new_clippings_count} new clippings"]
+        if preview.linked_notes_count:
+            parts.append(f"{preview.linked_notes_count} notes linked to highlights")
+        if preview.duplicate_clippings_count:
+            parts.append(f"{preview.duplicate_clippings_count} already imported")
+        if preview.deleted_clippings_count:
+            parts.append(f"{preview.deleted_clippings_count} deleted, will be skipped")
+        return ", ".join(parts)
+
+
+@dataclass
+class ImportJobDTO:
+    title: str
+    status: str
+    is_finished: bool
+    poll_url: UrlDTO
+    stages: list[ImportJobStageDTO]
+    error: str | None
+    result: ImportResultDTO | None
+
+
+@dataclass
+class ImportJobStageDTO:
+    label: str
+    progress: str
+    value: int
+    max: int | None
+
+
+class ImportJobPresenter:
+    STAGE_LABELS = {
+        ImportStage.PARSE: "Reading clippings",
+        ImportStage.DEDUPE: "Skipping deleted clippings",
+        ImportStage.ENRICH: "Looking for book covers",
+        ImportStage.WRITE: "Saving books",
+    }
+    STATUS_LABELS = {
+        ImportJobStatus.QUEUED: "Waiting in queue",
+        ImportJobStatus.RUNNING: "In progress",
+        ImportJobStatus.DONE: "Done",
+        ImportJobStatus.FAILED: "Failed",
+    }
+    INTERRUPTED_ERROR = "Import was interrupted, please try again"
+
+    def __init__(
+        self, storage: ImportJobsStorageABC, urls_manager: UrlsManager
+    ) -> None:
+        self._storage = storage
+        self._urls_manager = urls_manager
+
+    async def present(
+        self, job_id: str, user_id: str
+    ) -> PresenterResult[ImportJobDTO] | PresenterResult[NotFoundDTO]:
+        job = await self._storage.get(job_id)
+        if job is None or job.user_id != user_id:
+            return not_found_page_presenter()
+
+        status, error = job.status, job.error
+        if job.is_stale(datetime.now(), ImportJobsRunner.STALE_JOB_TIMEOUT):
+            status, error = ImportJobStatus.FAILED, self.INTERRUPTED_ERROR
+        result = None
+        if job.status == ImportJobStatus.DONE:
+            result = (await ImportClippingsResultPresenter().present(job.result)).data
+        return PresenterResult(
+            data=ImportJobDTO(
+                title="Importing clippings",
+                status=self.STATUS_LABELS[status],
+                is_finished=status in (ImportJobStatus.DONE, ImportJobStatus.FAILED),
+                poll_url=self._urls_manager.build_url("import_job", job_id=job.id),
+                stages=[
+                    self._present_stage(progress)
+                    for progress in job.stages
+                    if progress.done or progress.total is not None
+                ],
+                error=error,
+                result=result,
+            ),
+            renderer=make_html_renderer("book/clippings_import_job.jinja2"),
+        )
+
+    def _present_stage(self, progress: ImportStageProgress) -> ImportJobStageDTO:
+        text = str(progress.done)
+        if progress.total is not None:
+            text = f"{progress.done} / {progress.total}"
+        return ImportJobStageDTO(
+            label=self.STAGE_LABELS[progress.stage],
+            progress=text,
+            value=progress.done,
+            max=progress.total,
+        )
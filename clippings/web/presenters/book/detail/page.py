@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from clippings.books.entities import Book, ClippingType, Position
+from clippings.books.entities import Book, Clipping, ClippingType, Position
 from clippings.web.presenters.book.detail.dtos import (
     ClippingDataDTO,
     ClippingInfoDTO,
@@ -107,10 +107,6 @@ class ClippingPresenter:
 class BookDetailBuilder:
     def __init__(self, book: Book, urls_manager: UrlsManager) -> None:
         self.book = book
-        self.clippings_by_id = {clipping.id: clipping for clipping in book.clippings}
-        self.inline_notes_by_id = {
-            (cl.id, inl.id): inl for cl in book.clippings for inl in cl.inline_notes
-        }
         self.urls_manager = urls_manager
 
     def detail_dto(self) -> BookDetailDTO:
@@ -157,7 +153,7 @@ class BookDetailBuilder:
         )
 
     def clipping_data_dto(self, clipping_id: str) -> ClippingDataDTO:
-        clipping = self.clippings_by_id[clipping_id]
+        clipping = self._get_clipping(clipping_id)
 
         def format_position(position: Position) -> str:
             if position[0] == position[1]:
@@ -234,8 +230,17 @@ class BookDetailBuilder:
             ],
         )
 
+    def _get_clipping(self, clipping_id: str) -> Clipping:
+        # lookups go through the book's own id->position index
+        clipping = self.book.get_clipping(clipping_id)
+        if clipping is None:
+            raise KeyError(clipping_id)
+        return clipping
+
     def _inline_note_dto(self, clipping_id: str, inline_note_id: str) -> InlineNoteDTO:
-        inline_note = self.inline_notes_by_id[(clipping_id, inline_note_id)]
+        inline_note = self._get_clipping(clipping_id).get_inline_note(inline_note_id)
+        if inline_note is None:
+            raise KeyError(inline_note_id)
 
         inline_note_dto = InlineNoteDTO(
             id=inline_note.id,
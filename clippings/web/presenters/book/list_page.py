@@ -6,9 +6,11 @@ from typing import TYPE_CHECKING
 from clippings.web.presenters.dtos import ActionDTO, PaginationItemDTO, PresenterResult
 from clippings.web.presenters.html_renderers import make_html_renderer
 from clippings.web.presenters.image import image_or_default
+from clippings.web.presenters.pagination import decode_cursor, encode_cursor
 
 if TYPE_CHECKING:
-    from clippings.books.entities import Clipping
+    from datetime import datetime
+
     from clippings.books.ports import BooksStorageABC
     from clippings.web.presenters.pagination import PaginationCalculator
     from clippings.web.presenters.urls import UrlsManager
@@ -49,7 +51,9 @@ class BooksListPagePresenter:
         self._pagination_calculator = pagination_calculator
         self._urls_manager = urls_manager
 
-    async def present(self, page: int, on_page: int) -> PresenterResult[BooksPageDTO]:
+    async def present(
+        self, page: int, on_page: int, after: str | None = None
+    ) -> PresenterResult[BooksPageDTO]:
         books_count = await self._storage.count(
             self._storage.FindQuery(start=0, limit=None)
         )
@@ -61,26 +65,45 @@ class BooksListPagePresenter:
             books_page_url=books_url.value,
         )
         page = pagination.current_page
+        offset = (page - 1) * on_page
 
-        query = self._storage.FindQuery(start=(page - 1) * on_page, limit=on_page)
-        books = await self._storage.find(query)
+        # a cursor of another page (e.g. `page` was changed in the URL)
+        # is ignored, so the books always match the page number
+        cursor = decode_cursor(after) if after is not None else None
+        if cursor is not None and cursor[2] == offset:
+            title, book_id, _ = cursor
+            query = self._storage.FindQuery(
+                start=0, limit=on_page, after=(title, book_id)
+            )
+        else:
+            query = self._storage.FindQuery(start=offset, limit=on_page)
+        books = await self._storage.find_summaries(query)
+        if books and page < pagination.total_pages:
+            pagination = self._pagination_calculator(
+                current_page=page,
+                total_items=books_count,
+                on_page=on_page,
+                books_page_url=books_url.value,
+                next_page_cursor=encode_cursor(
+                    books[-1].title, books[-1].id, offset + on_page
+                ),
+            )
 
-        def last_clipping_date(clippings: list[Clipping]) -> str:
-            if not clippings:
+        def last_clipping_date(added_at: datetime | None) -> str:
+            if added_at is None:
                 return "-"
-            last_clipping = sorted(clippings, key=lambda c: c.added_at)[-1]
-            return last_clipping.added_at.strftime("%d %b %Y")
+            return added_at.strftime("%d %b %Y")
 
         data = BooksPageDTO(
             page_title="Books",
             books=[
                 BookOnPageDTO(
-                    cover_url=image_or_default(
-                        getattr(book.meta, "cover_image_small", None), size="small"
+                    cover_url=image_or_default(book.cover_image_small, size="small"),
+                    name=f"{book.title} by {book.first_author}",
+                    clippings_count=book.clippings_count,
+                    last_clipping_added_at=last_clipping_date(
+                        book.last_clipping_added_at
                     ),
-                    name=f"{book.title} by {book.authors[0]}",
-                    clippings_count=len(book.clippings),
-                    last_clipping_added_at=last_clipping_date(book.clippings),
                     rating="-" if book.rating is None else str(book.rating),
                     actions=[
                         ActionDTO(
@@ -19,6 +19,16 @@ def make_book_urls(base_url: str = "/books") -> list[UrlTemplateDTO]:
             template=make_template("/import"),
             method="post",
         ),
+        UrlTemplateDTO(
+            id="clipping_upload_preview",
+            template=make_template("/import/preview"),
+            method="post",
+        ),
+        UrlTemplateDTO(
+            id="import_job",
+            template=make_template("/import/jobs/{job_id}"),
+            method="get",
+        ),
         UrlTemplateDTO(
             id="clippings_export",
             template=make_template("/export"),
@@ -1,3 +1,5 @@
+import base64
+import json
 from typing import Protocol
 
 from clippings.web.presenters.dtos import PaginationDTO, PaginationItemDTO
@@ -5,13 +7,47 @@ from clippings.web.presenters.dtos import PaginationDTO, PaginationItemDTO
 
 class PaginationCalculator(Protocol):
     def __call__(
-        self, current_page: int, total_items: int, on_page: int, books_page_url: str
+        self,
+        current_page: int,
+        total_items: int,
+        on_page: int,
+        books_page_url: str,
+        next_page_cursor: str | None = None,
     ) -> PaginationDTO:
         pass
 
 
+def encode_cursor(title: str, book_id: str, offset: int) -> str:
+    """
+    Cursor of the page that starts after the book with given title and id.
+    `offset` is the number of books before the page, it's used to check
+    that the cursor belongs to the requested page.
+    """
+    data = json.dumps([title, book_id, offset]).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str, int] | None:
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        title, book_id, offset = json.loads(data)
+    except (ValueError, TypeError):
+        return None
+    if (
+        not isinstance(title, str)
+        or not isinstance(book_id, str)
+        or not isinstance(offset, int)
+    ):
+        return None
+    return title, book_id, offset
+
+
 def classic_pagination_calculator(
-    current_page: int, total_items: int, on_page: int, books_page_url: str
+    current_page: int,
+    total_items: int,
+    on_page: int,
+    books_page_url: str,
+    next_page_cursor: str | None = None,  # noqa: U100
 ) -> PaginationDTO:
     total_pages = (total_items + on_page - 1) // on_page
 
@@ -49,3 +85,32 @@ def classic_pagination_calculator(
             for i in page_numbers
         ],
     )
+
+
+def cursor_pagination_calculator(
+    current_page: int,
+    total_items: int,
+    on_page: int,
+    books_page_url: str,
+    next_page_cursor: str | None = None,
+) -> PaginationDTO:
+    """
+    Same pages as in `classic_pagination_calculator`, but link to the next page
+    carries a cursor, so stepping forward one page at a time doesn't need
+    to skip previous pages. Links to other pages (and any `?page=N` URL)
+    still skip them.
+    """
+    pagination = classic_pagination_calculator(
+        current_page=current_page,
+        total_items=total_items,
+        on_page=on_page,
+        books_page_url=books_page_url,
+    )
+    if next_page_cursor is None:
+        return pagination
+
+    next_page = str(pagination.current_page + 1)
+    for item in pagination.items:
+        if item.text == next_page and item.url is not None:
+            item.url = f"{item.url}&after={next_page_cursor}"
+    return pagination
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterator
+
+    from starlette.requests import Request
+
+
+class UploadError(Exception):
+    pass
+
+
+class UploadStream:
+    """
+    Content of a file field of a multipart request, read straight from
+    the request body. Unlike `request.form()`, the file isn't spooled to
+    a temporary file before it can be read, so the receiver can process
+    the upload while it's still being received.
+
+    Data of other fields is discarded, the body after the file isn't read.
+    """
+
+    MAX_PARTS = 2
+
+    def __init__(self, request: Request, field_name: str = "file") -> None:
+        self._request = request
+        self._field_name = field_name
+        self._body: AsyncIterator[bytes] | None = None
+        self._parser: MultipartParser | None = None
+        self._parts_count = 0
+        self._header_name = b""
+        self._header_value = b""
+        self._content_disposition = b""
+        self._in_file = False
+        self._file_finished = False
+        self._error: str | None = None
+        self._received: list[bytes] = []
+
+    async def open(self) -> None | UploadError:
+        """Read the request body until the file content begins."""
+        content_type, params = parse_options_header(
+            self._request.headers.get("Content-Type", "")
+        )
+        if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+            return UploadError("Invalid form data")
+        self._parser = MultipartParser(
+            params[b"boundary"],
+            callbacks={
+                "on_part_begin": self._on_part_begin,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+            },
+        )
+        self._body = self._request.stream().__aiter__()
+        while not self._in_file and not self._file_finished:
+            try:
+                if not await self._feed():
+                    return UploadError("No file provided")
+            except MultipartParseError:
+                return UploadError("Invalid form data")
+            if self._error:
+                return UploadError(self._error)
+        return None
+
+    async def iter_chunks(self) -> AsyncGenerator[bytes, None]:
+        """Yield file content, must be called after successful `open`."""
+        while True:
+            received, self._received = self._received, []
+            for chunk in received:
+                yield chunk
+            if self._file_finished:
+                return
+            if not await self._feed():
+                raise MultipartParseError("Request body ended before end of file")
+
+    async def _feed(self) -> bool:
+        if self._body is None or self._parser is None:
+            raise RuntimeError("open() must be called first")
+        try:
+            data = await anext(self._body)
+        except StopAsyncIteration:
+            return False
+        self._parser.write(data)
+        return True
+
+    def _on_part_begin(self) -> None:
+        self._parts_count += 1
+        self._content_disposition = b""
+        if self._parts_count > self.MAX_PARTS:
+            self._error = "Too many fields"
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file and start < end:
+            self._received.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self._file_finished = True
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._content_disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._content_disposition)
+        if options.get(b"name", b"").decode("latin-1") != self._field_name:
+            return
+        if b"filename" not in options:
+            self._error = "Is not a file"
+        elif not self._file_finished:
+            self._in_file = True
@@ -25,7 +25,9 @@ async def book_list_page(request: Request) -> Response:
 
     controller = RenderBookListController()
     result = await controller.fire(
-        page=_parse_int(page, default=1), on_page=_parse_int(on_page, default=10)
+        page=_parse_int(page, default=1),
+        on_page=_parse_int(on_page, default=10),
+        after=request.query_params.get("after"),
     )
     return convert_response(result)
 
@@ -4,18 +4,20 @@ from typing import TYPE_CHECKING
 
 from multipart.exceptions import MultipartParseError
 from picodi import Provide, inject
-from starlette.datastructures import UploadFile
 from starlette.responses import HTMLResponse, Response
 
 from clippings.web.auth import basic_auth
 from clippings.web.controllers.clippings_export import ClippingsExportController
 from clippings.web.controllers.clippings_import import (
     ClippingsImportController,
+    ClippingsImportPreviewController,
     RenderClippingsImportPageController,
+    RenderImportJobController,
 )
 from clippings.web.controllers.clippings_restore import ClippingsRestoreController
 from clippings.web.deps import get_user_id_from_request
-from clippings.web.views._utils import convert_response
+from clippings.web.views._uploads import UploadStream
+from clippings.web.views._utils import convert_response, get_string_path_param
 
 if TYPE_CHECKING:
     from starlette.requests import Request
@@ -40,18 +42,15 @@ async def clippings_export(request: Request) -> Response:  # noqa: U100
 async def clippings_restore(
     request: Request, user_id: str = Provide(get_user_id_from_request)
 ) -> Response:
+    upload = UploadStream(request)
+    if error := await upload.open():
+        return HTMLResponse(f"ERROR: {error}")
+
+    controller = ClippingsRestoreController()
     try:
-        form = await request.form(max_files=1, max_fields=1)
+        result = await controller.fire(upload.iter_chunks(), user_id=user_id)
     except MultipartParseError:
         return HTMLResponse("ERROR: Invalid form data")
-    if not form.get("file"):
-        return HTMLResponse("ERROR: No file provided")
-    if not isinstance(form["file"], UploadFile):
-        return HTMLResponse("ERROR: Is not a file")
-
-    controller = ClippingsRestoreController()
-    with form["file"].file as fp:
-        result = await controller.fire(fp, user_id=user_id)
     return convert_response(result)
 
 
@@ -60,16 +59,41 @@ async def clippings_restore(
 async def clipping_upload(
     request: Request, user_id: str = Provide(get_user_id_from_request)
 ) -> Response:
+    upload = UploadStream(request)
+    if error := await upload.open():
+        return HTMLResponse(f"ERROR: {error}")
+
+    controller = ClippingsImportController()
     try:
-        form = await request.form(max_files=1, max_fields=1)
+        result = await controller.fire(upload.iter_chunks(), user_id=user_id)
     except MultipartParseError:
         return HTMLResponse("ERROR: Invalid form data")
-    if not form.get("file"):
-        return HTMLResponse("ERROR: No file provided")
-    if not isinstance(form["file"], UploadFile):
-        return HTMLResponse("ERROR: Is not a file")
+    return convert_response(result)
 
-    controller = ClippingsImportController()
-    with form["file"].file as fp:
-        result = await controller.fire(fp, user_id=user_id)
+
+@basic_auth
+@inject
+async def clipping_upload_preview(
+    request: Request, user_id: str = Provide(get_user_id_from_request)
+) -> Response:
+    upload = UploadStream(request)
+    if error := await upload.open():
+        return HTMLResponse(f"ERROR: {error}")
+
+    controller = ClippingsImportPreviewController()
+    try:
+        result = await controller.fire(upload.iter_chunks(), user_id=user_id)
+    except MultipartParseError:
+        return HTMLResponse("ERROR: Invalid form data")
+    return convert_response(result)
+
+
+@basic_auth
+@inject
+async def import_job(
+    request: Request, user_id: str = Provide(get_user_id_from_request)
+) -> Response:
+    job_id = get_string_path_param(request, "job_id")
+    controller = RenderImportJobController()
+    result = await controller.fire(job_id, user_id=user_id)
     return convert_response(result)
@@ -4,10 +4,12 @@ import pytest
 from picodi import registry
 from picodi.helpers import resolve
 
+from clippings.books.adapters.locks import MemoryImportLock
 from clippings.books.adapters.readers import MockClippingsReader
 from clippings.books.adapters.storages import (
     MemoryBooksStorage,
     MemoryDeletedHashStorage,
+    MemoryImportFingerprintStorage,
 )
 from clippings.books.services import EnrichBooksMetaService
 from clippings.books.use_cases.book_info import MockBookInfoClient
@@ -62,11 +64,28 @@ def memory_book_storage() -> MemoryBooksStorage:
     return MemoryBooksStorage()
 
 
+@pytest.fixture()
+def memory_book_patch_storage() -> MemoryBooksStorage:
+    # Use cases change books got from `memory_book_storage` in place,
+    # so patches are checked in a storage that doesn't share them
+    return MemoryBooksStorage()
+
+
 @pytest.fixture()
 def memory_deleted_hash_storage() -> MemoryDeletedHashStorage:
     return MemoryDeletedHashStorage()
 
 
+@pytest.fixture()
+def memory_import_fingerprint_storage() -> MemoryImportFingerprintStorage:
+    return MemoryImportFingerprintStorage(user_id="user:42")
+
+
+@pytest.fixture()
+def memory_import_lock() -> MemoryImportLock:
+    return MemoryImportLock({}, user_id="user:42")
+
+
 @pytest.fixture()
 def mock_clipping_reader() -> MockClippingsReader:
     return MockClippingsReader([])
@@ -0,0 +1,51 @@
+import pytest
+
+from clippings.utils.bloom import BloomFilter
+
+
+def test_added_items_are_always_found():
+    sut = BloomFilter.for_capacity(1000)
+    items = [f"book:{i}:clipping" for i in range(1000)]
+
+    for item in items:
+        sut.add(item)
+
+    assert all(item in sut for item in items)
+
+
+def test_false_positive_rate_is_close_to_requested():
+    sut = BloomFilter.for_capacity(1000, error_rate=0.01)
+    for i in range(1000):
+        sut.add(f"added:{i}")
+
+    false_positives = sum(f"not-added:{i}" in sut for i in range(10_000))
+
+    assert false_positives / 10_000 < 0.02
+
+
+def test_empty_filter_contains_nothing():
+    sut = BloomFilter.for_capacity(10)
+
+    assert "item" not in sut
+
+
+def test_restore_filter_from_bits():
+    bloom = BloomFilter.for_capacity(100)
+    bloom.add("item")
+
+    sut = BloomFilter(size=bloom.size, hash_count=bloom.hash_count, bits=bloom.bits)
+
+    assert "item" in sut
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"size": 0, "hash_count": 1},
+        {"size": 8, "hash_count": 0},
+        {"size": 8, "hash_count": 1, "bits": b"\x00\x00"},
+    ],
+)
+def test_invalid_params(kwargs):
+    with pytest.raises(ValueError):
+        BloomFilter(**kwargs)
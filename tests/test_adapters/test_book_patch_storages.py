@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from clippings.books.adapters.storages import MemoryBooksStorage, MongoBooksStorage
+
+if TYPE_CHECKING:
+    from clippings.books.entities import Book
+
+
+@pytest.fixture(params=["memory", "mongo"])
+def make_sut(request, mongo_db):
+    async def _make_sut(
+        book: Book, user_id: str = "test_user:1"
+    ) -> MemoryBooksStorage | MongoBooksStorage:
+        if request.param == "memory":
+            storage = MemoryBooksStorage()
+        elif request.param == "mongo":
+            storage = MongoBooksStorage(mongo_db, user_id)
+        else:
+            raise ValueError(f"Unknown storage type: {request.param}")
+        await storage.add(book)
+        return storage
+
+    return _make_sut
+
+
+@pytest.fixture()
+def book(mother):
+    return mother.book(
+        id="book:1",
+        clippings=[
+            mother.clipping(
+                id="clipping:1",
+                content="first",
+                inline_notes=[mother.inline_note(id="note:1", content="note")],
+            ),
+            mother.clipping(id="clipping:2", content="second"),
+        ],
+    )
+
+
+async def test_set_clipping_content(make_sut, book):
+    sut = await make_sut(book)
+
+    await sut.set_clipping_content("book:1", "clipping:2", "updated")
+
+    result = await sut.get("book:1")
+    assert [cl.content for cl in result.clippings] == ["first", "updated"]
+
+
+async def test_insert_clipping_at_position(make_sut, book, mother):
+    sut = await make_sut(book)
+
+    await sut.insert_clipping("book:1", mother.clipping(id="clipping:3"), 1)
+
+    result = await sut.get("book:1")
+    assert [cl.id for cl in result.clippings] == [
+        "clipping:1",
+        "clipping:3",
+        "clipping:2",
+    ]
+    assert result.clippings[1] == mother.clipping(id="clipping:3")
+
+
+async def test_insert_existing_clipping_does_nothing(make_sut, book, mother):
+    sut = await make_sut(book)
+
+    await sut.insert_clipping("book:1", mother.clipping(id="clipping:2"), 0)
+
+    result = await sut.get("book:1")
+    assert [cl.id for cl in result.clippings] == ["clipping:1", "clipping:2"]
+
+
+async def test_remove_clipping(make_sut, book):
+    sut = await make_sut(book)
+
+    await sut.remove_clipping("book:1", "clipping:1")
+
+    result = await sut.get("book:1")
+    assert [cl.id for cl in result.clippings] == ["clipping:2"]
+
+
+async def test_add_inline_note(make_sut, book, mother):
+    sut = await make_sut(book)
+    inline_note = mother.inline_note(id="note:2", content="new note")
+
+    await sut.add_inline_note("book:1", "clipping:2", inline_note)
+    await sut.add_inline_note("book:1", "clipping:2", inline_note)
+
+    result = await sut.get("book:1")
+    assert result.clippings[1].inline_notes == [inline_note]
+    assert [note.id for note in result.clippings[0].inline_notes] == ["note:1"]
+
+
+async def test_set_inline_note_content(make_sut, book):
+    sut = await make_sut(book)
+
+    await sut.set_inline_note_content("book:1", "clipping:1", "note:1", "updated")
+
+    result = await sut.get("book:1")
+    assert result.clippings[0].inline_notes[0].content == "updated"
+
+
+async def test_remove_inline_note(make_sut, book):
+    sut = await make_sut(book)
+
+    await sut.remove_inline_note("book:1", "clipping:1", "note:1")
+
+    result = await sut.get("book:1")
+    assert result.clippings[0].inline_notes == []
+
+
+@pytest.mark.parametrize("position", [0, 1, 2])
+async def test_unlink_inline_note(make_sut, book, mother, position):
+    sut = await make_sut(book)
+    restored_clipping = mother.clipping(id="clipping:3", content="note")
+
+    await sut.unlink_inline_note(
+        "book:1", "clipping:1", "note:1", restored_clipping, position
+    )
+
+    result = await sut.get("book:1")
+    assert result.get_clipping("clipping:1").inline_notes == []
+    assert result.clippings[position] == restored_clipping
+    assert len(result.clippings) == 3
+
+
+async def test_unlink_inline_note_doesnt_insert_existing_clipping(
+    make_sut, book, mother
+):
+    sut = await make_sut(book)
+
+    await sut.unlink_inline_note(
+        "book:1", "clipping:1", "note:1", mother.clipping(id="clipping:2"), 0
+    )
+
+    result = await sut.get("book:1")
+    assert [cl.id for cl in result.clippings] == ["clipping:1", "clipping:2"]
+    assert result.clippings[0].inline_notes == []
+
+
+async def test_mongo_patches_are_scoped_to_user(book, mongo_db):
+    sut = MongoBooksStorage(mongo_db, "test_user:1")
+    await sut.add(book)
+    other_user_storage = MongoBooksStorage(mongo_db, "test_user:2")
+
+    await other_user_storage.set_clipping_content("book:1", "clipping:1", "updated")
+    await other_user_storage.remove_clipping("book:1", "clipping:2")
+
+    result = await sut.get("book:1")
+    assert [cl.content for cl in result.clippings] == ["first", "second"]
@@ -0,0 +1,154 @@
+from dataclasses import asdict
+from datetime import datetime
+
+import pytest
+
+from clippings.books.adapters.storages import (
+    mongo_book_deserializer,
+    mongo_book_serializer,
+)
+from clippings.books.dtos import ImportedBookDTO
+from clippings.books.entities import (
+    ClippingType,
+    ImportJob,
+    ImportJobStatus,
+    ImportStage,
+)
+from clippings.books.serializers import (
+    book_from_dict,
+    book_to_dict,
+    import_job_from_dict,
+    import_job_to_dict,
+)
+from clippings.seedwork.exceptions import ValidationError
+
+
+@pytest.fixture()
+def book(mother):
+    return mother.book(
+        id="BOOK1",
+        review="Nice",
+        rating=8,
+        clippings=[
+            mother.clipping(
+                id="CL1",
+                page=(1, 2),
+                location=(10, 20),
+                inline_notes=[mother.inline_note(id="note1", original_id="NOTE1")],
+            ),
+            mother.clipping(id="CL2", type=ClippingType.NOTE),
+        ],
+    )
+
+
+def test_mongo_deserializer_restores_serialized_book(book):
+    book_dict = mongo_book_serializer(book, "user:1")
+
+    result = mongo_book_deserializer(book_dict)
+
+    assert result == book
+    assert isinstance(result.clippings[0].page, tuple)
+    assert result.clippings[1].type is ClippingType.NOTE
+
+
+def test_optional_fields_have_defaults():
+    data = {"id": "BOOK1", "title": "Title", "authors": ["Author"], "clippings": []}
+
+    result = book_from_dict(data)
+
+    assert result.review == ""
+    assert result.rating is None
+    assert result.meta is None
+
+
+def test_datetime_hook_is_applied_to_nested_entities(book):
+    book_dict = mongo_book_serializer(book, "user:1")
+    for clipping in book_dict["clippings"]:
+        clipping["added_at"] = clipping["added_at"].isoformat()
+        for note in clipping["inline_notes"]:
+            note["added_at"] = note["added_at"].isoformat()
+
+    result = book_from_dict(book_dict, datetime_hook=datetime.fromisoformat)
+
+    assert result == book
+
+
+def test_raw_datetime_is_rejected_without_hook(book):
+    book_dict = mongo_book_serializer(book, "user:1")
+    book_dict["clippings"][0]["added_at"] = "2024-08-09T00:00:00"
+
+    with pytest.raises(TypeError, match="Expected datetime, got str"):
+        book_from_dict(book_dict)
+
+
+def test_entities_validation_is_applied(book):
+    book_dict = mongo_book_serializer(book, "user:1")
+    book_dict["clippings"][0]["id"] = "X" * 14
+
+    with pytest.raises(ValidationError, match="Invalid clipping id"):
+        book_from_dict(book_dict)
+
+
+def test_unknown_clipping_type_is_rejected(book):
+    book_dict = mongo_book_serializer(book, "user:1")
+    book_dict["clippings"][0]["type"] = "bookmark"
+
+    with pytest.raises(ValueError, match="'bookmark' is not a valid ClippingType"):
+        book_from_dict(book_dict)
+
+
+def test_book_to_dict_matches_asdict(book):
+    def dict_factory(items):
+        # skip private caches of entities
+        return {key: value for key, value in items if not key.startswith("_")}
+
+    expected = asdict(book, dict_factory=dict_factory)
+    for clipping in expected["clippings"]:
+        clipping["type"] = clipping["type"].value
+
+    result = book_to_dict(book)
+
+    assert result == expected
+
+
+def test_book_to_dict_does_not_share_mutable_containers(book):
+    result = book_to_dict(book)
+
+    result["authors"].append("Another Author")
+    result["clippings"][0]["inline_notes"].clear()
+    result["meta"]["isbns"].clear()
+
+    assert book.authors == ["The Author"]
+    assert len(book.clippings[0].inline_notes) == 1
+    assert book.meta.isbns == ["1234567890"]
+
+
+def test_mongo_serializer_adds_user_fields(book):
+    result = mongo_book_serializer(book, "user:1")
+
+    assert result["_id"] == "user:1|BOOK1"
+    assert result["user_id"] == "user:1"
+
+
+def test_import_job_from_dict_restores_serialized_job():
+    now = datetime(2024, 1, 1, 12, 0)
+    job = ImportJob(
+        id="job1",
+        user_id="user:1",
+        status=ImportJobStatus.RUNNING,
+        created_at=now,
+        updated_at=now,
+    )
+    job.update_progress(ImportStage.PARSE, 10, 20, now)
+    job.finish(
+        [
+            ImportedBookDTO(
+                title="Book", authors="Author", imported_clippings_count=1, is_new=True
+            )
+        ],
+        now,
+    )
+
+    result = import_job_from_dict(import_job_to_dict(job))
+
+    assert result == job
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from datetime import datetime
 from random import shuffle  # noqa: DUO102
 from typing import TYPE_CHECKING
 
 import pytest
 
 from clippings.books.adapters.storages import MemoryBooksStorage, MongoBooksStorage
+from clippings.books.dtos import BookSummaryDTO
 from clippings.books.entities import Book
 
 if TYPE_CHECKING:
@@ -143,6 +145,85 @@ async def test_by_default_return_in_order_by_title(make_sut, mother):
     assert list(result) == list(books)
 
 
+async def test_find_summaries_of_books(make_sut, mother):
+    books = [
+        mother.book(
+            id="book:1",
+            title="Book 1",
+            authors=["Author 1", "Author 2"],
+            meta=mother.book_meta(cover_image_small="https://example.com/1.jpg"),
+            rating=5,
+            clippings=[
+                mother.clipping(id="1", added_at=datetime(2024, 8, 9)),
+                mother.clipping(id="2", added_at=datetime(2024, 8, 11)),
+                mother.clipping(id="3", added_at=datetime(2024, 8, 10)),
+            ],
+        ),
+        mother.book(id="book:2", title="Book 2", clippings=[]),
+    ]
+    sut = await make_sut(books)
+
+    result = await sut.find_summaries(sut.FindQuery(start=0, limit=None))
+
+    assert result == [
+        BookSummaryDTO(
+            id="book:1",
+            title="Book 1",
+            first_author="Author 1",
+            cover_image_small="https://example.com/1.jpg",
+            rating=5,
+            clippings_count=3,
+            last_clipping_added_at=datetime(2024, 8, 11),
+        ),
+        BookSummaryDTO(
+            id="book:2",
+            title="Book 2",
+            first_author="The Author",
+            cover_image_small="https://placehold.co/100x150",
+            rating=None,
+            clippings_count=0,
+            last_clipping_added_at=None,
+        ),
+    ]
+
+
+@pytest.mark.parametrize(
+    "start,limit,expected_ids",
+    [
+        (0, 2, ["10", "11"]),
+        (3, None, ["13", "14"]),
+        (1, 0, []),
+    ],
+)
+async def test_find_summaries_is_paginated_like_find(
+    start, limit, expected_ids, make_sut, make_books
+):
+    sut = await make_sut(make_books(5))
+
+    result = await sut.find_summaries(sut.FindQuery(start=start, limit=limit))
+
+    assert [summary.id for summary in result] == expected_ids
+
+
+async def test_find_books_after_cursor(make_sut, mother):
+    books = [
+        mother.book(id="1", title="A"),
+        mother.book(id="2", title="B"),
+        mother.book(id="3", title="B"),
+        mother.book(id="4", title="C"),
+    ]
+    sut = await make_sut(books)
+    query = sut.FindQuery(start=0, limit=2, after=("B", "2"))
+
+    result = await sut.find(query)
+    summaries = await sut.find_summaries(query)
+    result_count = await sut.count(query)
+
+    assert [book.id for book in result] == ["3", "4"]
+    assert [summary.id for summary in summaries] == ["3", "4"]
+    assert result_count == 2
+
+
 async def test_can_get_count_of_books(make_sut, make_books):
     sut = await make_sut(make_books(42))
 
@@ -151,6 +232,81 @@ async def test_can_get_count_of_books(make_sut, make_books):
     assert result == 42
 
 
+async def test_mongo_books_counter_tracks_count_of_books(mongo_db, mother):
+    sut = MongoBooksStorage(mongo_db, "user1", use_counter=True)
+    other_user_storage = MongoBooksStorage(mongo_db, "user2", use_counter=True)
+    full_query = sut.FindQuery(start=0, limit=None)
+    assert await sut.count(full_query) == 0
+
+    await sut.add(mother.book(id="book:1"))
+    await sut.add(mother.book(id="book:1", title="Updated"))
+    await sut.extend([mother.book(id=f"book:{i}") for i in range(1, 4)])
+    await sut.remove(mother.book(id="book:2"))
+    await sut.remove(mother.book(id="book:42"))
+    await other_user_storage.add(mother.book(id="book:1"))
+
+    assert await sut.count(full_query) == 2
+    assert await other_user_storage.count(full_query) == 1
+
+
+async def test_mongo_books_counter_initialized_from_existing_books(
+    mongo_db, make_books
+):
+    await MongoBooksStorage(mongo_db, "user1").extend(make_books(5))
+    sut = MongoBooksStorage(mongo_db, "user1", use_counter=True)
+
+    result = await sut.count(sut.FindQuery(start=0, limit=None))
+
+    assert result == 5
+
+
+async def test_mongo_books_counter_counts_books_added_while_it_is_initialized(
+    mongo_db, mother, monkeypatch
+):
+    sut = MongoBooksStorage(mongo_db, "user1", use_counter=True)
+    other_sut = MongoBooksStorage(mongo_db, "user1", use_counter=True)
+    count_documents = sut._collection.count_documents
+    concurrent_adds = [mother.book(id="book:1")]
+
+    async def count_documents_with_concurrent_add(*args, **kwargs):
+        result = await count_documents(*args, **kwargs)
+        if concurrent_adds:
+            await other_sut.add(concurrent_adds.pop())
+        return result
+
+    monkeypatch.setattr(
+        sut._collection, "count_documents", count_documents_with_concurrent_add
+    )
+    full_query = sut.FindQuery(start=0, limit=None)
+    await sut.count(full_query)
+    await other_sut.add(mother.book(id="book:2"))
+
+    result = await sut.count(full_query)
+
+    assert result == 2
+
+
+async def test_mongo_books_counter_drift_is_fixed_on_check(
+    mongo_db, make_books, monkeypatch
+):
+    sut = MongoBooksStorage(mongo_db, "user1", use_counter=True)
+    await sut.extend(make_books(3))
+    # e.g. the process died between a write of books and the counter update
+    await mongo_db["books_counters"].update_one(
+        {"_id": "user1"}, {"$set": {"count": 42}}
+    )
+    full_query = sut.FindQuery(start=0, limit=None)
+    result_before_check = await sut.count(full_query)
+    monkeypatch.setattr(MongoBooksStorage, "COUNTER_CHECK_INTERVAL", 0)
+
+    result = await sut.count(full_query)
+
+    assert result_before_check == 42
+    assert result == 3
+    monkeypatch.undo()
+    assert await sut.count(full_query) == 3
+
+
 async def test_can_iterate_over_books(make_sut, mother):
     books = [mother.book(id=f"book:{i}", title=f"Book {i}") for i in range(10)]
     sut = await make_sut(books)
@@ -56,3 +56,100 @@ async def test_clear(make_sut, mother):
     result = await sut.get_all()
 
     assert result == []
+
+
+async def test_contains_many(make_sut, mother):
+    sut = await make_sut()
+    await sut.extend(
+        [mother.deleted_hash(id="hash:1"), mother.deleted_hash(id="hash:2")]
+    )
+
+    result = await sut.contains_many(["hash:1", "hash:3", "hash:2", "hash:1"])
+
+    assert result == {"hash:1", "hash:2"}
+
+
+async def test_contains_many_with_empty_ids(make_sut, mother):
+    sut = await make_sut()
+    await sut.add(mother.deleted_hash(id="hash:1"))
+
+    result = await sut.contains_many([])
+
+    assert result == set()
+
+
+async def test_contains_many_only_for_selected_user(mongo_db, mother):
+    await MongoDeletedHashStorage(mongo_db, user_id="user_1").add(
+        mother.deleted_hash(id="hash:1")
+    )
+    sut = MongoDeletedHashStorage(mongo_db, user_id="user_2")
+
+    result = await sut.contains_many(["hash:1"])
+
+    assert result == set()
+
+
+async def test_mongo_filter_tracks_added_hashes(mongo_db, mother):
+    sut = MongoDeletedHashStorage(mongo_db, user_id="user_id")
+    await sut.extend([mother.deleted_hash(id="hash:1")])
+    assert await sut.contains_many(["hash:1", "hash:2"]) == {"hash:1"}
+
+    await sut.add(mother.deleted_hash(id="hash:2"))
+    result = await sut.contains_many(["hash:1", "hash:2", "hash:3"])
+
+    assert result == {"hash:1", "hash:2"}
+
+
+async def test_mongo_filter_rebuilt_after_it_is_full(mongo_db, mother, monkeypatch):
+    monkeypatch.setattr(MongoDeletedHashStorage, "FILTER_MIN_CAPACITY", 2)
+    sut = MongoDeletedHashStorage(mongo_db, user_id="user_id")
+    ids = [f"hash:{i}" for i in range(5)]
+    await sut.contains_many(ids)
+
+    for hash_id in ids:
+        await sut.add(mother.deleted_hash(id=hash_id))
+    result = await sut.contains_many([*ids, "hash:42"])
+
+    assert result == set(ids)
+
+
+class FiltersRebuiltAfterRead:
+    def __init__(self, filters, rebuild):
+        self._filters = filters
+        self._rebuild = rebuild
+
+    def __getattr__(self, name):
+        return getattr(self._filters, name)
+
+    async def find_one(self, *args, **kwargs):
+        doc = await self._filters.find_one(*args, **kwargs)
+        if self._rebuild is not None:
+            rebuild, self._rebuild = self._rebuild, None
+            await rebuild()
+        return doc
+
+
+async def test_mongo_filter_isnt_overwritten_with_stale_bits_after_rebuild(
+    mongo_db, mother
+):
+    sut = MongoDeletedHashStorage(mongo_db, user_id="user_id")
+    other = MongoDeletedHashStorage(mongo_db, user_id="user_id")
+    await sut.extend([mother.deleted_hash(id="hash:1")])
+    sut._filters = FiltersRebuiltAfterRead(
+        sut._filters, lambda: other.extend([mother.deleted_hash(id="hash:3")])
+    )
+
+    await sut.add(mother.deleted_hash(id="hash:2"))
+    result = await sut.contains_many(["hash:1", "hash:2", "hash:3"])
+
+    assert result == {"hash:1", "hash:2", "hash:3"}
+
+
+async def test_mongo_filter_reset_on_clear(mongo_db, mother):
+    sut = MongoDeletedHashStorage(mongo_db, user_id="user_id")
+    await sut.extend([mother.deleted_hash(id="hash:1")])
+
+    await sut.clear()
+    result = await sut.contains_many(["hash:1"])
+
+    assert result == set()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from clippings.books.adapters.storages import (
+    MemoryImportFingerprintStorage,
+    MongoImportFingerprintStorage,
+)
+from clippings.books.entities import ImportFingerprint
+
+if TYPE_CHECKING:
+    from clippings.books.ports import ImportFingerprintStorageABC
+
+
+@pytest.fixture(params=["memory", "mongo"])
+def make_sut(request, mongo_db):
+    fingerprints_map: dict[str, ImportFingerprint] = {}
+
+    async def _make_sut(user_id: str = "user_id") -> ImportFingerprintStorageABC:
+        if request.param == "memory":
+            storage = MemoryImportFingerprintStorage(fingerprints_map, user_id=user_id)
+        elif request.param == "mongo":
+            storage = MongoImportFingerprintStorage(mongo_db, user_id=user_id)
+        else:
+            raise ValueError(f"Unknown storage type: {request.param}")
+        return storage
+
+    return _make_sut
+
+
+async def test_get_empty(make_sut):
+    sut = await make_sut()
+
+    result = await sut.get()
+
+    assert result is None
+
+
+async def test_set_and_get(make_sut):
+    sut = await make_sut()
+    fingerprint = ImportFingerprint(size=100, hash="abc")
+
+    await sut.set(ImportFingerprint(size=10, hash="old"))
+    await sut.set(fingerprint)
+
+    assert await sut.get() == fingerprint
+
+
+async def test_fingerprints_are_user_scoped(make_sut):
+    sut = await make_sut("user_1")
+    other_user_sut = await make_sut("user_2")
+
+    await sut.set(ImportFingerprint(size=100, hash="abc"))
+
+    assert await other_user_sut.get() is None
+
+
+async def test_clear(make_sut):
+    sut = await make_sut()
+    await sut.set(ImportFingerprint(size=100, hash="abc"))
+
+    await sut.clear()
+
+    assert await sut.get() is None
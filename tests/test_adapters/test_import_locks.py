@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+import pytest
+
+from clippings.books.adapters.locks import MemoryImportLock, MongoImportLock
+from clippings.books.exceptions import ImportInProgressError, ImportLockLostError
+
+if TYPE_CHECKING:
+    from clippings.books.ports import ImportLockABC
+
+
+@pytest.fixture(params=["memory", "mongo"])
+def make_sut(request, mongo_db, monkeypatch):
+    monkeypatch.setattr(MongoImportLock, "POLL_INTERVAL", 0.01)
+    locks_map: dict[str, asyncio.Lock] = {}
+
+    def _make_sut(user_id: str = "user_id", timeout: float = 5) -> ImportLockABC:
+        if request.param == "memory":
+            return MemoryImportLock(locks_map, user_id, timeout=timeout)
+        elif request.param == "mongo":
+            return MongoImportLock(mongo_db, user_id, timeout=timeout)
+        raise ValueError(f"Unknown lock type: {request.param}")
+
+    return _make_sut
+
+
+async def test_holders_are_serialized(make_sut):
+    events = []
+
+    async def hold(name):
+        async with make_sut().hold():
+            events.append(f"{name} acquired")
+            await asyncio.sleep(0.05)
+            events.append(f"{name} released")
+
+    await asyncio.gather(hold("first"), hold("second"))
+
+    assert events == [
+        "first acquired",
+        "first released",
+        "second acquired",
+        "second released",
+    ]
+
+
+async def test_raise_error_if_lock_isnt_released_in_time(make_sut):
+    async with make_sut().hold():
+        with pytest.raises(ImportInProgressError):
+            async with make_sut(timeout=0.05).hold():
+                pass
+
+
+async def test_locks_are_user_scoped(make_sut):
+    async with make_sut("user_1").hold():
+        async with make_sut("user_2", timeout=0.05).hold():
+            pass
+
+
+async def test_lock_is_released_on_error(make_sut):
+    with pytest.raises(RuntimeError):
+        async with make_sut().hold():
+            raise RuntimeError("Import failed")
+
+    async with make_sut(timeout=0.05).hold():
+        pass
+
+
+async def test_expired_lease_can_be_taken_over(mongo_db):
+    expired_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await mongo_db[MongoImportLock.COLLECTION_NAME].insert_one(
+        {"_id": "user_id", "owner": "dead process", "expires_at": expired_at}
+    )
+    sut = MongoImportLock(mongo_db, "user_id", timeout=0.05)
+
+    async with sut.hold():
+        doc = await mongo_db[MongoImportLock.COLLECTION_NAME].find_one(
+            {"_id": "user_id"}
+        )
+
+    assert doc["owner"] != "dead process"
+
+
+async def test_held_lock_isnt_lost(make_sut):
+    sut = make_sut()
+
+    async with sut.hold():
+        sut.check_held()
+
+
+async def test_mongo_lock_is_lost_if_lease_is_taken_over(mongo_db, monkeypatch):
+    monkeypatch.setattr(MongoImportLock, "LEASE_DURATION", timedelta(seconds=0.3))
+    sut = MongoImportLock(mongo_db, "user_id")
+
+    async with sut.hold():
+        await mongo_db[MongoImportLock.COLLECTION_NAME].update_one(
+            {"_id": "user_id"}, {"$set": {"owner": "other process"}}
+        )
+        await asyncio.sleep(0.15)
+
+        with pytest.raises(ImportLockLostError):
+            sut.check_held()
+
+
+async def test_mongo_lock_is_lost_if_lease_isnt_renewed_in_time(mongo_db, monkeypatch):
+    monkeypatch.setattr(MongoImportLock, "LEASE_DURATION", timedelta(seconds=0.3))
+    sut = MongoImportLock(mongo_db, "user_id")
+
+    async with sut.hold():
+        # blocked event loop doesn't let the lease to be renewed
+        time.sleep(0.25)
+
+        with pytest.raises(ImportLockLostError):
+            sut.check_held()
@@ -1,4 +1,7 @@
+import asyncio
 import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +21,14 @@ def make_sut():
     return _make_sut
 
 
+@pytest.fixture(scope="module")
+def process_pool():
+    with ProcessPoolExecutor(
+        max_workers=2, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        yield pool
+
+
 @pytest.fixture()
 def make_file_object():
     def _make_file_object(
@@ -276,3 +287,232 @@ async def test_parsing_languages(make_sut, multilanguage_clippings):
             added_at=datetime(2024, 8, 22, 18, 10, 53),
         ),
     ]
+
+
+async def test_memory_mapped_file_gives_same_clippings(
+    make_sut, multilanguage_clippings, tmp_path, monkeypatch
+):
+    expected = [clipping async for clipping in make_sut(multilanguage_clippings).read()]
+    path = tmp_path / "My Clippings.txt"
+    multilanguage_clippings.seek(0)
+    path.write_bytes(multilanguage_clippings.read())
+    monkeypatch.setattr(KindleClippingsReader, "MMAP_MIN_SIZE", 0)
+
+    with open(path, "rb") as file:
+        clippings = [clipping async for clipping in make_sut(file).read()]
+
+    assert clippings == expected
+    assert len(clippings) == 22
+
+
+async def test_skip_clipping_without_separator_at_the_end(make_file_object, make_sut):
+    file = make_file_object()
+    file.seek(0, io.SEEK_END)
+    file.write(
+        b"\nNext Book\n- Your Highlight on page 1 | location 1 | \n\nNot finished"
+    )
+    file.seek(0)
+    sut = make_sut(file)
+
+    clippings = [clipping async for clipping in sut.read()]
+
+    assert [clipping.book.title for clipping in clippings] == [
+        "Hexagonal Architecture Explained"
+    ]
+
+
+async def test_parse_file_with_windows_line_endings(make_file_object, make_sut):
+    file = make_file_object(content="First line\nSecond line")
+    content = file.read().replace(b"\n", b"\r\n")
+    sut = make_sut(io.BytesIO(content))
+
+    clippings = [clipping async for clipping in sut.read()]
+
+    assert len(clippings) == 1
+    assert clippings[0].content == "First line\nSecond line"
+    assert clippings[0].location == (1300, 1301)
+
+
+async def test_skip_byte_order_marks_at_beginning_of_records(
+    make_file_object, make_sut
+):
+    records = [
+        make_file_object(title=f"Book {i}", content=f"Highlight {i}").read()
+        for i in range(1, 4)
+    ]
+    content = b"\n".join(b"\xef\xbb\xbf" + record for record in records)
+    sut = make_sut(io.BytesIO(content))
+
+    clippings = [clipping async for clipping in sut.read()]
+
+    assert [(clipping.book.title, clipping.content) for clipping in clippings] == [
+        ("Book 1", "Highlight 1"),
+        ("Book 2", "Highlight 2"),
+        ("Book 3", "Highlight 3"),
+    ]
+
+
+async def test_separator_must_be_on_its_own_line(make_file_object, make_sut):
+    file = make_file_object(content="Text with ========== inside")
+    sut = make_sut(file)
+
+    clippings = [clipping async for clipping in sut.read()]
+
+    assert len(clippings) == 1
+    assert clippings[0].content == "Text with ========== inside"
+
+
+@pytest.fixture()
+def make_big_file_object(make_file_object):
+    def _make_big_file_object(clippings_count: int) -> io.BytesIO:
+        clipping = make_file_object().getvalue() + b"\n"
+        return io.BytesIO(clipping * clippings_count)
+
+    return _make_big_file_object
+
+
+async def test_event_loop_is_not_blocked_while_parsing(
+    make_big_file_object, make_sut, monkeypatch
+):
+    monkeypatch.setattr(KindleClippingsReader, "BATCH_SIZE", 10)
+    sut = make_sut(make_big_file_object(100))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        clippings = [clipping async for clipping in sut.read()]
+        ticks_while_reading = ticks
+    finally:
+        ticker_task.cancel()
+
+    assert len(clippings) == 100
+    assert ticks_while_reading > 0
+
+
+async def test_can_stop_reading_before_end_of_file(
+    make_big_file_object, make_sut, monkeypatch
+):
+    monkeypatch.setattr(KindleClippingsReader, "BATCH_SIZE", 1)
+    monkeypatch.setattr(KindleClippingsReader, "QUEUE_SIZE", 1)
+    sut = make_sut(make_big_file_object(100))
+    reader = sut.read()
+
+    first = await anext(reader)
+    await asyncio.wait_for(reader.aclose(), timeout=5)
+
+    assert first.book.title == "Hexagonal Architecture Explained"
+
+
+async def test_parsing_errors_are_raised_to_consumer(make_sut):
+    class BrokenFile(io.BytesIO):
+        def read(self, *args, **kwargs):
+            raise OSError("Can't read file")
+
+    sut = make_sut(BrokenFile(b"data"))
+
+    with pytest.raises(OSError, match="Can't read file"):
+        [clipping async for clipping in sut.read()]
+
+
+async def test_parallel_parsing_gives_same_clippings_in_same_order(
+    make_sut, multilanguage_clippings, monkeypatch, process_pool
+):
+    expected = [clipping async for clipping in make_sut(multilanguage_clippings).read()]
+    monkeypatch.setattr(KindleClippingsReader, "PARALLEL_MIN_SIZE", 0)
+    monkeypatch.setattr(KindleClippingsReader, "CHUNK_SIZE", 1024)
+    monkeypatch.setattr(KindleClippingsReader, "MAX_PENDING_CHUNKS", 2)
+    sut = KindleClippingsReader(multilanguage_clippings, process_pool=process_pool)
+
+    clippings = [clipping async for clipping in sut.read()]
+
+    assert clippings == expected
+
+
+async def test_process_pool_can_be_shared_between_readers(
+    make_file_object, monkeypatch, process_pool
+):
+    monkeypatch.setattr(KindleClippingsReader, "PARALLEL_MIN_SIZE", 0)
+    first = KindleClippingsReader(make_file_object(), process_pool=process_pool)
+    second = KindleClippingsReader(make_file_object(), process_pool=process_pool)
+
+    first_result = [clipping async for clipping in first.read()]
+    second_result = [clipping async for clipping in second.read()]
+
+    assert first_result == second_result
+    assert len(first_result) == 1
+
+
+async def test_parse_sequentially_without_process_pool(
+    make_sut, multilanguage_clippings, monkeypatch
+):
+    monkeypatch.setattr(KindleClippingsReader, "PARALLEL_MIN_SIZE", 0)
+    sut = make_sut(multilanguage_clippings)
+    monkeypatch.setattr(sut, "_parse_in_parallel", None)
+
+    clippings = [clipping async for clipping in sut.read()]
+
+    assert clippings
+
+
+def test_chunks_start_at_record_boundaries(make_big_file_object, monkeypatch):
+    monkeypatch.setattr(KindleClippingsReader, "CHUNK_SIZE", 1)
+    file = make_big_file_object(3)
+    sut = KindleClippingsReader(file)
+    content = file.getvalue()
+
+    chunks = [content[start:end] for start, end in sut._iter_chunks(content)]
+
+    assert b"".join(chunks) == content
+    assert len(chunks) == 3
+    assert all(chunk.startswith(b"Hexagonal Architecture") for chunk in chunks)
+
+
+async def test_fingerprint_covers_complete_records(make_file_object, make_sut):
+    complete = make_file_object(content="Complete").getvalue() + b"\n"
+    file = io.BytesIO(complete + b"Not finished record\n- Your Highlight")
+    sut = make_sut(file)
+
+    [clipping async for clipping in sut.read()]
+
+    fingerprint = sut.get_fingerprint()
+    assert fingerprint.size == len(complete)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+async def test_read_only_records_added_after_fingerprint(
+    parallel, make_file_object, make_sut, monkeypatch, process_pool
+):
+    old = make_file_object(content="Old").getvalue() + b"\n"
+    new = make_file_object(content="New").getvalue() + b"\n"
+    first_reader = make_sut(io.BytesIO(old))
+    [clipping async for clipping in first_reader.read()]
+    if parallel:
+        monkeypatch.setattr(KindleClippingsReader, "PARALLEL_MIN_SIZE", 0)
+    sut = KindleClippingsReader(io.BytesIO(old + new), process_pool=process_pool)
+
+    skipped = await sut.skip_imported(first_reader.get_fingerprint())
+    clippings = [clipping async for clipping in sut.read()]
+
+    assert skipped is True
+    assert [clipping.content for clipping in clippings] == ["New"]
+    assert sut.get_fingerprint().size == len(old + new)
+
+
+async def test_read_whole_file_if_beginning_is_changed(make_file_object, make_sut):
+    old = make_file_object(content="Old").getvalue() + b"\n"
+    new = make_file_object(content="New").getvalue() + b"\n"
+    first_reader = make_sut(io.BytesIO(old))
+    [clipping async for clipping in first_reader.read()]
+    sut = make_sut(io.BytesIO(new + old))
+
+    skipped = await sut.skip_imported(first_reader.get_fingerprint())
+    clippings = [clipping async for clipping in sut.read()]
+
+    assert skipped is False
+    assert [clipping.content for clipping in clippings] == ["New", "Old"]
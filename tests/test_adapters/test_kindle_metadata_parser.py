@@ -0,0 +1,115 @@
+from pathlib import Path
+
+import pytest
+
+from clippings.books.adapters.kindle_parser.language import presets
+from clippings.books.adapters.kindle_parser.parser import (
+    CompiledKindleClippingMetadataParser,
+    KindleClippingMetadataParser,
+)
+from clippings.seedwork.exceptions import DomainError
+
+
+def _example_metadata_lines() -> list[str]:
+    fixture = Path(__file__).parent / "my_clippings_languages_examples.txt"
+    with open(fixture, encoding="utf-8-sig") as file:
+        return [line.strip() for line in file if line.startswith("- ")]
+
+
+@pytest.mark.parametrize(
+    "metadata",
+    [
+        *_example_metadata_lines(),
+        "- Your Highlight at location 1300-1301 | Added on Thursday, 22 August 2024",
+        "- Your Highlight on page 5 | Added on Monday, March 3, 2023 1:02:03 AM",
+        "- Your Note on page 1 | location 1 | ",
+    ],
+)
+def test_compiled_parser_gives_same_results_as_reference(metadata):
+    reference = KindleClippingMetadataParser(presets)
+    sut = CompiledKindleClippingMetadataParser(presets)
+
+    result = sut.parse(metadata)
+
+    assert result == reference.parse(metadata)
+
+
+@pytest.mark.parametrize(
+    "metadata",
+    [
+        "- Unknown clipping type on page 1 | location 1 | ",
+        "- Your Highlight on page one | location 1 | ",
+    ],
+)
+def test_compiled_parser_returns_error_for_invalid_metadata(metadata):
+    sut = CompiledKindleClippingMetadataParser(presets)
+
+    result = sut.parse(metadata)
+
+    assert isinstance(result, DomainError)
+
+
+def test_compiled_parser_returns_copy_of_cached_result():
+    sut = CompiledKindleClippingMetadataParser(presets)
+    metadata = "- Your Highlight on page 1 | location 1 | "
+    first = sut.parse(metadata)
+    first["type"] = "changed"
+
+    second = sut.parse(metadata)
+
+    assert second["type"] == "highlight"
+
+
+ENGLISH_METADATA = (
+    "- Your Highlight on page {page} | location 1300-1301"
+    " | Added on Thursday, 22 August 2024 18:10:53"
+)
+JAPANESE_METADATA = (
+    "- {page}ページ|位置No. 1300-1301のハイライト |作成日: 2024年8月22日木曜日 18:10:53"
+)
+
+
+@pytest.fixture()
+def make_sut(monkeypatch):
+    def _make_sut(detection_clippings: int = 3):
+        monkeypatch.setattr(
+            CompiledKindleClippingMetadataParser,
+            "LANGUAGE_DETECTION_CLIPPINGS",
+            detection_clippings,
+        )
+        return CompiledKindleClippingMetadataParser(presets)
+
+    return _make_sut
+
+
+def test_lock_language_after_detection(make_sut):
+    sut = make_sut(detection_clippings=3)
+
+    for page in range(2):
+        sut.parse(ENGLISH_METADATA.format(page=page))
+    assert sut.language is None
+    sut.parse(ENGLISH_METADATA.format(page=3))
+
+    assert sut.language == "English"
+
+
+def test_dont_lock_language_if_lines_are_in_different_languages(make_sut):
+    sut = make_sut(detection_clippings=3)
+
+    sut.parse(ENGLISH_METADATA.format(page=1))
+    sut.parse(ENGLISH_METADATA.format(page=2))
+    sut.parse(JAPANESE_METADATA.format(page=3))
+
+    assert sut.language is None
+
+
+def test_fallback_to_full_detection_if_cant_parse_in_locked_language(make_sut):
+    sut = make_sut(detection_clippings=1)
+    sut.parse(JAPANESE_METADATA.format(page=1))
+    assert sut.language == "Japanese"
+
+    result = sut.parse(ENGLISH_METADATA.format(page=2))
+
+    assert result["type"] == "highlight"
+    assert result["page"] == (2, 2)
+    assert sut.language == "English"
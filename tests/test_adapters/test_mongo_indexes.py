@@ -0,0 +1,77 @@
+import pytest
+from pymongo import IndexModel
+
+from clippings.deps import MONGO_COLLECTIONS
+from clippings.utils.mongo import (
+    ensure_indexes,
+    find_indexes_drift,
+    winning_plan_stages,
+)
+
+
+class Spec:
+    COLLECTION_NAME = "indexed"
+    INDEXES = [IndexModel([("user_id", 1), ("id", 1)], name="uid_id", unique=True)]
+
+
+async def test_no_drift_after_ensure_indexes(mongo_db):
+    await ensure_indexes(mongo_db, MONGO_COLLECTIONS)
+
+    result = await find_indexes_drift(mongo_db, MONGO_COLLECTIONS)
+
+    assert result == []
+
+
+async def test_ensure_indexes_is_idempotent(mongo_db):
+    await ensure_indexes(mongo_db, [Spec])
+    await ensure_indexes(mongo_db, [Spec])
+
+    indexes = await mongo_db["indexed"].index_information()
+
+    assert set(indexes) == {"_id_", "uid_id"}
+
+
+async def test_report_missing_index(mongo_db):
+    result = await find_indexes_drift(mongo_db, [Spec])
+
+    assert result == ["indexed: index uid_id is missing"]
+
+
+async def test_report_index_with_different_options(mongo_db):
+    await mongo_db["indexed"].create_index([("user_id", 1), ("id", 1)], name="other")
+
+    result = await find_indexes_drift(mongo_db, [Spec])
+
+    assert result == ["indexed: index other has unique=None, expected True"]
+
+
+@pytest.mark.parametrize(
+    "winning_plan,expected",
+    [
+        ({"stage": "COLLSCAN"}, ["COLLSCAN"]),
+        (
+            {
+                "stage": "LIMIT",
+                "inputStage": {
+                    "stage": "FETCH",
+                    "inputStage": {"stage": "IXSCAN", "indexName": "user_id_title_id"},
+                },
+            },
+            ["LIMIT", "FETCH", "IXSCAN(user_id_title_id)"],
+        ),
+        (
+            {
+                "queryPlan": {
+                    "stage": "SORT",
+                    "inputStages": [{"stage": "COLLSCAN"}],
+                },
+                "slotBasedPlan": {},
+            },
+            ["SORT", "COLLSCAN"],
+        ),
+    ],
+)
+def test_winning_plan_stages(winning_plan, expected):
+    result = winning_plan_stages({"queryPlanner": {"winningPlan": winning_plan}})
+
+    assert result == expected
@@ -0,0 +1,54 @@
+from uuid import uuid4
+
+import pytest
+from prometheus_client import REGISTRY
+from pymongo.monitoring import (
+    ConnectionCheckedInEvent,
+    ConnectionCheckedOutEvent,
+    ConnectionCheckOutFailedEvent,
+    ConnectionClosedEvent,
+    ConnectionCreatedEvent,
+    PoolCreatedEvent,
+)
+
+from clippings.utils.mongo import PoolMetricsListener
+
+
+@pytest.fixture()
+def address():
+    return (f"mongo-{uuid4().hex}", 27017)
+
+
+@pytest.fixture()
+def get_metric(address):
+    def _get_metric(name: str, **labels: str) -> float | None:
+        labels = {"address": f"{address[0]}:{address[1]}", **labels}
+        return REGISTRY.get_sample_value(name, labels)
+
+    return _get_metric
+
+
+def test_track_open_and_checked_out_connections(address, get_metric):
+    sut = PoolMetricsListener()
+
+    sut.pool_created(PoolCreatedEvent(address, {"maxPoolSize": 50}))
+    sut.connection_created(ConnectionCreatedEvent(address, 1))
+    sut.connection_created(ConnectionCreatedEvent(address, 2))
+    sut.connection_checked_out(ConnectionCheckedOutEvent(address, 1, 0.1))
+    sut.connection_checked_out(ConnectionCheckedOutEvent(address, 2, 0.1))
+    sut.connection_checked_in(ConnectionCheckedInEvent(address, 2))
+    sut.connection_closed(ConnectionClosedEvent(address, 2, "idle"))
+
+    assert get_metric("mongo_pool_max_size") == 50
+    assert get_metric("mongo_pool_connections") == 1
+    assert get_metric("mongo_pool_checked_out_connections") == 1
+
+
+def test_count_checkout_failures(address, get_metric):
+    sut = PoolMetricsListener()
+
+    sut.connection_check_out_failed(
+        ConnectionCheckOutFailedEvent(address, "timeout", 5.0)
+    )
+
+    assert get_metric("mongo_pool_checkout_failures_total", reason="timeout") == 1
@@ -71,6 +71,98 @@ class TestAddClippings:
         assert added_count == 0
         assert book.clippings == clippings
 
+    @pytest.mark.parametrize("new_pages", [[4], [6, 2, 4, 0, 8, 10, 12]])
+    def test_merge_new_clippings_in_reading_order(self, new_pages, mother):
+        book = mother.book(
+            clippings=[
+                mother.clipping(id=f"old{page}", page=(page, page))
+                for page in range(1, 31, 2)
+            ]
+        )
+        new_clippings = [
+            mother.clipping(id=f"new{page}", page=(page, page)) for page in new_pages
+        ]
+
+        added_count = book.add_clippings(new_clippings)
+
+        assert added_count == len(new_pages)
+        pages = [clipping.page[0] for clipping in book.clippings]
+        assert pages == sorted(pages)
+        assert len(pages) == 15 + len(new_pages)
+
+    @pytest.mark.parametrize("new_pages", [[4], [6, 2, 4, 0, 8, 10, 12]])
+    def test_sort_all_clippings_if_book_clippings_are_out_of_order(
+        self, new_pages, mother
+    ):
+        book = mother.book(
+            clippings=[
+                mother.clipping(id=f"old{page}", page=(page, page))
+                for page in [*range(31, 1, -2), 1]
+            ]
+        )
+        new_clippings = [
+            mother.clipping(id=f"new{page}", page=(page, page)) for page in new_pages
+        ]
+
+        book.add_clippings(new_clippings)
+
+        pages = [clipping.page[0] for clipping in book.clippings]
+        assert pages == sorted(pages)
+
+    def test_sort_all_clippings_if_note_is_before_highlight_at_same_position(
+        self, mother
+    ):
+        book = mother.book(
+            clippings=[
+                mother.clipping(id="note", type=ClippingType.NOTE),
+                mother.clipping(id="hl", type=ClippingType.HIGHLIGHT),
+                *[mother.clipping(id=f"{i}", page=(i, i)) for i in range(2, 40)],
+            ]
+        )
+
+        book.add_clippings([mother.clipping(id="new", page=(50, 50))])
+
+        assert [clipping.id for clipping in book.clippings[:2]] == ["hl", "note"]
+        assert book.clippings[-1].id == "new"
+
+    def test_new_highlight_goes_before_note_with_same_position(self, mother):
+        note = mother.clipping(id="note", type=ClippingType.NOTE)
+        book = mother.book(clippings=[note])
+
+        book.add_clippings([mother.clipping(id="hl", type=ClippingType.HIGHLIGHT)])
+
+        assert [clipping.id for clipping in book.clippings] == ["hl", "note"]
+
+    def test_dont_add_clipping_appended_to_list_directly(self, mother):
+        book = mother.book(clippings=[mother.clipping(id="1")])
+        book.add_clippings([])
+        book.clippings.append(mother.clipping(id="2"))
+
+        added_count = book.add_clippings([mother.clipping(id="2")])
+
+        assert added_count == 0
+
+    def test_add_removed_clipping_again(self, mother):
+        clipping = mother.clipping(id="1")
+        book = mother.book(clippings=[clipping])
+        book.add_clippings([])
+        book.remove_clipping(clipping)
+
+        added_count = book.add_clippings([mother.clipping(id="1")])
+
+        assert added_count == 1
+
+    def test_add_clipping_again_after_inline_note_made_from_it_is_removed(self, mother):
+        inline_note = mother.inline_note(original_id="note")
+        clipping = mother.clipping(id="1", inline_notes=[inline_note])
+        book = mother.book(clippings=[clipping])
+        book.add_clippings([])
+        clipping.remove_inline_note(inline_note)
+
+        added_count = book.add_clippings([mother.clipping(id="note")])
+
+        assert added_count == 1
+
 
 @pytest.mark.parametrize(
     "highlight_page,highlight_loc,note_page,note_loc",
@@ -134,6 +226,30 @@ def test_link_note_that_has_position_relevant_to_highlight(
     assert clipping.inline_notes[0].id != "2"
 
 
+def test_add_and_link_clippings(mother):
+    book = mother.book(
+        clippings=[
+            mother.clipping(id="1", page=(1, 1), type=ClippingType.HIGHLIGHT),
+            mother.clipping(id="3", page=(3, 3), type=ClippingType.NOTE),
+        ]
+    )
+    new_clippings = [
+        mother.clipping(id="2", page=(1, 1), type=ClippingType.NOTE),
+        mother.clipping(id="4", page=(3, 3), type=ClippingType.HIGHLIGHT),
+        mother.clipping(id="5", page=(5, 5), type=ClippingType.NOTE),
+    ]
+
+    added_count = book.add_and_link_clippings(
+        new_clippings, inline_note_id_generator=inline_note_id_generator
+    )
+
+    assert added_count == 3
+    assert [clipping.id for clipping in book.clippings] == ["1", "4", "5"]
+    assert [note.original_id for note in book.clippings[0].inline_notes] == ["2"]
+    assert [note.original_id for note in book.clippings[1].inline_notes] == ["3"]
+    assert book.add_clippings([mother.clipping(id="2"), mother.clipping(id="3")]) == 0
+
+
 class TestUnlinkInlineNote:
     def test_return_error_if_cant_find_clipping(self, mother):
         inline_note = mother.inline_note(id="in:1", original_id="2")
@@ -189,9 +305,9 @@ class TestUnlinkInlineNote:
 
         result = book.unlink_inline_note(clipping_id="1", inline_note_id="in:1")
 
-        assert result is None
         assert len(book.clippings) == 3
         unlinked_note = book.get_clipping("42")
+        assert result is unlinked_note
         assert unlinked_note.type == ClippingType.UNLINKED_NOTE
         assert [cl.id for cl in book.clippings] == ["1", "42", "2"]
 
@@ -209,7 +325,7 @@ class TestUnlinkInlineNote:
         )
         book = mother.book(clippings=[clipping])
         result = book.unlink_inline_note(clipping_id="1", inline_note_id="in:1")
-        assert result is None
+        assert not isinstance(result, DomainError)
 
         # Act
         # Manually unlinked notes must stay unlinked
@@ -288,3 +404,86 @@ class TestValidation:
         )
 
         assert len(clipping.inline_notes) == CLIPPING_MAX_INLINE_NOTES
+
+
+def test_entities_have_no_instance_dict(mother):
+    inline_note = mother.inline_note()
+    clipping = mother.clipping(inline_notes=[inline_note])
+    book = mother.book(clippings=[clipping])
+
+    for entity in (book, book.meta, clipping, inline_note):
+        assert not hasattr(entity, "__dict__")
+
+
+class TestLookupIndex:
+    def test_get_clipping_after_list_was_changed_directly(self, mother):
+        book = mother.book(clippings=[mother.clipping(id="1"), mother.clipping(id="2")])
+        assert book.get_clipping_position("2") == 1
+
+        book.clippings.insert(0, mother.clipping(id="3"))
+
+        assert book.get_clipping_position("2") == 2
+        assert book.get_clipping("3") is book.clippings[0]
+
+    def test_get_clipping_after_removing(self, mother):
+        book = mother.book(clippings=[mother.clipping(id="1"), mother.clipping(id="2")])
+        assert book.get_clipping("1") is not None
+
+        book.remove_clipping(book.clippings[0])
+
+        assert book.get_clipping("1") is None
+        assert book.get_clipping_position("2") == 0
+
+    def test_get_clipping_after_adding_and_sorting(self, mother):
+        book = mother.book(clippings=[mother.clipping(id="1", page=(5, 5))])
+        assert book.get_clipping_position("1") == 0
+
+        book.add_clippings([mother.clipping(id="2", page=(1, 1))])
+
+        assert book.get_clipping_position("1") == 1
+        assert book.get_clipping_position("2") == 0
+
+    def test_get_inline_note_after_adding_and_removing(self, mother):
+        first_note = mother.inline_note(id="1")
+        clipping = mother.clipping(inline_notes=[first_note])
+        assert clipping.get_inline_note("1") is first_note
+
+        second_note = mother.inline_note(id="2")
+        clipping.add_inline_note(second_note)
+        clipping.remove_inline_note(first_note)
+
+        assert clipping.get_inline_note("1") is None
+        assert clipping.get_inline_note("2") is second_note
+
+    def test_index_is_not_part_of_equality(self, mother):
+        book = mother.book(clippings=[mother.clipping(id="1")])
+        other = mother.book(clippings=[mother.clipping(id="1")])
+
+        book.get_clipping("1")
+
+        assert book == other
+
+
+@pytest.mark.parametrize("new_clippings_count", [0, 1])
+def test_add_and_link_clippings_to_book_out_of_reading_order(
+    new_clippings_count, mother
+):
+    book = mother.book(
+        clippings=[
+            mother.clipping(id="note", page=(1, 1), type=ClippingType.NOTE),
+            *[mother.clipping(id=f"{i}", page=(i, i)) for i in range(40, 2, -1)],
+            mother.clipping(id="highlight", page=(1, 1)),
+        ]
+    )
+    new_clippings = [
+        mother.clipping(id=f"new{i}", page=(50, 50)) for i in range(new_clippings_count)
+    ]
+
+    book.add_and_link_clippings(
+        new_clippings, inline_note_id_generator=inline_note_id_generator
+    )
+
+    assert book.clippings[0].id == "highlight"
+    assert [note.original_id for note in book.clippings[0].inline_notes] == ["note"]
+    pages = [clipping.page[0] for clipping in book.clippings]
+    assert pages == sorted(pages)
@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 import pytest
 
 from clippings.books.use_cases.edit_book import AddInlineNoteUseCase
@@ -5,21 +7,25 @@ from clippings.seedwork.exceptions import DomainError
 
 
 @pytest.fixture()
-def make_sut(memory_book_storage):
+def make_sut(memory_book_storage, memory_book_patch_storage):
     def _make_sut(book_storage=memory_book_storage):
         return AddInlineNoteUseCase(
             book_storage=book_storage,
+            book_patch_storage=memory_book_patch_storage,
             inline_note_id_generator=lambda: "inline-note-id",
         )
 
     return _make_sut
 
 
-async def test_add_inline_note_to_clipping(make_sut, memory_book_storage, mother):
+async def test_add_inline_note_to_clipping(
+    make_sut, memory_book_storage, memory_book_patch_storage, mother
+):
     # Arrange
     clipping = mother.clipping(id="clipping-id")
     book = mother.book(id="book-id", clippings=[clipping])
     await memory_book_storage.add(book)
+    await memory_book_patch_storage.add(deepcopy(book))
     sut = make_sut()
 
     # Act
@@ -27,7 +33,7 @@ async def test_add_inline_note_to_clipping(make_sut, memory_book_storage, mother
 
     # Assert
     assert result is None
-    updated_book = await memory_book_storage.get("book-id")
+    updated_book = await memory_book_patch_storage.get("book-id")
     updated_clipping = updated_book.get_clipping("clipping-id")
     assert len(updated_clipping.inline_notes) == 1
     updated_inline_note = updated_clipping.get_inline_note("inline-note-id")
@@ -1,12 +1,16 @@
 import pytest
 
+from clippings.books.entities import ImportFingerprint
 from clippings.books.use_cases.edit_book import ClearDeletedHashesUseCase
 
 
 @pytest.fixture()
-def make_sut(memory_deleted_hash_storage):
+def make_sut(memory_deleted_hash_storage, memory_import_fingerprint_storage):
     def _make_sut():
-        return ClearDeletedHashesUseCase(memory_deleted_hash_storage)
+        return ClearDeletedHashesUseCase(
+            memory_deleted_hash_storage,
+            fingerprint_storage=memory_import_fingerprint_storage,
+        )
 
     return _make_sut
 
@@ -20,3 +24,14 @@ async def test_successfully_clear_deleted_hashes(
     await sut.execute()
 
     assert await memory_deleted_hash_storage.get_all() == []
+
+
+async def test_import_fingerprint_is_cleared(
+    make_sut, memory_import_fingerprint_storage
+):
+    await memory_import_fingerprint_storage.set(ImportFingerprint(size=1, hash="hash"))
+    sut = make_sut()
+
+    await sut.execute()
+
+    assert await memory_import_fingerprint_storage.get() is None
@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 import pytest
 
 from clippings.books.use_cases.edit_book import DeleteInlineNoteUseCase
@@ -5,16 +7,22 @@ from clippings.seedwork.exceptions import DomainError
 
 
 @pytest.fixture()
-def make_sut(memory_book_storage, memory_deleted_hash_storage):
+def make_sut(
+    memory_book_storage, memory_book_patch_storage, memory_deleted_hash_storage
+):
     def _make_sut(books_storage=memory_book_storage):
         return DeleteInlineNoteUseCase(
-            book_storage=books_storage, deleted_hash_storage=memory_deleted_hash_storage
+            book_storage=books_storage,
+            book_patch_storage=memory_book_patch_storage,
+            deleted_hash_storage=memory_deleted_hash_storage,
         )
 
     return _make_sut
 
 
-async def test_delete_inline_note(make_sut, memory_book_storage, mother):
+async def test_delete_inline_note(
+    make_sut, memory_book_storage, memory_book_patch_storage, mother
+):
     # Arrange
     inline_note = mother.inline_note(id="inline-note-id", content="Old inline note")
     clipping = mother.clipping(
@@ -22,6 +30,7 @@ async def test_delete_inline_note(make_sut, memory_book_storage, mother):
     )
     book = mother.book(id="book-id", clippings=[clipping])
     await memory_book_storage.add(book)
+    await memory_book_patch_storage.add(deepcopy(book))
     sut = make_sut()
 
     # Act
@@ -29,7 +38,7 @@ async def test_delete_inline_note(make_sut, memory_book_storage, mother):
 
     # Assert
     assert result is None
-    updated_book = await memory_book_storage.get("book-id")
+    updated_book = await memory_book_patch_storage.get("book-id")
     updated_clipping = updated_book.get_clipping("clipping-id")
     assert updated_clipping.get_inline_note("inline-note-id") is None
 
@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 import pytest
 
 from clippings.books.use_cases.edit_book import ClippingFieldsDTO, EditClippingUseCase
@@ -5,18 +7,23 @@ from clippings.seedwork.exceptions import DomainError
 
 
 @pytest.fixture()
-def make_sut(memory_book_storage):
+def make_sut(memory_book_storage, memory_book_patch_storage):
     def _make_sut(books_storage=memory_book_storage):
-        return EditClippingUseCase(book_storage=books_storage)
+        return EditClippingUseCase(
+            book_storage=books_storage, book_patch_storage=memory_book_patch_storage
+        )
 
     return _make_sut
 
 
-async def test_update_clipping_content(make_sut, memory_book_storage, mother):
+async def test_update_clipping_content(
+    make_sut, memory_book_storage, memory_book_patch_storage, mother
+):
     # Arrange
     clipping = mother.clipping(id="clipping-id", content="Old content")
     book = mother.book(id="book-id", clippings=[clipping])
     await memory_book_storage.add(book)
+    await memory_book_patch_storage.add(deepcopy(book))
     sut = make_sut()
     data = ClippingFieldsDTO(
         id="clipping-id", book_id="book-id", content="Updated content"
@@ -27,7 +34,7 @@ async def test_update_clipping_content(make_sut, memory_book_storage, mother):
 
     # Assert
     assert result is None
-    updated_book = await memory_book_storage.get("book-id")
+    updated_book = await memory_book_patch_storage.get("book-id")
     updated_clipping = updated_book.get_clipping("clipping-id")
     assert updated_clipping.content == "Updated content"
 
@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 import pytest
 
 from clippings.books.use_cases.edit_book import EditInlineNoteUseCase
@@ -5,19 +7,24 @@ from clippings.seedwork.exceptions import CantFindEntityError
 
 
 @pytest.fixture()
-def make_sut(memory_book_storage):
+def make_sut(memory_book_storage, memory_book_patch_storage):
     def _make_sut(books_storage=memory_book_storage):
-        return EditInlineNoteUseCase(book_storage=books_storage)
+        return EditInlineNoteUseCase(
+            book_storage=books_storage, book_patch_storage=memory_book_patch_storage
+        )
 
     return _make_sut
 
 
-async def test_update_inline_note_content(make_sut, memory_book_storage, mother):
+async def test_update_inline_note_content(
+    make_sut, memory_book_storage, memory_book_patch_storage, mother
+):
     # Arrange
     inline_note = mother.inline_note(id="inline-note-id", content="Old content")
     clipping = mother.clipping(id="clipping-id", inline_notes=[inline_note])
     book = mother.book(id="book-id", clippings=[clipping])
     await memory_book_storage.add(book)
+    await memory_book_patch_storage.add(deepcopy(book))
     sut = make_sut()
 
     # Act
@@ -27,7 +34,7 @@ async def test_update_inline_note_content(make_sut, memory_book_storage, mother)
 
     # Assert
     assert result is None
-    updated_book = await memory_book_storage.get("book-id")
+    updated_book = await memory_book_patch_storage.get("book-id")
     updated_clipping = updated_book.get_clipping("clipping-id")
     updated_inline_note = updated_clipping.get_inline_note("inline-note-id")
     assert updated_inline_note.content == "Updated content"
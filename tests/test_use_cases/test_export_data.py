@@ -8,9 +8,11 @@ from clippings.books.use_cases.export_data import ExportDataUseCase
 
 @pytest.fixture()
 def make_sut(memory_book_storage, memory_deleted_hash_storage):
-    def _make_sut():
+    def _make_sut(**kwargs):
         return ExportDataUseCase(
-            memory_book_storage, deleted_hash_storage=memory_deleted_hash_storage
+            memory_book_storage,
+            deleted_hash_storage=memory_deleted_hash_storage,
+            **kwargs,
         )
 
     return _make_sut
@@ -108,6 +110,20 @@ async def test_export_multiple_books(make_sut, memory_book_storage, mother):
     assert len(data) == 4  # 1 metadata + 3 books
 
 
+@pytest.mark.parametrize("batch_size", [1, 2, 3, 4])
+async def test_export_books_in_batches(
+    batch_size, make_sut, memory_book_storage, mother
+):
+    sut = make_sut(batch_size=batch_size)
+    books = [mother.book(id=f"book_id_{i}", title="Same Title") for i in range(3)]
+    await memory_book_storage.extend(books)
+
+    result = await sut.execute()
+    data = [json.loads(item) async for item in result.iterator]
+
+    assert [item["id"] for item in data[1:]] == ["book_id_0", "book_id_1", "book_id_2"]
+
+
 async def test_exported_data_must_be_delimited_by_newline(
     make_sut, memory_book_storage, mother
 ):
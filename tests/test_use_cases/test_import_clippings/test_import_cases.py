@@ -7,10 +7,13 @@ from unittest.mock import ANY
 import pytest
 
 from clippings.books.adapters.id_generators import (
+    book_id_generator,
     clipping_id_generator,
     inline_note_id_generator,
 )
+from clippings.books.adapters.locks import MemoryImportLock
 from clippings.books.entities import Book, BookMeta, Clipping, ClippingType
+from clippings.books.exceptions import ImportLockLostError
 from clippings.books.use_cases.import_clippings import (
     ImportClippingsUseCase,
     ImportedBookDTO,
@@ -37,6 +40,8 @@ def sut(
     memory_deleted_hash_storage,
     enrich_books_meta_service,
     memory_users_storage,
+    memory_import_fingerprint_storage,
+    memory_import_lock,
 ) -> ImportClippingsUseCase:
     return ImportClippingsUseCase(
         storage=memory_book_storage,
@@ -47,6 +52,8 @@ def sut(
         clipping_id_generator=clipping_id_generator,
         inline_note_id_generator=inline_note_id_generator,
         users_storage=memory_users_storage,
+        fingerprint_storage=memory_import_fingerprint_storage,
+        lock=memory_import_lock,
     )
 
 
@@ -232,3 +239,110 @@ async def test_no_new_clippings_should_not_update_books(
     updated_book = await memory_book_storage.get("1")
     assert len(updated_book.clippings) == 1  # No new clippings added
     assert result == []  # No new books or clippings to update
+
+
+@pytest.mark.parametrize(
+    "max_pending_clippings,commit_batch_size",
+    [(10_000, 100), (1, 1), (2, 1), (3, 2)],
+)
+async def test_import_in_batches_gives_same_result(
+    sut,
+    mother,
+    mock_clipping_reader,
+    memory_book_storage,
+    max_pending_clippings,
+    commit_batch_size,
+):
+    # Arrange
+    sut._book_id_generator = book_id_generator
+    sut.MAX_PENDING_CLIPPINGS = max_pending_clippings
+    sut.COMMIT_BATCH_SIZE = commit_batch_size
+    mock_clipping_reader.clippings = [
+        mother.clipping_import_candidate_dto(
+            book_title="Book A", location=(10, 22), content="Highlight A1"
+        ),
+        mother.clipping_import_candidate_dto(book_title="Book B", content="B1"),
+        mother.clipping_import_candidate_dto(
+            book_title="Book A",
+            location=(10, 22),
+            type=ClippingType.NOTE,
+            content="Note to A1",
+        ),
+        mother.clipping_import_candidate_dto(
+            book_title="Book A", location=(30, 40), content="Highlight A2"
+        ),
+    ]
+
+    # Act
+    result = await sut.execute(user_id="user:42")
+
+    # Assert
+    assert result == [
+        ImportedBookDTO(
+            title="Book A",
+            authors="The Author",
+            imported_clippings_count=3,
+            is_new=True,
+        ),
+        ImportedBookDTO(
+            title="Book B",
+            authors="The Author",
+            imported_clippings_count=1,
+            is_new=True,
+        ),
+    ]
+    books = {book.title: book for book in await memory_book_storage.find()}
+    assert [cl.content for cl in books["Book A"].clippings] == [
+        "Highlight A1",
+        "Highlight A2",
+    ]
+    inline_notes = books["Book A"].clippings[0].inline_notes
+    assert [note.content for note in inline_notes] == ["Note to A1"]
+    assert [cl.content for cl in books["Book B"].clippings] == ["B1"]
+
+
+async def test_import_commits_books_in_bounded_batches(
+    sut, mother, mock_clipping_reader, memory_book_storage
+):
+    # Arrange
+    sut._book_id_generator = book_id_generator
+    sut.MAX_PENDING_CLIPPINGS = 3
+    sut.COMMIT_BATCH_SIZE = 2
+    mock_clipping_reader.clippings = [
+        mother.clipping_import_candidate_dto(book_title=f"Book {i}") for i in range(7)
+    ]
+    extended = []
+    original_extend = memory_book_storage.extend
+
+    async def extend(books):
+        extended.append(len(books))
+        await original_extend(books)
+
+    memory_book_storage.extend = extend
+
+    # Act
+    await sut.execute(user_id="user:42")
+
+    # Assert
+    assert extended == [2, 1, 2, 1, 1]
+    assert len(await memory_book_storage.find()) == 7
+
+
+class LostImportLock(MemoryImportLock):
+    def check_held(self) -> None:
+        raise ImportLockLostError("Import lock is lost")
+
+
+async def test_nothing_is_written_if_lock_is_lost(
+    sut, mother, mock_clipping_reader, memory_book_storage
+):
+    # Arrange
+    sut._lock = LostImportLock({}, "user:42")
+    mock_clipping_reader.clippings = [mother.clipping_import_candidate_dto()]
+
+    # Act
+    with pytest.raises(ImportLockLostError):
+        await sut.execute(user_id="user:42")
+
+    # Assert
+    assert await memory_book_storage.find() == []
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import pytest
+
+from clippings.books.adapters.id_generators import (
+    book_id_generator,
+    clipping_id_generator,
+    inline_note_id_generator,
+)
+from clippings.books.dtos import BookDTO, ImportPreviewDTO
+from clippings.books.entities import ClippingType, DeletedHash, ImportFingerprint
+from clippings.books.use_cases.import_clippings import ImportClippingsUseCase
+
+pytestmark = pytest.mark.usefixtures("user")
+
+
+@pytest.fixture()
+def make_sut(
+    memory_book_storage,
+    mock_clipping_reader,
+    memory_deleted_hash_storage,
+    enrich_books_meta_service,
+    memory_users_storage,
+    memory_import_fingerprint_storage,
+    memory_import_lock,
+):
+    def _make_sut(
+        max_pending_clippings: int = ImportClippingsUseCase.MAX_PENDING_CLIPPINGS,
+        commit_batch_size: int = ImportClippingsUseCase.COMMIT_BATCH_SIZE,
+    ) -> ImportClippingsUseCase:
+        sut = ImportClippingsUseCase(
+            storage=memory_book_storage,
+            reader=mock_clipping_reader,
+            deleted_hash_storage=memory_deleted_hash_storage,
+            enrich_books_meta_service=enrich_books_meta_service,
+            book_id_generator=book_id_generator,
+            clipping_id_generator=clipping_id_generator,
+            inline_note_id_generator=inline_note_id_generator,
+            users_storage=memory_users_storage,
+            fingerprint_storage=memory_import_fingerprint_storage,
+            lock=memory_import_lock,
+        )
+        sut.MAX_PENDING_CLIPPINGS = max_pending_clippings
+        sut.COMMIT_BATCH_SIZE = commit_batch_size
+        return sut
+
+    return _make_sut
+
+
+@pytest.fixture()
+async def library(
+    mother, mock_clipping_reader, memory_book_storage, memory_deleted_hash_storage
+):
+    """
+    Stored "Book A" with one of its clippings, "Book C" deleted by the user,
+    and a file with clippings of books A, B and C.
+    """
+    book_a_id = book_id_generator(BookDTO(title="Book A", authors=["The Author"]))
+    book_c_id = book_id_generator(BookDTO(title="Book C", authors=["The Author"]))
+    stored = mother.clipping_import_candidate_dto(
+        book_title="Book A", location=(1, 2), content="Stored"
+    )
+    deleted = mother.clipping_import_candidate_dto(
+        book_title="Book A", location=(3, 4), content="Deleted"
+    )
+    await memory_book_storage.add(
+        mother.book(
+            id=book_a_id,
+            title="Book A",
+            clippings=[
+                mother.clipping(
+                    id=clipping_id_generator(stored),
+                    location=(1, 2),
+                    content="Stored",
+                )
+            ],
+        )
+    )
+    await memory_deleted_hash_storage.extend(
+        [
+            DeletedHash.from_ids(book_a_id, clipping_id_generator(deleted)),
+            DeletedHash.from_ids(book_c_id),
+        ]
+    )
+    mock_clipping_reader.clippings = [
+        stored,
+        deleted,
+        mother.clipping_import_candidate_dto(book_title="Book B", content="B1"),
+        mother.clipping_import_candidate_dto(
+            book_title="Book A", location=(5, 6), content="New"
+        ),
+        mother.clipping_import_candidate_dto(book_title="Book C", content="C1"),
+        mother.clipping_import_candidate_dto(
+            book_title="Book A",
+            location=(5, 6),
+            type=ClippingType.NOTE,
+            content="Note to new",
+        ),
+        mother.clipping_import_candidate_dto(
+            book_title="Book B", content="B1 again", location=(7, 8)
+        ),
+        mother.clipping_import_candidate_dto(
+            book_title="Book A", location=(5, 6), content="New"
+        ),
+    ]
+
+
+EXPECTED_PREVIEW = [
+    ImportPreviewDTO(
+        title="Book A",
+        authors="The Author",
+        is_new=False,
+        new_clippings_count=2,
+        deleted_clippings_count=1,
+        duplicate_clippings_count=2,
+        linked_notes_count=1,
+    ),
+    ImportPreviewDTO(
+        title="Book B",
+        authors="The Author",
+        is_new=True,
+        new_clippings_count=2,
+    ),
+    ImportPreviewDTO(
+        title="Book C",
+        authors="The Author",
+        is_new=False,
+        deleted_clippings_count=1,
+    ),
+]
+
+
+@pytest.mark.usefixtures("library")
+@pytest.mark.parametrize(
+    "max_pending_clippings,commit_batch_size",
+    [(10_000, 100), (1, 1), (3, 2)],
+)
+async def test_preview_counts_clippings_per_book(
+    make_sut, max_pending_clippings, commit_batch_size
+):
+    # Arrange
+    sut = make_sut(max_pending_clippings, commit_batch_size)
+
+    # Act
+    result = await sut.preview(user_id="user:42")
+
+    # Assert
+    assert sorted(result, key=lambda item: item.title) == EXPECTED_PREVIEW
+
+
+@pytest.mark.usefixtures("library")
+async def test_preview_doesnt_write_anything(
+    make_sut, memory_book_storage, memory_import_fingerprint_storage
+):
+    # Arrange
+    books_before = await memory_book_storage.find()
+    sut = make_sut(max_pending_clippings=1, commit_batch_size=1)
+
+    # Act
+    await sut.preview(user_id="user:42")
+
+    # Assert
+    assert await memory_book_storage.find() == books_before
+    assert len(books_before[0].clippings) == 1
+    assert await memory_import_fingerprint_storage.get() is None
+
+
+@pytest.mark.usefixtures("library")
+async def test_import_adds_what_preview_shows(make_sut):
+    # Arrange
+    preview = await make_sut().preview(user_id="user:42")
+
+    # Act
+    result = await make_sut().execute(user_id="user:42")
+
+    # Assert
+    assert [(item.title, item.imported_clippings_count) for item in result] == [
+        (item.title, item.new_clippings_count)
+        for item in preview
+        if item.new_clippings_count
+    ]
+
+
+async def test_preview_uses_fingerprint_of_previous_import(
+    make_sut, mock_clipping_reader, memory_import_fingerprint_storage
+):
+    # Arrange
+    fingerprint = ImportFingerprint(size=10, hash="hash")
+    await memory_import_fingerprint_storage.set(fingerprint)
+    skipped_with = []
+
+    async def skip_imported(fingerprint):
+        skipped_with.append(fingerprint)
+        return True
+
+    mock_clipping_reader.skip_imported = skip_imported
+
+    # Act
+    await make_sut().preview(user_id="user:42")
+
+    # Assert
+    assert skipped_with == [fingerprint]
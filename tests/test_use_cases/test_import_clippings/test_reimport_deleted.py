@@ -23,6 +23,8 @@ def import_clippings_use_case(
     memory_deleted_hash_storage,
     enrich_books_meta_service,
     memory_users_storage,
+    memory_import_fingerprint_storage,
+    memory_import_lock,
 ) -> ImportClippingsUseCase:
     return ImportClippingsUseCase(
         storage=memory_book_storage,
@@ -33,6 +35,8 @@ def import_clippings_use_case(
         clipping_id_generator=clipping_id_generator,
         inline_note_id_generator=inline_note_id_generator,
         users_storage=memory_users_storage,
+        fingerprint_storage=memory_import_fingerprint_storage,
+        lock=memory_import_lock,
     )
 
 
@@ -48,6 +52,7 @@ def delete_book_use_case(memory_book_storage, memory_deleted_hash_storage):
 def delete_clipping_use_case(memory_book_storage, memory_deleted_hash_storage):
     return DeleteClippingUseCase(
         book_storage=memory_book_storage,
+        book_patch_storage=memory_book_storage,
         deleted_hash_storage=memory_deleted_hash_storage,
     )
 
@@ -56,6 +61,7 @@ def delete_clipping_use_case(memory_book_storage, memory_deleted_hash_storage):
 def delete_inline_note_use_case(memory_book_storage, memory_deleted_hash_storage):
     return DeleteInlineNoteUseCase(
         book_storage=memory_book_storage,
+        book_patch_storage=memory_book_storage,
         deleted_hash_storage=memory_deleted_hash_storage,
     )
 
@@ -206,3 +212,36 @@ async def test_reimporting_deleted_inline_note_which_deleted_with_clipping_does_
     all_books = await memory_book_storage.find()
     assert len(all_books) == 1
     assert not all_books[0].clippings
+
+
+async def test_deleted_clippings_are_filtered_in_every_batch(
+    import_clippings_use_case,
+    mock_clipping_reader,
+    memory_book_storage,
+    memory_deleted_hash_storage,
+    mother,
+    monkeypatch,
+):
+    # Arrange
+    monkeypatch.setattr(import_clippings_use_case, "DELETED_HASHES_BATCH_SIZE", 2)
+    mock_clipping_reader.clippings = [
+        mother.clipping_import_candidate_dto(content=f"Content {i}", page=(i, i))
+        for i in range(5)
+    ]
+    await import_clippings_use_case.execute(user_id="user:42")
+    (book,) = await memory_book_storage.find()
+    deleted_ids = [book.clippings[i].id for i in (1, 2, 4)]
+    await memory_book_storage.remove(book)
+    await memory_deleted_hash_storage.extend(
+        [mother.deleted_hash(id=f"{book.id}:{cl_id}") for cl_id in deleted_ids]
+    )
+
+    # Act
+    await import_clippings_use_case.execute(user_id="user:42")
+
+    # Assert
+    (book,) = await memory_book_storage.find()
+    assert [clipping.content for clipping in book.clippings] == [
+        "Content 0",
+        "Content 3",
+    ]
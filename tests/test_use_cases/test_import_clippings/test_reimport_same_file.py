@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import io
+
+import pytest
+
+from clippings.books.adapters.id_generators import (
+    book_id_generator,
+    clipping_id_generator,
+    inline_note_id_generator,
+)
+from clippings.books.adapters.readers import KindleClippingsReader
+from clippings.books.use_cases.import_clippings import ImportClippingsUseCase
+
+pytestmark = pytest.mark.usefixtures("user")
+
+
+def make_clippings_file(*titles: str) -> bytes:
+    return "".join(
+        f"{title} (The Author)\n"
+        "- Your Highlight on page 1 | location 10-22"
+        " | Added on Thursday, 22 August 2024 18:10:53\n\n"
+        f"Highlight from {title}\n==========\n"
+        for title in titles
+    ).encode("utf-8")
+
+
+@pytest.fixture()
+def make_sut(
+    memory_book_storage,
+    memory_deleted_hash_storage,
+    enrich_books_meta_service,
+    memory_users_storage,
+    memory_import_fingerprint_storage,
+    memory_import_lock,
+):
+    def _make_sut(content: bytes) -> ImportClippingsUseCase:
+        return ImportClippingsUseCase(
+            storage=memory_book_storage,
+            reader=KindleClippingsReader(io.BytesIO(content)),
+            deleted_hash_storage=memory_deleted_hash_storage,
+            enrich_books_meta_service=enrich_books_meta_service,
+            book_id_generator=book_id_generator,
+            clipping_id_generator=clipping_id_generator,
+            inline_note_id_generator=inline_note_id_generator,
+            users_storage=memory_users_storage,
+            fingerprint_storage=memory_import_fingerprint_storage,
+            lock=memory_import_lock,
+        )
+
+    return _make_sut
+
+
+async def test_reimport_reads_only_appended_clippings(make_sut):
+    # Arrange
+    await make_sut(make_clippings_file("Book 1")).execute(user_id="user:42")
+    sut = make_sut(make_clippings_file("Book 1", "Book 2"))
+
+    # Act
+    result = await sut.execute(user_id="user:42")
+
+    # Assert
+    assert [item.title for item in result] == ["Book 2"]
+
+
+async def test_reimport_of_same_file_reads_nothing(
+    make_sut, memory_book_storage, memory_import_fingerprint_storage
+):
+    # Arrange
+    content = make_clippings_file("Book 1")
+    await make_sut(content).execute(user_id="user:42")
+    fingerprint = await memory_import_fingerprint_storage.get()
+    memory_book_storage.books.clear()
+
+    # Act
+    result = await make_sut(content).execute(user_id="user:42")
+
+    # Assert
+    assert result == []
+    assert await memory_book_storage.find() == []
+    assert await memory_import_fingerprint_storage.get() == fingerprint
+
+
+async def test_changed_file_is_imported_from_beginning(make_sut, memory_book_storage):
+    # Arrange
+    await make_sut(make_clippings_file("Book 1")).execute(user_id="user:42")
+    memory_book_storage.books.clear()
+    sut = make_sut(make_clippings_file("Book 2", "Book 1"))
+
+    # Act
+    result = await sut.execute(user_id="user:42")
+
+    # Assert
+    assert [item.title for item in result] == ["Book 2", "Book 1"]
+
+
+async def test_concurrent_imports_of_same_file_are_serialized(
+    make_sut, memory_book_storage
+):
+    # Arrange
+    content = make_clippings_file("Book 1", "Book 2")
+
+    # Act
+    results = await asyncio.gather(
+        make_sut(content).execute(user_id="user:42"),
+        make_sut(content).execute(user_id="user:42"),
+    )
+
+    # Assert
+    assert [[item.title for item in result] for result in results] == [
+        ["Book 1", "Book 2"],
+        [],
+    ]
+    books = await memory_book_storage.find()
+    assert [len(book.clippings) for book in books] == [1, 1]
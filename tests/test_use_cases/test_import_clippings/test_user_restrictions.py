@@ -16,6 +16,8 @@ def sut(
     memory_deleted_hash_storage,
     enrich_books_meta_service,
     memory_users_storage,
+    memory_import_fingerprint_storage,
+    memory_import_lock,
 ) -> ImportClippingsUseCase:
     return ImportClippingsUseCase(
         storage=memory_book_storage,
@@ -26,6 +28,8 @@ def sut(
         clipping_id_generator=id_generators.clipping_id_generator,
         inline_note_id_generator=id_generators.inline_note_id_generator,
         users_storage=memory_users_storage,
+        fingerprint_storage=memory_import_fingerprint_storage,
+        lock=memory_import_lock,
     )
 
 
@@ -85,6 +89,25 @@ async def test_cant_import_more_books_than_limit_when_user_already_has_books(
     assert exc.value.trying_to_add == 1
 
 
+async def test_books_limit_counts_all_books_of_user(
+    sut, mother, mock_clipping_reader, memory_book_storage, memory_users_storage
+):
+    await memory_users_storage.add(mother.user(id="user_id_1", max_books=12))
+    await memory_book_storage.extend(
+        [mother.book(id=f"book_id_{i}", title=f"The Book {i}") for i in range(11)]
+    )
+    mock_clipping_reader.clippings = [
+        mother.clipping_import_candidate_dto(book_title=f"New Book {i}")
+        for i in range(2)
+    ]
+
+    with pytest.raises(QuotaExceededError) as exc:
+        await sut.execute(user_id="user_id_1")
+
+    assert exc.value.quota_type == "books"
+    assert exc.value.trying_to_add == 2
+
+
 async def test_cant_import_more_clippings_than_limit_when_user_has_0_books(
     sut, mother, mock_clipping_reader, memory_users_storage
 ):
@@ -154,3 +177,44 @@ async def test_cant_import_more_clippings_than_limit_when_user_already_has_clipp
     assert exc.value.quota_type == "clippings"
     assert exc.value.current_quota == 3
     assert exc.value.trying_to_add == 1
+
+
+async def test_nothing_is_imported_if_books_limit_is_exceeded_in_later_batch(
+    sut, mother, mock_clipping_reader, memory_book_storage, memory_users_storage
+):
+    sut.COMMIT_BATCH_SIZE = 1
+    await memory_users_storage.add(mother.user(id="user_id_1", max_books=3))
+    mock_clipping_reader.clippings = [
+        mother.clipping_import_candidate_dto(book_title=f"The Book {i}")
+        for i in range(4)
+    ]
+
+    with pytest.raises(QuotaExceededError) as exc:
+        await sut.execute(user_id="user_id_1")
+
+    assert exc.value.quota_type == "books"
+    assert exc.value.trying_to_add == 4
+    assert await memory_book_storage.find() == []
+
+
+async def test_nothing_is_imported_if_clippings_limit_is_exceeded_in_later_batch(
+    sut, mother, mock_clipping_reader, memory_book_storage, memory_users_storage
+):
+    sut.COMMIT_BATCH_SIZE = 1
+    await memory_users_storage.add(
+        mother.user(id="user_id_1", max_clippings_per_book=2)
+    )
+    mock_clipping_reader.clippings = [
+        mother.clipping_import_candidate_dto(book_title="The Book 1", page=(1, 1)),
+        *[
+            mother.clipping_import_candidate_dto(book_title="The Book 2", page=(i, i))
+            for i in range(3)
+        ],
+    ]
+
+    with pytest.raises(QuotaExceededError) as exc:
+        await sut.execute(user_id="user_id_1")
+
+    assert exc.value.quota_type == "clippings"
+    assert exc.value.extra["book_title"] == "The Book 2"
+    assert await memory_book_storage.find() == []
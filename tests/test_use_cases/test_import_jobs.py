@@ -0,0 +1,257 @@
+import asyncio
+import io
+from datetime import datetime
+
+import pytest
+
+from clippings.books.adapters.storages import MemoryImportJobsStorage
+from clippings.books.dtos import ImportedBookDTO
+from clippings.books.entities import ImportJob, ImportJobStatus, ImportStage
+from clippings.books.services import ImportJobsRunner
+from clippings.seedwork.exceptions import DomainError
+
+
+@pytest.fixture()
+def storage():
+    return MemoryImportJobsStorage({})
+
+
+@pytest.fixture()
+async def make_sut(storage):
+    runners = []
+
+    def _make_sut(**kwargs):
+        runner = ImportJobsRunner(storage, **kwargs)
+        runners.append(runner)
+        return runner
+
+    yield _make_sut
+    for runner in runners:
+        await runner.stop()
+
+
+def make_job(job_id="job1", user_id="user:1"):
+    now = datetime.now()
+    return ImportJob(
+        id=job_id,
+        user_id=user_id,
+        status=ImportJobStatus.QUEUED,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+async def test_job_is_finished_with_result_and_progress(make_sut, storage):
+    # Arrange
+    sut = make_sut()
+    sut.start()
+    imported = [
+        ImportedBookDTO(
+            title="Book", authors="Author", imported_clippings_count=2, is_new=True
+        )
+    ]
+
+    async def run(progress_listener):
+        await progress_listener(ImportStage.PARSE, 2)
+        await progress_listener(ImportStage.WRITE, 1, 1)
+        return imported
+
+    # Act
+    error = await sut.submit(make_job(), run)
+    await sut.join()
+
+    # Assert
+    assert error is None
+    job = await storage.get("job1")
+    assert job.status is ImportJobStatus.DONE
+    assert job.result == imported
+    assert job.finished_at is not None
+    assert job.get_stage(ImportStage.PARSE).done == 2
+    assert job.get_stage(ImportStage.WRITE).total == 1
+
+
+async def test_job_is_saved_as_queued_before_it_runs(make_sut, storage):
+    # Arrange
+    sut = make_sut()
+
+    async def run(progress_listener):
+        return []
+
+    # Act
+    await sut.submit(make_job(), run)
+
+    # Assert
+    job = await storage.get("job1")
+    assert job.status is ImportJobStatus.QUEUED
+
+
+@pytest.mark.parametrize(
+    "exception,expected_error",
+    [
+        (DomainError("Too many books"), "Too many books"),
+        (RuntimeError("Boom"), "Something went wrong while importing clippings"),
+    ],
+)
+async def test_job_is_failed_when_run_raises(
+    make_sut, storage, exception, expected_error
+):
+    # Arrange
+    sut = make_sut()
+    sut.start()
+
+    async def run(progress_listener):
+        raise exception
+
+    # Act
+    await sut.submit(make_job(), run)
+    await sut.join()
+
+    # Assert
+    job = await storage.get("job1")
+    assert job.status is ImportJobStatus.FAILED
+    assert job.error == expected_error
+
+
+async def test_return_error_when_queue_is_full(make_sut, storage):
+    # Arrange
+    sut = make_sut(max_queued_jobs=1)
+    await sut.submit(make_job("job1"), lambda progress_listener: asyncio.sleep(0))
+
+    # Act
+    error = await sut.submit(
+        make_job("job2"), lambda progress_listener: asyncio.sleep(0)
+    )
+
+    # Assert
+    assert isinstance(error, DomainError)
+    assert await storage.get("job2") is None
+
+
+async def test_worker_keeps_running_jobs_if_job_cant_be_saved(make_sut, storage):
+    # Arrange
+    original_save = storage.save
+
+    async def save(job):
+        if job.id == "job1" and job.status is not ImportJobStatus.QUEUED:
+            raise RuntimeError("Storage is unavailable")
+        await original_save(job)
+
+    storage.save = save
+    sut = make_sut(workers_count=1)
+    sut.start()
+
+    async def run(progress_listener):
+        return []
+
+    # Act
+    await sut.submit(make_job("job1"), run)
+    await sut.submit(make_job("job2"), run)
+    await asyncio.wait_for(sut.join(), timeout=1)
+
+    # Assert
+    job = await storage.get("job2")
+    assert job.status is ImportJobStatus.DONE
+
+
+async def test_jobs_of_user_dont_block_workers_for_other_users(make_sut, storage):
+    # Arrange
+    sut = make_sut(workers_count=2)
+    sut.start()
+    started = []
+    release = asyncio.Event()
+
+    def make_run(job_id):
+        async def run(progress_listener):
+            started.append(job_id)
+            await release.wait()
+            return []
+
+        return run
+
+    # Act
+    await sut.submit(make_job("job1", user_id="user:1"), make_run("job1"))
+    await sut.submit(make_job("job2", user_id="user:1"), make_run("job2"))
+    await sut.submit(make_job("job3", user_id="user:2"), make_run("job3"))
+    await asyncio.sleep(0.01)
+    started_before_release = list(started)
+    release.set()
+    await asyncio.wait_for(sut.join(), timeout=1)
+
+    # Assert
+    assert started_before_release == ["job1", "job3"]
+    assert started == ["job1", "job3", "job2"]
+    job = await storage.get("job2")
+    assert job.status is ImportJobStatus.DONE
+
+
+async def test_resource_is_closed_after_job_is_run(make_sut):
+    # Arrange
+    sut = make_sut()
+    sut.start()
+    resource = io.BytesIO(b"data")
+    read = []
+
+    async def run(progress_listener):
+        read.append(resource.getvalue())
+        return []
+
+    # Act
+    await sut.submit(make_job(), run, resource=resource)
+    await asyncio.wait_for(sut.join(), timeout=1)
+
+    # Assert
+    assert read == [b"data"]
+    assert resource.closed
+
+
+async def test_resource_is_closed_when_job_cant_be_started(make_sut, storage):
+    # Arrange
+    original_save = storage.save
+
+    async def save(job):
+        if job.status is not ImportJobStatus.QUEUED:
+            raise RuntimeError("Storage is unavailable")
+        await original_save(job)
+
+    storage.save = save
+    sut = make_sut()
+    sut.start()
+    resource = io.BytesIO()
+
+    # Act
+    await sut.submit(make_job(), lambda progress_listener: [], resource=resource)
+    await asyncio.wait_for(sut.join(), timeout=1)
+
+    # Assert
+    assert resource.closed
+
+
+async def test_resource_is_closed_when_job_is_rejected(make_sut):
+    # Arrange
+    sut = make_sut(max_queued_jobs=0)
+    resource = io.BytesIO()
+
+    # Act
+    error = await sut.submit(
+        make_job(), lambda progress_listener: [], resource=resource
+    )
+
+    # Assert
+    assert isinstance(error, DomainError)
+    assert resource.closed
+
+
+async def test_resources_of_jobs_not_run_are_closed_on_stop(make_sut):
+    # Arrange
+    sut = make_sut()
+    queued = io.BytesIO()
+    waiting = io.BytesIO()
+    await sut.submit(make_job("job1"), lambda progress_listener: [], resource=queued)
+    await sut.submit(make_job("job2"), lambda progress_listener: [], resource=waiting)
+
+    # Act
+    await sut.stop()
+
+    # Assert
+    assert queued.closed
+    assert waiting.closed
@@ -6,8 +6,12 @@ from typing import TYPE_CHECKING
 
 import pytest
 
+from clippings.books.adapters.locks import MemoryImportLock
+from clippings.books.entities import ImportFingerprint
+from clippings.books.exceptions import ImportInProgressError
 from clippings.books.use_cases.restore_data import RestoreDataUseCase
 from clippings.seedwork.exceptions import DomainError
+from clippings.utils.streams import aiter_lines
 
 if TYPE_CHECKING:
     from io import BytesIO
@@ -22,13 +26,17 @@ def make_sut(
     memory_deleted_hash_storage,
     enrich_books_meta_service,
     memory_users_storage,
+    memory_import_fingerprint_storage,
+    memory_import_lock,
 ):
-    def _make_sut():
+    def _make_sut(lock=memory_import_lock):
         return RestoreDataUseCase(
             memory_book_storage,
             deleted_hash_storage=memory_deleted_hash_storage,
             enrich_books_meta_service=enrich_books_meta_service,
             users_storage=memory_users_storage,
+            fingerprint_storage=memory_import_fingerprint_storage,
+            lock=lock,
         )
 
     return _make_sut
@@ -49,6 +57,34 @@ async def test_can_restore_data(make_sut, backup):
     assert not isinstance(result, DomainError)
 
 
+async def test_can_restore_data_from_stream_of_chunks(
+    make_sut, backup, memory_book_storage
+):
+    content = backup.read()
+
+    async def stream():
+        for start in range(0, len(content), 1000):
+            yield content[start : start + 1000]
+
+    sut = make_sut()
+
+    result = await sut.execute(aiter_lines(stream()), user_id="user:42")
+
+    assert not isinstance(result, DomainError)
+    assert await memory_book_storage.count(memory_book_storage.FindQuery())
+
+
+async def test_import_fingerprint_is_cleared_when_books_are_restored(
+    make_sut, backup, memory_import_fingerprint_storage
+):
+    await memory_import_fingerprint_storage.set(ImportFingerprint(size=1, hash="hash"))
+    sut = make_sut()
+
+    await sut.execute(backup, user_id="user:42")
+
+    assert await memory_import_fingerprint_storage.get() is None
+
+
 @pytest.mark.parametrize(
     "data,error_substring",
     [
@@ -72,3 +108,16 @@ async def test_cant_restore_data_with_invalid_data(data, error_substring, make_s
 
     assert isinstance(result, DomainError)
     assert error_substring in str(result)
+
+
+async def test_restore_isnt_run_while_user_import_is_in_progress(
+    make_sut, backup, memory_book_storage
+):
+    locks_map = {}
+    sut = make_sut(lock=MemoryImportLock(locks_map, "user:42", timeout=0.01))
+
+    async with MemoryImportLock(locks_map, "user:42").hold():
+        result = await sut.execute(backup, user_id="user:42")
+
+    assert isinstance(result, ImportInProgressError)
+    assert await memory_book_storage.find() == []
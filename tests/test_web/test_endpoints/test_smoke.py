@@ -1,7 +1,10 @@
+import re
 from pathlib import Path
 
 import pytest
+from picodi.helpers import resolve
 
+from clippings.web.deps import get_import_jobs_runner
 from clippings.web.presenters.urls import urls_manager
 
 
@@ -37,7 +40,7 @@ async def test_home_page(client):
     [
         item.template
         for item in urls_manager
-        if item.method == "get" and item.id not in ("home_page", "logout")
+        if item.method == "get" and item.id not in ("home_page", "logout", "import_job")
     ],
 )
 async def test_get_endpoints(client, book_storage, mother, url_template):
@@ -81,10 +84,34 @@ async def test_import_clippings(client, book_storage, clippings_for_upload):
     response = await client.post(url, files={"file": clippings_for_upload})
 
     assert response.status_code == 200
+    with resolve(get_import_jobs_runner) as runner:
+        await runner.join()
     books = await book_storage.find()
     assert len(books) == 1
 
 
+async def test_import_clippings_preview(client, book_storage, clippings_for_upload):
+    url = urls_manager.build_url("clipping_upload_preview").value
+    response = await client.post(url, files={"file": clippings_for_upload})
+
+    assert response.status_code == 200
+    assert "Import preview" in response.text
+    assert await book_storage.find() == []
+
+
+async def test_import_job(client, clippings_for_upload):
+    url = urls_manager.build_url("clipping_upload").value
+    response = await client.post(url, files={"file": clippings_for_upload})
+    poll_url = re.search(r'hx-get="([^"]+)"', response.text).group(1)
+    with resolve(get_import_jobs_runner) as runner:
+        await runner.join()
+
+    response = await client.get(poll_url)
+
+    assert response.status_code == 200
+    assert "hx-get" not in response.text
+
+
 async def test_restore_data(client, book_storage, data_for_restore):
     url = urls_manager.build_url("clippings_restore").value
     response = await client.post(url, files={"file": data_for_restore})
@@ -94,6 +121,46 @@ async def test_restore_data(client, book_storage, data_for_restore):
     assert len(books) > 1
 
 
+@pytest.mark.parametrize(
+    "url_id", ["clipping_upload", "clipping_upload_preview", "clippings_restore"]
+)
+@pytest.mark.parametrize(
+    "form,expected",
+    [
+        ({"files": {"other": b"value"}}, "ERROR: No file provided"),
+        ({"data": {"file": "value"}, "files": {"x": b""}}, "ERROR: Is not a file"),
+        ({"data": {"file": "value"}}, "ERROR: Invalid form data"),
+    ],
+)
+async def test_upload_errors(client, url_id, form, expected):
+    url = urls_manager.build_url(url_id).value
+    response = await client.post(url, **form)
+
+    assert response.status_code == 200
+    assert response.text == expected
+
+
+@pytest.mark.parametrize(
+    "url_id", ["clipping_upload", "clipping_upload_preview", "clippings_restore"]
+)
+async def test_upload_with_truncated_body(client, url_id):
+    url = urls_manager.build_url(url_id).value
+    body = (
+        b"--boundary\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="file.txt"\r\n'
+        b"\r\n"
+        b"content without end of file"
+    )
+    response = await client.post(
+        url,
+        content=body,
+        headers={"Content-Type": "multipart/form-data; boundary=boundary"},
+    )
+
+    assert response.status_code == 200
+    assert response.text == "ERROR: Invalid form data"
+
+
 async def test_update_book_info(client, book_storage, mother):
     book = mother.book(id="book1")
     await book_storage.add(book)
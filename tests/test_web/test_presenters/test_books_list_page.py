@@ -4,7 +4,7 @@ import pytest
 
 from clippings.web.presenters.book.list_page import BooksListPagePresenter
 from clippings.web.presenters.dtos import PresenterResult
-from clippings.web.presenters.pagination import classic_pagination_calculator
+from clippings.web.presenters.pagination import cursor_pagination_calculator
 from clippings.web.presenters.urls import urls_manager
 
 
@@ -13,7 +13,7 @@ def make_sut(memory_book_storage):
     def _make_sut():
         return BooksListPagePresenter(
             storage=memory_book_storage,
-            pagination_calculator=classic_pagination_calculator,
+            pagination_calculator=cursor_pagination_calculator,
             urls_manager=urls_manager,
         )
 
@@ -38,6 +38,57 @@ async def test_present_books_list(make_sut, memory_book_storage, mother):
     assert isinstance(result.render(), str)
 
 
+async def test_next_page_link_contains_cursor(make_sut, memory_book_storage, mother):
+    sut = make_sut()
+    await memory_book_storage.extend(
+        [mother.book(id=f"book:{i}", title=f"Test Book {i}") for i in range(10)]
+    )
+    first_page = await sut.present(page=1, on_page=5)
+    next_page_url = first_page.data.pagination[1].url
+
+    result = await sut.present(
+        page=2, on_page=5, after=next_page_url.split("after=")[1]
+    )
+
+    assert "after=" in next_page_url
+    assert [book.name for book in result.data.books] == [
+        f"Test Book {i} by The Author" for i in range(5, 10)
+    ]
+
+
+@pytest.mark.parametrize(
+    "page,on_page,expected",
+    [(3, 5, range(10, 15)), (2, 3, range(3, 6))],
+)
+async def test_ignore_cursor_of_another_page(
+    make_sut, memory_book_storage, mother, page, on_page, expected
+):
+    sut = make_sut()
+    await memory_book_storage.extend(
+        [mother.book(id=f"book:{i:02}", title=f"Test Book {i:02}") for i in range(20)]
+    )
+    first_page = await sut.present(page=1, on_page=5)
+    cursor_of_second_page = first_page.data.pagination[1].url.split("after=")[1]
+
+    result = await sut.present(page=page, on_page=on_page, after=cursor_of_second_page)
+
+    assert [book.name for book in result.data.books] == [
+        f"Test Book {i:02} by The Author" for i in expected
+    ]
+
+
+async def test_ignore_invalid_cursor(make_sut, memory_book_storage, mother):
+    sut = make_sut()
+    await memory_book_storage.extend(
+        [mother.book(id=f"book:{i}", title=f"Test Book {i}") for i in range(10)]
+    )
+
+    result = await sut.present(page=2, on_page=5, after="not-a-cursor")
+
+    assert [book.rating for book in result.data.books] == ["-"] * 5
+    assert result.data.books[0].name == "Test Book 5 by The Author"
+
+
 async def test_present_clippings_on_books_list(make_sut, memory_book_storage, mother):
     sut = make_sut()
     await memory_book_storage.add(
@@ -0,0 +1,68 @@
+import pytest
+
+from clippings.web.presenters.dtos import PaginationDTO, PaginationItemDTO
+from clippings.web.presenters.pagination import (
+    cursor_pagination_calculator,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+@pytest.fixture()
+def make_sut():
+    def _make_sut():
+        return cursor_pagination_calculator
+
+    return _make_sut
+
+
+def test_add_cursor_to_next_page_link(make_sut):
+    sut = make_sut()
+
+    result = sut(
+        current_page=2,
+        total_items=25,
+        on_page=10,
+        books_page_url="/books",
+        next_page_cursor="cursor",
+    )
+
+    assert result == PaginationDTO(
+        current_page=2,
+        total_pages=3,
+        items=[
+            PaginationItemDTO(text="1", url="/books?page=1&on_page=10"),
+            PaginationItemDTO(text="2", url=None),
+            PaginationItemDTO(text="3", url="/books?page=3&on_page=10&after=cursor"),
+        ],
+    )
+
+
+def test_without_cursor_same_as_classic_pagination(make_sut):
+    sut = make_sut()
+
+    result = sut(current_page=1, total_items=25, on_page=10, books_page_url="/books")
+
+    assert [item.url for item in result.items] == [
+        None,
+        "/books?page=2&on_page=10",
+        "/books?page=3&on_page=10",
+    ]
+
+
+@pytest.mark.parametrize("title", ["Title", "Заголовок & ?=", ""])
+def test_decode_encoded_cursor(title):
+    cursor = encode_cursor(title, "book:id", 20)
+
+    result = decode_cursor(cursor)
+
+    assert result == (title, "book:id", 20)
+
+
+@pytest.mark.parametrize(
+    "cursor", ["", "not-a-cursor", encode_cursor("a", "b", 10)[:-2]]
+)
+def test_decode_invalid_cursor(cursor):
+    result = decode_cursor(cursor)
+
+    assert result is None
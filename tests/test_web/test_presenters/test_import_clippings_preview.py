@@ -0,0 +1,63 @@
+import pytest
+
+from clippings.books.dtos import ImportPreviewDTO
+from clippings.web.presenters.book.clippings_import_page import (
+    ImportClippingsPreviewPresenter,
+)
+
+
+@pytest.fixture()
+def make_sut():
+    def _make_sut():
+        return ImportClippingsPreviewPresenter()
+
+    return _make_sut
+
+
+async def test_present_with_non_empty_previews(make_sut):
+    # Arrange
+    sut = make_sut()
+    previews = [
+        ImportPreviewDTO(
+            title="Book 1", authors="Author 1", is_new=True, new_clippings_count=3
+        ),
+        ImportPreviewDTO(
+            title="Book 2",
+            authors="Author 2",
+            is_new=False,
+            new_clippings_count=2,
+            deleted_clippings_count=1,
+            duplicate_clippings_count=4,
+            linked_notes_count=1,
+        ),
+    ]
+
+    # Act
+    result = await sut.present(previews)
+
+    # Assert
+    assert result.data.is_empty is False
+    first_book, second_book = result.data.items
+    assert first_book.book_name == "Book 1 by Author 1"
+    assert first_book.new_label
+    assert first_book.summary == "3 new clippings"
+    assert second_book.new_label is None
+    assert second_book.summary == (
+        "2 new clippings, 1 notes linked to highlights, 4 already imported,"
+        " 1 deleted, will be skipped"
+    )
+    assert isinstance(result.render(), str)
+
+
+async def test_present_with_empty_previews(make_sut):
+    # Arrange
+    sut = make_sut()
+
+    # Act
+    result = await sut.present([])
+
+    # Assert
+    assert result.data.is_empty is True
+    assert result.data.empty_message
+    assert result.data.items == []
+    assert isinstance(result.render(), str)